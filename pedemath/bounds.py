@@ -0,0 +1,108 @@
+"""
+Arrays of axis aligned boxes.
+
+A Rect3 array has shape (N, 6) and stores x, y, z, width, height, depth in
+the same order as the Rect3 members.  Most batched code works on a pair of
+(N, 3) min and max corner arrays instead, so helpers convert between them.
+Sets of points to fit bounds around are flattened into one array with
+flatten_point_sets().
+"""
+
+import numpy
+
+from pedemath.rect3 import Rect3
+
+
+def rect3_list_to_array(rects):
+    """Return an (N, 6) Rect3 array from a list of Rect3."""
+
+    return numpy.array(
+        [(r.x, r.y, r.z, r.width, r.height, r.depth) for r in rects],
+        dtype=float).reshape(-1, 6)
+
+
+def rect3_array_to_list(boxes):
+    """Return a list of Rect3 from an (N, 6) Rect3 array."""
+
+    return [Rect3(*[float(value) for value in box])
+            for box in numpy.asarray(boxes)]
+
+
+def rect3_array_min_max(boxes):
+    """Return (mins, maxs) corner arrays for an (N, 6) Rect3 array."""
+
+    boxes = numpy.asarray(boxes, dtype=float)
+    return boxes[..., :3], boxes[..., :3] + boxes[..., 3:]
+
+
+def min_max_to_rect3_array(mins, maxs):
+    """Return an (N, 6) Rect3 array from (N, 3) min and max corners."""
+
+    mins = numpy.asarray(mins, dtype=float)
+    return numpy.concatenate((mins, numpy.asarray(maxs) - mins), axis=-1)
+
+
+def transform_min_max_array(mats, mins, maxs):
+    """Return (mins, maxs) bounding (N, 3) boxes after an affine transform.
+
+    mats is a single (4, 4) matrix for every box or a stack of (N, 4, 4)
+    matrices, one per box; other shapes broadcast, so a single box can be
+    moved by many matrices.  Uses Arvo's method: the center is transformed
+    and the half size is multiplied by the absolute rotation and scale part
+    of each matrix, instead of transforming all eight corners.
+    """
+
+    mats = numpy.asarray(mats, dtype=float)
+    mins = numpy.asarray(mins, dtype=float)
+    maxs = numpy.asarray(maxs, dtype=float)
+
+    centers = (mins + maxs) * 0.5
+    extents = (maxs - mins) * 0.5
+    rot = mats[..., :3, :3]
+    centers = (numpy.einsum("...i,...ij->...j", centers, rot) +
+               mats[..., 3, :3])
+    extents = numpy.einsum("...i,...ij->...j", extents, numpy.abs(rot))
+    return centers - extents, centers + extents
+
+
+def transform_rect3_array(mats, boxes):
+    """Same as transform_min_max_array() for an (N, 6) Rect3 array, and
+    return an (N, 6) Rect3 array.
+    """
+
+    mins, maxs = rect3_array_min_max(boxes)
+    return min_max_to_rect3_array(*transform_min_max_array(mats, mins, maxs))
+
+
+def transform_rect3(mat, rect):
+    """Return a new Rect3 bounding rect after transforming it by a
+    Matrix44.
+    """
+
+    box = transform_rect3_array(mat.data, rect3_list_to_array([rect]))[0]
+    return Rect3(*[float(value) for value in box])
+
+
+def flatten_point_sets(point_sets):
+    """Return (points, counts, starts, sets) for a (B, N, 3) array or a
+    list of (Ni, 3) arrays or lists of Vec3, where points holds every set
+    one after another, counts and starts the size and first index of each
+    set, and sets the set of each point.  Raise ValueError for an empty set.
+    """
+
+    if isinstance(point_sets, numpy.ndarray) and point_sets.ndim == 3:
+        counts = numpy.full(len(point_sets), point_sets.shape[1])
+        points = point_sets.reshape(-1, 3).astype(float)
+    else:
+        point_sets = [numpy.asarray(points, dtype=float).reshape(-1, 3)
+                      for points in point_sets]
+        counts = numpy.array([len(points) for points in point_sets],
+                             dtype=numpy.intp)
+        points = numpy.concatenate(point_sets or [numpy.empty((0, 3))])
+
+    if (counts == 0).any():
+        raise ValueError("Empty point set")
+
+    starts = numpy.cumsum(counts) - counts
+    sets = numpy.repeat(numpy.arange(len(counts)), counts)
+    return points, counts, starts, sets
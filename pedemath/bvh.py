@@ -0,0 +1,204 @@
+"""
+BoxBVH
+A bounding volume hierarchy over axis aligned boxes.
+
+Primitives are sorted along a Morton (z-order) curve of their centers and
+split into leaves of consecutive primitives, which are then paired level by
+level into a balanced binary tree.  Building is vectorized with numpy and
+takes well under a second for a million primitives.
+
+Every node covers a contiguous range of the sorted primitive order, so a
+node's primitives are order[start[node]:start[node] + count[node]].
+"""
+
+import numpy
+
+from pedemath.bounds import rect3_array_min_max
+
+
+def _spread_bits_10(values):
+    """Spread the low 10 bits of each value so there are two zero bits
+    between each of them.
+    """
+
+    values = values & 0x3FF
+    values = (values | (values << 16)) & 0x030000FF
+    values = (values | (values << 8)) & 0x0300F00F
+    values = (values | (values << 4)) & 0x030C30C3
+    values = (values | (values << 2)) & 0x09249249
+    return values
+
+
+def morton_codes_v3_array(points):
+    """Return a 30 bit Morton code for each point in an (N, 3) array, using
+    a 1024^3 grid over the bounds of the points.
+    """
+
+    points = numpy.asarray(points, dtype=float)
+    low = points.min(axis=0)
+    span = points.max(axis=0) - low
+    span[span == 0.0] = 1.0
+
+    grid = ((points - low) * (1023.0 / span)).astype(numpy.uint64)
+    return ((_spread_bits_10(grid[:, 0]) << numpy.uint64(2)) |
+            (_spread_bits_10(grid[:, 1]) << numpy.uint64(1)) |
+            _spread_bits_10(grid[:, 2]))
+
+
+def ranges_to_indices(starts, counts):
+    """Return the concatenation of arange(start, start + count) for each
+    start and count, without a python loop.
+    """
+
+    starts = numpy.asarray(starts, dtype=numpy.intp)
+    counts = numpy.asarray(counts, dtype=numpy.intp)
+    offsets = numpy.cumsum(counts) - counts
+    return (numpy.arange(counts.sum()) - numpy.repeat(offsets, counts) +
+            numpy.repeat(starts, counts))
+
+
+class BoxBVH(object):
+
+    def __init__(self, mins, maxs, leaf_size=8):
+        """Build the hierarchy from (N, 3) min and max corner arrays of the
+        primitive boxes.
+
+        After building:
+        order: primitive indices in tree order.
+        node_min, node_max: (M, 3) bounds of each node.
+        left, right: child node indices, -1 for leaves.
+        start, count: the range of order covered by each node.
+        root: index of the root node, -1 if there are no primitives.
+        """
+
+        self.mins = numpy.asarray(mins, dtype=float).reshape(-1, 3)
+        self.maxs = numpy.asarray(maxs, dtype=float).reshape(-1, 3)
+        self.leaf_size = leaf_size
+        self._build()
+
+    @staticmethod
+    def from_rect3_array(boxes, leaf_size=8):
+        """Return a new BoxBVH over an (N, 6) Rect3 array."""
+
+        mins, maxs = rect3_array_min_max(boxes)
+        return BoxBVH(mins, maxs, leaf_size)
+
+    def __len__(self):
+        """Return the number of primitives."""
+        return len(self.mins)
+
+    def _build(self):
+        num_prims = len(self.mins)
+        if num_prims == 0:
+            self.order = numpy.zeros(0, dtype=numpy.intp)
+            self.node_min = numpy.zeros((0, 3))
+            self.node_max = numpy.zeros((0, 3))
+            self.left = numpy.zeros(0, dtype=numpy.intp)
+            self.right = numpy.zeros(0, dtype=numpy.intp)
+            self.start = numpy.zeros(0, dtype=numpy.intp)
+            self.count = numpy.zeros(0, dtype=numpy.intp)
+            self.root = -1
+            return
+
+        centers = (self.mins + self.maxs) * 0.5
+        self.order = numpy.argsort(morton_codes_v3_array(centers),
+                                   kind="stable")
+
+        # Leaves are runs of leaf_size consecutive primitives.
+        starts = numpy.arange(0, num_prims, self.leaf_size)
+        counts = numpy.diff(numpy.append(starts, num_prims))
+        level_min = numpy.minimum.reduceat(self.mins[self.order], starts)
+        level_max = numpy.maximum.reduceat(self.maxs[self.order], starts)
+        level = numpy.arange(len(starts))
+        level_start = starts
+        level_count = counts
+
+        node_min = [level_min]
+        node_max = [level_max]
+        left = [numpy.full(len(starts), -1)]
+        right = [numpy.full(len(starts), -1)]
+        start = [starts]
+        count = [counts]
+        num_nodes = len(starts)
+
+        # Pair up neighbouring nodes until only the root is left.  An odd
+        # node at the end of a level is carried up to the next level.
+        while len(level) > 1:
+            num_pairs = len(level) // 2
+            end = 2 * num_pairs
+            ids = num_nodes + numpy.arange(num_pairs)
+            num_nodes += num_pairs
+
+            pair_min = numpy.minimum(level_min[0:end:2], level_min[1:end:2])
+            pair_max = numpy.maximum(level_max[0:end:2], level_max[1:end:2])
+            pair_start = level_start[0:end:2]
+            pair_count = level_count[0:end:2] + level_count[1:end:2]
+
+            node_min.append(pair_min)
+            node_max.append(pair_max)
+            left.append(level[0:end:2])
+            right.append(level[1:end:2])
+            start.append(pair_start)
+            count.append(pair_count)
+
+            level = numpy.concatenate((ids, level[end:]))
+            level_min = numpy.concatenate((pair_min, level_min[end:]))
+            level_max = numpy.concatenate((pair_max, level_max[end:]))
+            level_start = numpy.concatenate((pair_start, level_start[end:]))
+            level_count = numpy.concatenate((pair_count, level_count[end:]))
+
+        self.node_min = numpy.concatenate(node_min)
+        self.node_max = numpy.concatenate(node_max)
+        self.left = numpy.concatenate(left)
+        self.right = numpy.concatenate(right)
+        self.start = numpy.concatenate(start)
+        self.count = numpy.concatenate(count)
+        self.root = int(level[0])
+
+    def is_leaf(self, nodes):
+        """Return a bool array, True for each leaf in the nodes array."""
+
+        return self.left[nodes] < 0
+
+    def node_prims(self, nodes):
+        """Return the primitive indices covered by all the given nodes."""
+
+        return self.order[ranges_to_indices(self.start[nodes],
+                                            self.count[nodes])]
+
+    def traverse(self, classify_nodes, classify_prims):
+        """Return the sorted indices of the primitives accepted by a
+        hierarchical query.
+
+        classify_nodes(nodes) returns two bool arrays for an array of node
+        indices: the nodes whose primitives are all accepted without further
+        tests, and the nodes that must be descended into.  Other nodes are
+        rejected.
+        classify_prims(prims) returns a bool array of accepted primitives
+        for an array of primitive indices from leaves that were descended
+        into.
+
+        The tree is walked one level at a time, so each callback is called
+        with every node on the frontier at once.
+        """
+
+        if self.root < 0:
+            return numpy.zeros(0, dtype=numpy.intp)
+
+        accepted = []
+        frontier = numpy.array([self.root])
+        while len(frontier):
+            accept_all, descend = classify_nodes(frontier)
+            accepted.append(self.node_prims(frontier[accept_all]))
+
+            descend = frontier[descend]
+            leaves = descend[self.is_leaf(descend)]
+            if len(leaves):
+                prims = self.node_prims(leaves)
+                accepted.append(prims[classify_prims(prims)])
+
+            internal = descend[~self.is_leaf(descend)]
+            frontier = numpy.concatenate((self.left[internal],
+                                          self.right[internal]))
+
+        return numpy.sort(numpy.concatenate(accepted))
@@ -0,0 +1,228 @@
+"""
+Closest points on segments and triangles for arrays of points.
+
+Functions work on 2D or 3D coordinates alike; the last axis of every array
+holds the coordinates.  Paired functions broadcast points against segments
+or triangles, so one point can be tested against many or point i against
+segment i.  The _all functions test every point against every segment or
+triangle, block_size points at a time to bound temporary memory, and the
+nearest_ functions keep only the closest segment or triangle per point.
+"""
+
+import numpy
+
+
+def _dot(vecs_a, vecs_b):
+    return numpy.einsum("...i,...i->...", vecs_a, vecs_b)
+
+
+def closest_point_on_segment_array(points, starts, ends):
+    """Return (closest, t) for broadcastable (..., D) points and segments.
+
+    closest is the nearest point on each segment and t in [0, 1] is where it
+    lies, so closest = start + t * (end - start).  Segments of zero length
+    give t 0.
+    """
+
+    points = numpy.asarray(points, dtype=float)
+    starts = numpy.asarray(starts, dtype=float)
+    segment_vecs = numpy.asarray(ends, dtype=float) - starts
+
+    length_sq = _dot(segment_vecs, segment_vecs)
+    t = _dot(points - starts, segment_vecs) / numpy.where(
+        length_sq > 0.0, length_sq, 1.0)
+    t = numpy.clip(t, 0.0, 1.0)
+    return starts + segment_vecs * t[..., None], t
+
+
+def point_segment_distance_array(points, starts, ends):
+    """Return the distances from broadcastable (..., D) points to the
+    closest points on segments.
+    """
+
+    closest, _ = closest_point_on_segment_array(points, starts, ends)
+    return numpy.linalg.norm(numpy.asarray(points) - closest, axis=-1)
+
+
+def closest_point_on_triangle_array(points, a, b, c):
+    """Return (closest, barycentric) for broadcastable (..., D) points and
+    triangles with corners a, b and c.
+
+    closest is the nearest point on or in each triangle and barycentric the
+    (..., 3) weights of a, b and c giving it.  Uses the Voronoi region tests
+    from Ericson's Real-Time Collision Detection, using only dot products so
+    2D and 3D work the same.
+    """
+
+    points = numpy.asarray(points, dtype=float)
+    a = numpy.asarray(a, dtype=float)
+    b = numpy.asarray(b, dtype=float)
+    c = numpy.asarray(c, dtype=float)
+
+    ab = b - a
+    ac = c - a
+    ap = points - a
+    bp = points - b
+    cp = points - c
+    d1 = _dot(ab, ap)
+    d2 = _dot(ac, ap)
+    d3 = _dot(ab, bp)
+    d4 = _dot(ac, bp)
+    d5 = _dot(ab, cp)
+    d6 = _dot(ac, cp)
+    va = d3 * d6 - d5 * d4
+    vb = d5 * d2 - d1 * d6
+    vc = d1 * d4 - d3 * d2
+
+    def ratio(num, den):
+        return num / numpy.where(den != 0.0, den, 1.0)
+
+    # Start inside the face, then apply each region in reverse order so the
+    # earliest matching region wins.  Only the weights v of b and w of c are
+    # tracked; the weight of a is 1 - v - w.
+    total = va + vb + vc
+    v = ratio(vb, total)
+    w = ratio(vc, total)
+
+    edge_bc = ratio(d4 - d3, (d4 - d3) + (d5 - d6))
+    edge_ac = ratio(d2, d2 - d6)
+    edge_ab = ratio(d1, d1 - d3)
+    regions = [
+        ((va <= 0.0) & (d4 - d3 >= 0.0) & (d5 - d6 >= 0.0),
+         1.0 - edge_bc, edge_bc),
+        ((vb <= 0.0) & (d2 >= 0.0) & (d6 <= 0.0), 0.0, edge_ac),
+        ((d6 >= 0.0) & (d5 <= d6), 0.0, 1.0),
+        ((vc <= 0.0) & (d1 >= 0.0) & (d3 <= 0.0), edge_ab, 0.0),
+        ((d3 >= 0.0) & (d4 <= d3), 1.0, 0.0),
+        ((d1 <= 0.0) & (d2 <= 0.0), 0.0, 0.0),
+    ]
+    for in_region, region_v, region_w in regions:
+        v = numpy.where(in_region, region_v, v)
+        w = numpy.where(in_region, region_w, w)
+
+    closest = a + ab * v[..., None] + ac * w[..., None]
+    return closest, numpy.stack((1.0 - v - w, v, w), axis=-1)
+
+
+def point_triangle_distance_array(points, a, b, c):
+    """Return the distances from broadcastable (..., D) points to the
+    closest points on triangles.
+    """
+
+    closest, _ = closest_point_on_triangle_array(points, a, b, c)
+    return numpy.linalg.norm(numpy.asarray(points) - closest, axis=-1)
+
+
+def _blocks(num_points, block_size):
+    for start in range(0, num_points, block_size):
+        yield slice(start, start + block_size)
+
+
+def closest_point_on_segment_array_all(points, starts, ends,
+                                       block_size=256):
+    """Return (closest, t) for every point against every segment, with
+    (N, D) points and (M, D) segments giving (N, M, D) and (N, M) arrays.
+    """
+
+    points = numpy.asarray(points, dtype=float)
+    starts = numpy.asarray(starts, dtype=float)
+    ends = numpy.asarray(ends, dtype=float)
+
+    closest = numpy.empty((len(points),) + starts.shape)
+    t = numpy.empty((len(points), len(starts)))
+    for block in _blocks(len(points), block_size):
+        closest[block], t[block] = closest_point_on_segment_array(
+            points[block, None], starts, ends)
+
+    return closest, t
+
+
+def point_segment_distance_array_all(points, starts, ends, block_size=256):
+    """Return the (N, M) distances from (N, D) points to (M, D) segments."""
+
+    points = numpy.asarray(points, dtype=float)
+    distances = numpy.empty((len(points), len(starts)))
+    for block in _blocks(len(points), block_size):
+        distances[block] = point_segment_distance_array(
+            points[block, None], starts, ends)
+
+    return distances
+
+
+def nearest_segment_array(points, starts, ends, block_size=256):
+    """Return (segments, closest, distances) for the nearest of (M, D)
+    segments to each of (N, D) points.
+
+    segments is the (N,) index of the nearest segment, closest the (N, D)
+    nearest point on it and distances the (N,) distance to it.
+    """
+
+    points = numpy.asarray(points, dtype=float)
+    starts = numpy.asarray(starts, dtype=float)
+    ends = numpy.asarray(ends, dtype=float)
+
+    segments = numpy.empty(len(points), dtype=numpy.intp)
+    closest = numpy.empty(points.shape)
+    for block in _blocks(len(points), block_size):
+        distances = point_segment_distance_array(points[block, None], starts,
+                                                 ends)
+        nearest = segments[block] = distances.argmin(axis=1)
+        closest[block], _ = closest_point_on_segment_array(
+            points[block], starts[nearest], ends[nearest])
+
+    return (segments, closest,
+            numpy.linalg.norm(points - closest, axis=-1))
+
+
+def closest_point_on_triangle_array_all(points, a, b, c, block_size=256):
+    """Return (closest, barycentric) for every point against every
+    triangle, with (N, D) points and (M, D) corners giving (N, M, D) and
+    (N, M, 3) arrays.
+    """
+
+    points = numpy.asarray(points, dtype=float)
+    a = numpy.asarray(a, dtype=float)
+
+    closest = numpy.empty((len(points),) + a.shape)
+    bary = numpy.empty((len(points), len(a), 3))
+    for block in _blocks(len(points), block_size):
+        closest[block], bary[block] = closest_point_on_triangle_array(
+            points[block, None], a, b, c)
+
+    return closest, bary
+
+
+def point_triangle_distance_array_all(points, a, b, c, block_size=256):
+    """Return the (N, M) distances from (N, D) points to (M, D) triangles.
+    """
+
+    points = numpy.asarray(points, dtype=float)
+    distances = numpy.empty((len(points), len(a)))
+    for block in _blocks(len(points), block_size):
+        distances[block] = point_triangle_distance_array(
+            points[block, None], a, b, c)
+
+    return distances
+
+
+def nearest_triangle_array(points, a, b, c, block_size=256):
+    """Return (triangles, closest, distances) for the nearest of (M, D)
+    triangles to each of (N, D) points, see nearest_segment_array().
+    """
+
+    points = numpy.asarray(points, dtype=float)
+    a = numpy.asarray(a, dtype=float)
+    b = numpy.asarray(b, dtype=float)
+    c = numpy.asarray(c, dtype=float)
+
+    triangles = numpy.empty(len(points), dtype=numpy.intp)
+    closest = numpy.empty(points.shape)
+    for block in _blocks(len(points), block_size):
+        distances = point_triangle_distance_array(points[block, None], a, b,
+                                                  c)
+        nearest = triangles[block] = distances.argmin(axis=1)
+        closest[block], _ = closest_point_on_triangle_array(
+            points[block], a[nearest], b[nearest], c[nearest])
+
+    return (triangles, closest,
+            numpy.linalg.norm(points - closest, axis=-1))
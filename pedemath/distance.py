@@ -0,0 +1,221 @@
+"""
+Distances between two sets of points, computed in blocks.
+
+Points are (N, D) arrays, or lists of Vec3 or Vec2.  Every routine works on
+square tiles of at most block_size points from each set, so peak temporary
+memory is about block_size * block_size floats however large the sets are.
+Tiles can be spread across worker threads; numpy releases the GIL for the
+matrix products that do most of the work.  The _blocks functions are
+generators yielding results as tiles finish, in a fixed order, and the
+other functions collect them.
+
+Squared distances are computed as |a|^2 + |b|^2 - 2 a.b after moving both
+sets to the center of the second, and final distances are recomputed
+directly from the coordinates.  Nearest and within-distance searches skip
+adding |a|^2 to whole tiles since it is constant along each row.
+"""
+
+import collections
+import itertools
+from multiprocessing.pool import ThreadPool
+
+import numpy
+
+
+def _as_points(points):
+    points = numpy.asarray(points, dtype=float)
+    if points.ndim == 1:
+        return points.reshape(1, -1)
+    return points
+
+
+def _centered(points_a, points_b):
+    """Return both point sets and their squared lengths, moved to the
+    center of points_b to reduce cancellation.
+    """
+
+    points_a = _as_points(points_a)
+    points_b = _as_points(points_b)
+    if len(points_b):
+        center = points_b.mean(axis=0)
+        points_a = points_a - center
+        points_b = points_b - center
+
+    return (points_a, points_b, (points_a ** 2).sum(axis=1),
+            (points_b ** 2).sum(axis=1))
+
+
+def _partial_tile(scaled_a, points_b, sq_b, rows, cols):
+    """Return |b|^2 - 2 a.b for a tile, given scaled_a = -2 a."""
+
+    partial = numpy.dot(scaled_a[rows], points_b[cols].T)
+    partial += sq_b[cols]
+    return partial
+
+
+def _slices(num, block_size):
+    return [slice(start, min(start + block_size, num))
+            for start in range(0, num, block_size)]
+
+
+def _map_blocks(func, tasks, workers):
+    """Yield func(task) for each task in order, using a pool of worker
+    threads if workers is more than 1.  At most 2 * workers tasks are
+    queued or finished ahead of the caller, so results that aren't read
+    yet don't pile up.
+    """
+
+    if not workers or workers <= 1:
+        for task in tasks:
+            yield func(task)
+        return
+
+    tasks = iter(tasks)
+    pool = ThreadPool(workers)
+    try:
+        pending = collections.deque(
+            pool.apply_async(func, (task,))
+            for task in itertools.islice(tasks, 2 * workers))
+        while pending:
+            result = pending.popleft().get()
+            for task in itertools.islice(tasks, 1):
+                pending.append(pool.apply_async(func, (task,)))
+            yield result
+    finally:
+        pool.terminate()
+
+
+def pairwise_distance_blocks(points_a, points_b, block_size=256,
+                             workers=None, squared=False):
+    """Yield (rows, cols, distances) tiles of the distance matrix between
+    (N, D) points_a and (M, D) points_b.
+
+    rows and cols are slices of points_a and points_b, and distances the
+    matching block of distances, or squared distances if squared is True.
+    """
+
+    points_a, points_b, sq_a, sq_b = _centered(points_a, points_b)
+    scaled_a = -2.0 * points_a
+
+    def tile(task):
+        rows, cols = task
+        dist = _partial_tile(scaled_a, points_b, sq_b, rows, cols)
+        dist += sq_a[rows, None]
+        numpy.maximum(dist, 0.0, out=dist)
+        if not squared:
+            numpy.sqrt(dist, out=dist)
+        return rows, cols, dist
+
+    tasks = [(rows, cols) for rows in _slices(len(points_a), block_size)
+             for cols in _slices(len(points_b), block_size)]
+    return _map_blocks(tile, tasks, workers)
+
+
+def pairwise_distance_array(points_a, points_b, block_size=256,
+                            workers=None, squared=False):
+    """Return the (N, M) distance matrix between (N, D) points_a and
+    (M, D) points_b, see pairwise_distance_blocks().
+    """
+
+    result = numpy.empty((len(points_a), len(points_b)))
+    for rows, cols, dist in pairwise_distance_blocks(
+            points_a, points_b, block_size, workers, squared):
+        result[rows, cols] = dist
+
+    return result
+
+
+def nearest_point_blocks(points_a, points_b, block_size=256,
+                         workers=None):
+    """Yield (rows, indices, distances) for each block of points_a, where
+    indices are the nearest of (M, D) points_b to each point in the rows
+    slice of (N, D) points_a and distances the distances to them.
+    """
+
+    points_a, points_b, sq_a, sq_b = _centered(points_a, points_b)
+    if not len(points_b):
+        raise ValueError("points_b is empty")
+    scaled_a = -2.0 * points_a
+    col_slices = _slices(len(points_b), block_size)
+
+    def nearest(rows):
+        best_sq = numpy.full(rows.stop - rows.start, numpy.inf)
+        best = numpy.zeros(rows.stop - rows.start, dtype=numpy.intp)
+        for cols in col_slices:
+            partial = _partial_tile(scaled_a, points_b, sq_b, rows, cols)
+            tile_best = partial.argmin(axis=1)
+            tile_sq = partial[numpy.arange(len(tile_best)), tile_best]
+            closer = tile_sq < best_sq
+            best_sq[closer] = tile_sq[closer]
+            best[closer] = tile_best[closer] + cols.start
+
+        return rows, best, numpy.linalg.norm(
+            points_a[rows] - points_b[best], axis=1)
+
+    return _map_blocks(nearest, _slices(len(points_a), block_size),
+                       workers)
+
+
+def nearest_point_array(points_a, points_b, block_size=256, workers=None):
+    """Return (indices, distances) of the nearest of (M, D) points_b to
+    each of (N, D) points_a, see nearest_point_blocks().
+    """
+
+    indices = numpy.empty(len(points_a), dtype=numpy.intp)
+    distances = numpy.empty(len(points_a))
+    for rows, block_indices, block_distances in nearest_point_blocks(
+            points_a, points_b, block_size, workers):
+        indices[rows] = block_indices
+        distances[rows] = block_distances
+
+    return indices, distances
+
+
+def within_distance_blocks(points_a, points_b, distance, block_size=256,
+                           workers=None):
+    """Yield (indices_a, indices_b, distances) for the pairs of points in
+    each tile that are within distance of each other.
+    """
+
+    points_a, points_b, sq_a, sq_b = _centered(points_a, points_b)
+    limit_sq = float(distance) ** 2
+    # Loose enough to keep every pair the expanded form rounds just over.
+    candidate_sq = limit_sq * (1.0 + 1e-6) + 1e-9 * (
+        sq_a.max(initial=0.0) + sq_b.max(initial=0.0))
+    scaled_a = -2.0 * points_a
+    row_limits = candidate_sq - sq_a
+
+    def within(task):
+        rows, cols = task
+        partial = _partial_tile(scaled_a, points_b, sq_b, rows, cols)
+        # flatnonzero is much faster than nonzero on 2D masks.
+        found = numpy.flatnonzero(partial <= row_limits[rows, None])
+        tile_a, tile_b = numpy.divmod(found, cols.stop - cols.start)
+        tile_a += rows.start
+        tile_b += cols.start
+        dist = numpy.linalg.norm(points_a[tile_a] - points_b[tile_b], axis=1)
+        keep = dist <= distance
+        return tile_a[keep], tile_b[keep], dist[keep]
+
+    tasks = [(rows, cols) for rows in _slices(len(points_a), block_size)
+             for cols in _slices(len(points_b), block_size)]
+    return _map_blocks(within, tasks, workers)
+
+
+def within_distance_pairs(points_a, points_b, distance, block_size=256,
+                          workers=None):
+    """Return (indices_a, indices_b, distances) for every pair of (N, D)
+    points_a and (M, D) points_b within distance of each other, sorted by
+    indices_a then indices_b.
+    """
+
+    blocks = list(within_distance_blocks(points_a, points_b, distance,
+                                         block_size, workers))
+    if not blocks:
+        return (numpy.empty(0, dtype=numpy.intp),
+                numpy.empty(0, dtype=numpy.intp), numpy.empty(0))
+
+    indices_a, indices_b, distances = [numpy.concatenate(parts)
+                                       for parts in zip(*blocks)]
+    order = numpy.lexsort((indices_b, indices_a))
+    return indices_a[order], indices_b[order], distances[order]
@@ -0,0 +1,257 @@
+"""
+DualQuat
+A unit dual quaternion representing a rigid transform (rotation followed by
+translation), mainly for dual quaternion skinning.
+
+The batched functions in this module work on dual quaternion arrays of shape
+(N, 8): the real (rotation) quaternion in x, y, z, w order followed by the
+dual quaternion in x, y, z, w order.
+"""
+
+import numpy
+
+from pedemath.matrix import quat_array_to_mat44_array
+from pedemath.quat import conjugate_quat
+from pedemath.quat import mat44_array_to_quat_array
+from pedemath.quat import Quat
+from pedemath.quat import rotate_vec_quat_array
+from pedemath.vec3 import Vec3
+
+
+def _add_quat(quat1, quat2):
+    return Quat(quat1.x + quat2.x, quat1.y + quat2.y, quat1.z + quat2.z,
+                quat1.w + quat2.w)
+
+
+def _scale_quat(quat, amount):
+    return Quat(quat.x * amount, quat.y * amount, quat.z * amount,
+                quat.w * amount)
+
+
+class DualQuat(object):
+
+    def __init__(self, real=None, dual=None):
+        """Initialize from a real (rotation) Quat and a dual Quat.
+
+        With no arguments the identity transform is created.
+        """
+
+        self.real = Quat.from_quat(real) if real is not None else Quat()
+        self.dual = (Quat.from_quat(dual) if dual is not None
+                     else Quat(0.0, 0.0, 0.0, 0.0))
+
+    @staticmethod
+    def from_quat_trans(rot_quat, trans_vec):
+        """Return a new DualQuat that rotates by rot_quat, then translates by
+        trans_vec.
+        """
+
+        real = Quat.from_quat(rot_quat)
+        trans_quat = Quat(trans_vec[0], trans_vec[1], trans_vec[2], 0.0)
+        return DualQuat(real, _scale_quat(trans_quat * real, 0.5))
+
+    @staticmethod
+    def from_matrix44(mat):
+        """Return a new DualQuat from an affine Matrix44 with only rotation
+        and translation components.
+        """
+
+        return DualQuat.from_quat_trans(Quat.from_matrix44(mat),
+                                        mat.get_trans())
+
+    def __eq__(self, dual_quat):
+        if not isinstance(dual_quat, DualQuat):
+            return False
+
+        return self.real == dual_quat.real and self.dual == dual_quat.dual
+
+    def __ne__(self, dual_quat):
+        return not self.__eq__(dual_quat)
+
+    def __str__(self):
+        """Return a readable string representation of DualQuat."""
+        return str("DualQuat(%s,%s)" % (self.real, self.dual))
+
+    def __repr__(self):
+        """Return an unambiguous string representation of DualQuat."""
+        return str("DualQuat(%r,%r)" % (self.real, self.dual))
+
+    def __mul__(self, dual_quat):
+        """Return the composition of the two transforms.  Like Matrix44,
+        (a * b) applies b first and then a.
+        """
+
+        return DualQuat(
+            self.real * dual_quat.real,
+            _add_quat(self.real * dual_quat.dual,
+                      self.dual * dual_quat.real))
+
+    def normalize(self):
+        """Normalize in place so the real part is a unit quaternion."""
+
+        length = self.real.length()
+        self.real = _scale_quat(self.real, 1.0 / length)
+        self.dual = _scale_quat(self.dual, 1.0 / length)
+
+    def get_rot(self):
+        """Return the rotation as a new Quat."""
+
+        return Quat.from_quat(self.real)
+
+    def get_trans(self):
+        """Return the translation as a new Vec3."""
+
+        trans_quat = self.dual * conjugate_quat(self.real)
+        return Vec3(2.0 * trans_quat.x, 2.0 * trans_quat.y, 2.0 * trans_quat.z)
+
+    def transform_vec(self, vec):
+        """Return a new Vec3 with vec rotated and then translated."""
+
+        return self.real.rotate_vec(vec) + self.get_trans()
+
+    def as_matrix44(self, matrix=None):
+        """Return the transform as a Matrix44.
+
+        If matrix is provided, store the result in it instead of creating a
+        new Matrix44.
+        """
+
+        matrix = self.real.as_matrix44(matrix)
+        matrix.set_trans(self.get_trans())
+        return matrix
+
+    def as_array(self):
+        """Return an (8,) numpy array: real x, y, z, w, then dual x, y, z, w.
+        """
+
+        return numpy.array([self.real.x, self.real.y, self.real.z,
+                            self.real.w, self.dual.x, self.dual.y,
+                            self.dual.z, self.dual.w])
+
+
+def dualquat_array_from_quat_trans(quats, trans):
+    """Return an (N, 8) dual quaternion array from an (N, 4) quaternion array
+    and an (N, 3) translation array.
+    """
+
+    quats = numpy.asarray(quats, dtype=float)
+    trans = numpy.asarray(trans, dtype=float)
+
+    dual_quats = numpy.empty(quats.shape[:-1] + (8,))
+    dual_quats[..., :4] = quats
+
+    # 0.5 * Quat(t, 0) * real
+    xyz = quats[..., :3]
+    dual_quats[..., 4:7] = 0.5 * (quats[..., 3:] * trans +
+                                  numpy.cross(trans, xyz))
+    dual_quats[..., 7] = -0.5 * numpy.einsum("...i,...i->...", trans, xyz)
+    return dual_quats
+
+
+def dualquat_array_get_trans(dual_quats):
+    """Return the (N, 3) translations of a normalized dual quaternion array.
+    """
+
+    dual_quats = numpy.asarray(dual_quats, dtype=float)
+    real_xyz = dual_quats[..., :3]
+    real_w = dual_quats[..., 3:4]
+    dual_xyz = dual_quats[..., 4:7]
+    dual_w = dual_quats[..., 7:8]
+
+    # 2 * dual * conjugate(real)
+    return 2.0 * (real_w * dual_xyz - dual_w * real_xyz +
+                  numpy.cross(real_xyz, dual_xyz))
+
+
+def normalize_dualquat_array(dual_quats):
+    """Return a new array with each dual quaternion normalized by the length
+    of its real part.
+    """
+
+    dual_quats = numpy.asarray(dual_quats, dtype=float)
+    length = numpy.sqrt(numpy.einsum("...i,...i->...", dual_quats[..., :4],
+                                     dual_quats[..., :4]))
+    return dual_quats / length[..., None]
+
+
+def blend_dualquat_array(dual_quats, indices, weights):
+    """Return the (V, 8) normalized blend of joint dual quaternions for each
+    vertex.
+
+    dual_quats: (J, 8) joint transforms.
+    indices: (V, K) joint index of each of a vertex's K influences.
+    weights: (V, K) weight of each influence.
+
+    Influences whose rotation is in the opposite hemisphere to the first
+    influence are negated before blending so the shortest path is used.
+    """
+
+    dual_quats = numpy.asarray(dual_quats, dtype=float)
+    weights = numpy.asarray(weights, dtype=float)
+    selected = dual_quats[numpy.asarray(indices)]
+
+    pivot = selected[:, :1, :4]
+    signs = numpy.where((selected[..., :4] * pivot).sum(axis=-1) < 0.0,
+                        -1.0, 1.0)
+    blended = numpy.einsum("vk,vki->vi", weights * signs, selected)
+    return normalize_dualquat_array(blended)
+
+
+def transform_vec_dualquat_array(dual_quats, vecs):
+    """Transform each vector in vecs (N, 3) by the matching normalized dual
+    quaternion in dual_quats (N, 8).
+    """
+
+    dual_quats = numpy.asarray(dual_quats, dtype=float)
+    return (rotate_vec_quat_array(dual_quats[..., :4], vecs) +
+            dualquat_array_get_trans(dual_quats))
+
+
+def skin_dualquat(vecs, dual_quats, indices, weights, normals=None):
+    """Dual quaternion skinning of vertex positions.
+
+    vecs: (V, 3) bind pose positions.
+    dual_quats: (J, 8) joint skinning transforms.
+    indices, weights: (V, K) joint influences per vertex.
+    normals: optional (V, 3) normals, which are rotated but not translated.
+
+    Return the skinned (V, 3) positions, or a (positions, normals) tuple if
+    normals are given.
+    """
+
+    blended = blend_dualquat_array(dual_quats, indices, weights)
+    skinned = transform_vec_dualquat_array(blended, vecs)
+    if normals is None:
+        return skinned
+
+    return skinned, rotate_vec_quat_array(blended[:, :4], normals)
+
+
+def dualquat_array_to_mat44_array(dual_quats):
+    """Return an (N, 4, 4) stack of column-major matrices, each laid out
+    like Matrix44.data, from a normalized dual quaternion array.
+    """
+
+    dual_quats = numpy.asarray(dual_quats, dtype=float)
+    mats = quat_array_to_mat44_array(dual_quats[..., :4])
+    mats[..., 3, :3] = dualquat_array_get_trans(dual_quats)
+    return mats
+
+
+def dualquat_array_from_mat44_array(mats):
+    """Return an (N, 8) dual quaternion array from an (N, 4, 4) stack of
+    affine matrices with only rotation and translation components.
+    """
+
+    mats = numpy.asarray(mats, dtype=float)
+    return dualquat_array_from_quat_trans(mat44_array_to_quat_array(mats),
+                                          mats[..., 3, :3])
+
+
+def dualquat_array_from_mat44_list(matrices):
+    """Return an (N, 8) dual quaternion array from a list of affine Matrix44
+    objects with only rotation and translation components.
+    """
+
+    return dualquat_array_from_mat44_array(
+        numpy.array([mat.data for mat in matrices]).reshape(-1, 4, 4))
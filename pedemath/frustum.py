@@ -0,0 +1,126 @@
+"""
+Frustum
+View frustum planes extracted from a view-projection Matrix44, with batched
+culling of boxes and spheres.
+
+Classification results use FRUSTUM_OUTSIDE, FRUSTUM_INTERSECT and
+FRUSTUM_INSIDE.  The cull_* methods return the sorted indices of everything
+not outside, ready to use for draw submission.
+"""
+
+import numpy
+
+from pedemath.bounds import rect3_array_min_max
+
+FRUSTUM_OUTSIDE = 0
+FRUSTUM_INTERSECT = 1
+FRUSTUM_INSIDE = 2
+
+
+def _classify(dists, radii):
+    """Return the classification from (N, 6) signed plane distances of the
+    centers and the (N, 6) or (N, 1) projected radii.
+    """
+
+    result = numpy.full(dists.shape[0], FRUSTUM_INTERSECT, dtype=numpy.int8)
+    result[(dists >= radii).all(axis=1)] = FRUSTUM_INSIDE
+    result[(dists < -radii).any(axis=1)] = FRUSTUM_OUTSIDE
+    return result
+
+
+class Frustum(object):
+
+    def __init__(self, planes):
+        """Initialize from a (6, 4) array of planes (a, b, c, d) where a
+        point is inside a plane when a*x + b*y + c*z + d >= 0.
+
+        The plane normals are normalized so distances are in world units.
+        """
+
+        planes = numpy.array(planes, dtype=float).reshape(-1, 4)
+        self.planes = planes / numpy.sqrt(
+            (planes[:, :3] ** 2).sum(axis=1))[:, None]
+
+    @staticmethod
+    def from_matrix44(mat):
+        """Return a new Frustum for a view-projection Matrix44 with OpenGL
+        clip space conventions (-w <= x, y, z <= w).
+
+        Planes are in the space the matrix transforms from, so a
+        projection * view matrix gives world space planes.  The planes are
+        in left, right, bottom, top, near, far order.
+        """
+
+        # Column-major, so data[:, i] is row i of the matrix.
+        data = numpy.asarray(mat.data, dtype=float)
+        rows = [data[:, i] for i in range(4)]
+        return Frustum([rows[3] + rows[0], rows[3] - rows[0],
+                        rows[3] + rows[1], rows[3] - rows[1],
+                        rows[3] + rows[2], rows[3] - rows[2]])
+
+    def contains_points(self, points):
+        """Return a bool array, True for each (N, 3) point in the frustum."""
+
+        points = numpy.asarray(points, dtype=float).reshape(-1, 3)
+        return (numpy.dot(points, self.planes[:, :3].T) +
+                self.planes[:, 3] >= 0.0).all(axis=1)
+
+    def classify_spheres(self, centers, radii):
+        """Classify each sphere from (N, 3) centers and (N,) radii."""
+
+        centers = numpy.asarray(centers, dtype=float).reshape(-1, 3)
+        radii = numpy.broadcast_to(numpy.asarray(radii, dtype=float),
+                                   (len(centers),))
+        dists = numpy.dot(centers, self.planes[:, :3].T) + self.planes[:, 3]
+        return _classify(dists, radii[:, None])
+
+    def classify_min_max(self, mins, maxs):
+        """Classify each box from (N, 3) min and max corners."""
+
+        mins = numpy.asarray(mins, dtype=float).reshape(-1, 3)
+        maxs = numpy.asarray(maxs, dtype=float).reshape(-1, 3)
+        centers = (mins + maxs) * 0.5
+        extents = (maxs - mins) * 0.5
+
+        dists = numpy.dot(centers, self.planes[:, :3].T) + self.planes[:, 3]
+        # Projection of the box extents onto each plane normal.
+        radii = numpy.dot(extents, numpy.abs(self.planes[:, :3]).T)
+        return _classify(dists, radii)
+
+    def classify_boxes(self, boxes):
+        """Classify each box in an (N, 6) Rect3 array."""
+
+        return self.classify_min_max(*rect3_array_min_max(boxes))
+
+    def cull_spheres(self, centers, radii):
+        """Return the indices of spheres that are not outside."""
+
+        return numpy.flatnonzero(
+            self.classify_spheres(centers, radii) != FRUSTUM_OUTSIDE)
+
+    def cull_boxes(self, boxes):
+        """Return the indices of boxes in an (N, 6) Rect3 array that are not
+        outside.
+        """
+
+        return numpy.flatnonzero(
+            self.classify_boxes(boxes) != FRUSTUM_OUTSIDE)
+
+    def cull_bvh(self, bvh):
+        """Return the indices of the primitive boxes of a BoxBVH that are
+        not outside.
+
+        Nodes entirely inside accept all their boxes without testing them,
+        and nodes entirely outside are skipped.
+        """
+
+        def classify_nodes(nodes):
+            result = self.classify_min_max(bvh.node_min[nodes],
+                                           bvh.node_max[nodes])
+            return result == FRUSTUM_INSIDE, result == FRUSTUM_INTERSECT
+
+        def classify_prims(prims):
+            return self.classify_min_max(
+                bvh.mins[prims], bvh.maxs[prims]) != FRUSTUM_OUTSIDE
+
+        return bvh.traverse(classify_nodes, classify_prims)
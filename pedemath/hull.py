@@ -0,0 +1,378 @@
+"""
+Convex hulls of point sets.
+
+2D hulls use Andrew's monotone chain.  Points inside the octagon of the
+extreme points along the axes and diagonals can't be on the hull, so they
+are discarded in one vectorized pass and only the rest are sorted and
+walked.  Hulls are counter-clockwise, start at the point with the lowest x
+(then lowest y), and never include points that are duplicates or that lie
+along a hull edge.
+"""
+
+import math
+
+import numpy
+
+from pedemath.vec2 import Vec2
+
+
+def _as_points_2d(points):
+    return numpy.asarray(points, dtype=float).reshape(-1, 2)
+
+
+def _candidates_2d(points):
+    """Return the indices of points that may be on the hull, in order."""
+
+    if len(points) < 16:
+        return numpy.arange(len(points))
+
+    # Extreme points along x, x + y, y, y - x, -x, ... in counter-clockwise
+    # order form a convex polygon inside the hull.
+    x, y = points[:, 0], points[:, 1]
+    extremes = numpy.array([
+        x.argmax(), (x + y).argmax(), y.argmax(), (y - x).argmax(),
+        x.argmin(), (x + y).argmin(), y.argmin(), (x - y).argmax()])
+    polygon = points[extremes]
+    edges = numpy.roll(polygon, -1, axis=0) - polygon
+
+    # Strictly left of every non-degenerate edge is strictly inside.
+    inside = numpy.ones(len(points), dtype=bool)
+    for start, edge in zip(polygon, edges):
+        if edge.any():
+            inside &= (edge[0] * (y - start[1]) -
+                       edge[1] * (x - start[0])) > 0.0
+
+    return numpy.flatnonzero(~inside)
+
+
+def _monotone_chain(xs, ys, order):
+    """Return hull indices from the indices of points sorted by x then y.
+    """
+
+    def chain(indices):
+        hull = []
+        for i in indices:
+            px, py = xs[i], ys[i]
+            while len(hull) >= 2:
+                o, a = hull[-2], hull[-1]
+                if ((xs[a] - xs[o]) * (py - ys[o]) -
+                        (ys[a] - ys[o]) * (px - xs[o])) > 0.0:
+                    break
+                hull.pop()
+            hull.append(i)
+        return hull
+
+    lower = chain(order)
+    upper = chain(reversed(order))
+    return lower[:-1] + upper[:-1]
+
+
+def convex_hull_2d(points, return_indices=False):
+    """Return the convex hull of a list of Vec2 or an (N, 2) array.
+
+    The hull is a list of new Vec2, or with return_indices an array of
+    indices into points.  Of duplicate points, the first is used.  One
+    distinct point gives a hull of that point and collinear points give the
+    two ends.
+    """
+
+    points = _as_points_2d(points)
+    candidates = _candidates_2d(points)
+
+    # lexsort is stable, so duplicates stay in index order and the first
+    # of each is kept.
+    order = candidates[numpy.lexsort((points[candidates, 1],
+                                      points[candidates, 0]))]
+    if len(order) > 1:
+        sorted_points = points[order]
+        distinct = numpy.ones(len(order), dtype=bool)
+        distinct[1:] = (sorted_points[1:] != sorted_points[:-1]).any(axis=1)
+        order = order[distinct]
+
+    if len(order) <= 2:
+        hull = list(order)
+    else:
+        hull = _monotone_chain(points[:, 0].tolist(), points[:, 1].tolist(),
+                               order.tolist())
+
+    indices = numpy.array(hull, dtype=numpy.intp)
+    if return_indices:
+        return indices
+    return [Vec2(*point) for point in points[indices]]
+
+
+def min_area_rect_2d(points):
+    """Return (corners, area) for the smallest rectangle around a list of
+    Vec2 or an (N, 2) array.
+
+    corners is a (4, 2) array in counter-clockwise order with the first
+    side along an edge of the convex hull.  Uses rotating calipers: for
+    each hull edge, the hull vertices furthest along and across it are
+    found together with a binary search over the sorted edge angles.
+    Of rectangles with equal area, the one on the earliest hull edge is
+    returned.
+    """
+
+    points = _as_points_2d(points)
+    hull = points[convex_hull_2d(points, return_indices=True)]
+    if len(hull) < 3:
+        if not len(hull):
+            raise ValueError("Can't bound an empty point set")
+        return numpy.array([hull[0], hull[-1], hull[-1], hull[0]]), 0.0
+
+    edges = numpy.roll(hull, -1, axis=0) - hull
+    lengths = numpy.hypot(edges[:, 0], edges[:, 1])
+    dirs = edges / lengths[:, None]
+    normals = numpy.stack((-dirs[:, 1], dirs[:, 0]), axis=1)
+
+    # Edge angles strictly increase around a counter-clockwise hull.
+    angles = numpy.arctan2(edges[:, 1], edges[:, 0])
+    angles = angles[0] + numpy.concatenate(
+        ([0.0], numpy.cumsum(numpy.mod(numpy.diff(angles), 2.0 * math.pi))))
+    wrapped = numpy.concatenate((angles, angles + 2.0 * math.pi))
+
+    # The vertex furthest in a direction at angle a is where the edge
+    # angles pass a + pi / 2.
+    def furthest(turn):
+        return numpy.searchsorted(wrapped, angles + turn) % len(hull)
+
+    ahead = hull[furthest(0.5 * math.pi)]
+    across = hull[furthest(math.pi)]
+    behind = hull[furthest(1.5 * math.pi)]
+
+    front = ((ahead - hull) * dirs).sum(axis=1)
+    back = ((behind - hull) * dirs).sum(axis=1)
+    height = ((across - hull) * normals).sum(axis=1)
+    areas = (front - back) * height
+
+    best = areas.argmin()
+    base = hull[best]
+    u, n = dirs[best], normals[best]
+    corners = numpy.array([
+        base + u * back[best], base + u * front[best],
+        base + u * front[best] + n * height[best],
+        base + u * back[best] + n * height[best]])
+    return corners, float(areas[best])
+
+
+class _Face(object):
+
+    __slots__ = ('vertices', 'normal', 'offset', 'outside', 'alive')
+
+    def __init__(self, vertices, normal, offset):
+        self.vertices = vertices
+        self.normal = normal
+        self.offset = offset
+        self.outside = None
+        self.alive = True
+
+
+def _make_faces(points, triangles):
+    """Return a list of _Face for (i, j, k) point index triples, with the
+    planes of all of them computed together.
+    """
+
+    corners = points[numpy.array(triangles, dtype=numpy.intp)]
+    normals = numpy.cross(corners[:, 1] - corners[:, 0],
+                          corners[:, 2] - corners[:, 0])
+    normals /= numpy.linalg.norm(normals, axis=1)[:, None]
+    offsets = numpy.einsum("fi,fi->f", normals, corners[:, 0])
+    return [_Face(tuple(triangle), normal, offset)
+            for triangle, normal, offset in zip(triangles, normals,
+                                                offsets.tolist())]
+
+
+def _default_epsilon_3d(points):
+    """Return a distance below which points count as on a plane, scaled
+    to the size of the coordinates like qhull's default.
+    """
+
+    return 3.0 * numpy.finfo(float).eps * numpy.abs(points).max(
+        axis=0).sum()
+
+
+def _assign_outside(points, candidates, faces, epsilon):
+    """Give each face the candidates further than epsilon above it, each
+    candidate going to the face it is furthest above.
+    """
+
+    if not len(candidates):
+        for face in faces:
+            face.outside = candidates
+        return
+
+    normals = numpy.array([face.normal for face in faces])
+    offsets = numpy.array([face.offset for face in faces])
+    dist = numpy.dot(points[candidates], normals.T) - offsets
+    best = dist.argmax(axis=1)
+    outside = dist[numpy.arange(len(best)), best] > epsilon
+    candidates, best = candidates[outside], best[outside]
+
+    order = numpy.argsort(best, kind="stable")
+    bounds = numpy.searchsorted(best[order], numpy.arange(len(faces) + 1))
+    for i, face in enumerate(faces):
+        face.outside = candidates[order[bounds[i]:bounds[i + 1]]]
+
+
+def _flat_hull_3d(points, origin, normal):
+    """Return (vertices, faces, normals) for points all within epsilon of
+    a plane: both sides of the planar hull as triangle fans.
+    """
+
+    u = numpy.cross(normal, numpy.eye(3)[numpy.abs(normal).argmin()])
+    u /= numpy.linalg.norm(u)
+    v = numpy.cross(normal, u)
+    offsets = points - origin
+    ring = convex_hull_2d(numpy.stack((offsets.dot(u), offsets.dot(v)),
+                                      axis=1), return_indices=True)
+
+    top = numpy.stack((numpy.full(len(ring) - 2, ring[0]), ring[1:-1],
+                       ring[2:]), axis=1)
+    faces = numpy.concatenate((top, top[:, ::-1]))
+    normals = numpy.concatenate((numpy.tile(normal, (len(top), 1)),
+                                 numpy.tile(-normal, (len(top), 1))))
+    return numpy.sort(ring), faces, normals
+
+
+def _link_faces(edge_faces, faces):
+    """Map each directed edge of faces to its face in edge_faces."""
+
+    for face in faces:
+        i, j, k = face.vertices
+        edge_faces[i, j] = edge_faces[j, k] = edge_faces[k, i] = face
+
+
+def _find_horizon(face, eye_point, edge_faces, epsilon):
+    """Return (visible, horizon): the faces eye_point sees, found by
+    flooding out from face, and the edges between seen and unseen faces.
+    The visible faces are marked dead.
+    """
+
+    face.alive = False
+    visible = [face]
+    horizon = []
+    stack = [face]
+    while stack:
+        current = stack.pop()
+        i, j, k = current.vertices
+        for edge in ((i, j), (j, k), (k, i)):
+            neighbor = edge_faces[edge[1], edge[0]]
+            if not neighbor.alive:
+                continue
+            if neighbor.normal.dot(eye_point) - neighbor.offset > epsilon:
+                neighbor.alive = False
+                visible.append(neighbor)
+                stack.append(neighbor)
+            else:
+                horizon.append(edge)
+    return visible, horizon
+
+
+def _add_eye_point(points, face, edge_faces, epsilon):
+    """Add the furthest point outside face to the hull, replacing the faces
+    it sees with a fan from it to their horizon, and return the new faces
+    that still have points outside them.
+    """
+
+    eye = face.outside[numpy.dot(points[face.outside], face.normal)
+                       .argmax()]
+    visible, horizon = _find_horizon(face, points[eye], edge_faces, epsilon)
+
+    for current in visible:
+        i, j, k = current.vertices
+        del edge_faces[i, j], edge_faces[j, k], edge_faces[k, i]
+
+    new_faces = _make_faces(points, [(i, j, eye) for i, j in horizon])
+    _link_faces(edge_faces, new_faces)
+
+    candidates = numpy.concatenate([current.outside for current in visible])
+    _assign_outside(points, candidates[candidates != eye], new_faces,
+                    epsilon)
+    return [new_face for new_face in new_faces if len(new_face.outside)]
+
+
+def convex_hull_3d(points, epsilon=None):
+    """Return (vertices, faces, normals) for the convex hull of a list of
+    Vec3 or an (N, 3) array, using quickhull.
+
+    vertices is the sorted array of indices of points on the hull, faces
+    an (F, 3) array of point indices for each triangle, counter-clockwise
+    seen from outside, and normals the (F, 3) unit outward normals.
+
+    Points within epsilon of a face count as on it and are not added, so
+    faces of coplanar points may be split into several triangles.  The
+    default epsilon scales with the size of the coordinates.  Points all on
+    one plane give a flat hull with each triangle twice, once facing each
+    way, and points on a line give its two ends and no faces.
+    """
+
+    points = numpy.asarray(points, dtype=float).reshape(-1, 3)
+    if not len(points):
+        return (numpy.empty(0, dtype=numpy.intp),
+                numpy.empty((0, 3), dtype=numpy.intp), numpy.empty((0, 3)))
+    if epsilon is None:
+        epsilon = _default_epsilon_3d(points)
+
+    # Initial simplex: the furthest apart pair of axis extremes, the point
+    # furthest from their line and the point furthest from that plane.
+    extremes = numpy.concatenate((points.argmin(axis=0),
+                                  points.argmax(axis=0)))
+    spans = numpy.linalg.norm(points[extremes][:, None] -
+                              points[extremes], axis=-1)
+    first, second = numpy.unravel_index(spans.argmax(), spans.shape)
+    a, b = extremes[first], extremes[second]
+    line = points[b] - points[a]
+    line_length = numpy.linalg.norm(line)
+    if line_length <= epsilon:
+        return (numpy.array([a], dtype=numpy.intp),
+                numpy.empty((0, 3), dtype=numpy.intp), numpy.empty((0, 3)))
+
+    line_dist = numpy.linalg.norm(numpy.cross(points - points[a], line),
+                                  axis=1) / line_length
+    c = line_dist.argmax()
+    if line_dist[c] <= epsilon:
+        return (numpy.sort([a, b]), numpy.empty((0, 3), dtype=numpy.intp),
+                numpy.empty((0, 3)))
+
+    normal = numpy.cross(line, points[c] - points[a])
+    normal /= numpy.linalg.norm(normal)
+    plane_dist = numpy.dot(points - points[a], normal)
+    d = numpy.abs(plane_dist).argmax()
+    if abs(plane_dist[d]) <= epsilon:
+        return _flat_hull_3d(points, points[a], normal)
+
+    if plane_dist[d] > 0.0:
+        b, c = c, b
+    faces = _make_faces(points, [(a, b, c), (a, d, b), (b, d, c),
+                                 (c, d, a)])
+    _assign_outside(points, numpy.arange(len(points)), faces, epsilon)
+
+    # Directed edge (i, j) -> the face with that edge.  The neighbor across
+    # an edge of a face is the face with the reversed edge.
+    edge_faces = {}
+    _link_faces(edge_faces, faces)
+
+    pending = [face for face in faces if len(face.outside)]
+    while pending:
+        face = pending.pop()
+        if face.alive and len(face.outside):
+            pending.extend(_add_eye_point(points, face, edge_faces, epsilon))
+
+    hull_faces = list(set(edge_faces.values()))
+    hull_faces.sort(key=lambda face: face.vertices)
+    faces = numpy.array([face.vertices for face in hull_faces],
+                        dtype=numpy.intp)
+    normals = numpy.array([face.normal for face in hull_faces])
+    return numpy.unique(faces), faces, normals
+
+
+def convex_hull_volume(points, faces):
+    """Return the volume inside closed, outward facing triangles, such as
+    the faces from convex_hull_3d().
+    """
+
+    corners = numpy.asarray(points, dtype=float).reshape(-1, 3)[
+        numpy.asarray(faces, dtype=numpy.intp)]
+    return float(numpy.einsum("fi,fi->", corners[:, 0],
+                              numpy.cross(corners[:, 1], corners[:, 2]))
+                 / 6.0)
@@ -292,20 +292,41 @@ class Matrix44(object):
 
         return m
 
+    @staticmethod
+    def from_euler_deg(rot, order="xyz"):
+        """Return the rotation matrix for x, y, z euler angles in degrees.
+
+        See euler_rad_to_mat44_array() for the meaning of order.
+        """
+
+        return Matrix44.from_euler_rad(
+            [angle * math.pi / 180. for angle in rot], order)
+
+    @staticmethod
+    def from_euler_rad(rot, order="xyz"):
+        """Return the rotation matrix for x, y, z euler angles in radians.
+
+        The three rotations are combined into one matrix, so rotating a
+        vector by the result is a single matrix-vector product.
+        """
+
+        mat = Matrix44()
+        mat.data[:] = euler_rad_to_mat44_array(
+            [rot[0], rot[1], rot[2]], order)
+        return mat
+
     @staticmethod
     def rot_from_vectors(start_vec, end_vec):
-        """Return the rotation matrix to rotate from one vector to another."""
+        """Return the rotation matrix to rotate from one vector to another.
 
-        dot = start_vec.dot(end_vec)
-        # TODO: check if dot is a valid number
-        angle = math.acos(dot)
-        # TODO: check if angle is a valid number
-        cross = start_vec.cross(end_vec)
-        cross.normalize
-        rot_matrix = Matrix44.from_axis_angle(cross, angle)
+        This is the shortest arc rotation.  The vectors don't need to be
+        normalized.  If they point in opposite directions, the result is a
+        180 degree rotation around an axis perpendicular to start_vec.
+        """
 
-        # TODO: catch exception and return identity for invalid numbers
-        return rot_matrix
+        mat = Matrix44()
+        mat.data[:] = rot_from_vectors_mat44_array(start_vec, end_vec)
+        return mat
 
     @staticmethod
     def from_trans(trans_vec):
@@ -335,6 +356,61 @@ class Matrix44(object):
         self.data[3][1] = trans_vec[1]
         self.data[3][2] = trans_vec[2]
 
+    @staticmethod
+    def from_perspective_deg(fov_y_deg, aspect, near, far):
+        """Return a perspective projection matrix like gluPerspective.
+
+        fov_y_deg is the vertical field of view in degrees and aspect is
+        width / height.
+        """
+
+        f = 1.0 / math.tan(fov_y_deg * math.pi / 360.)
+
+        mat = Matrix44()
+        #   [column][row]
+        mat.data[0][0] = f / aspect
+        mat.data[1][1] = f
+        mat.data[2][2] = (far + near) / (near - far)
+        mat.data[2][3] = -1.0
+        mat.data[3][2] = 2.0 * far * near / (near - far)
+        mat.data[3][3] = 0.0
+        return mat
+
+    @staticmethod
+    def from_ortho(left, right, bottom, top, near, far):
+        """Return an orthographic projection matrix like glOrtho."""
+
+        mat = Matrix44()
+        #   [column][row]
+        mat.data[0][0] = 2.0 / (right - left)
+        mat.data[1][1] = 2.0 / (top - bottom)
+        mat.data[2][2] = -2.0 / (far - near)
+        mat.data[3][0] = -(right + left) / float(right - left)
+        mat.data[3][1] = -(top + bottom) / float(top - bottom)
+        mat.data[3][2] = -(far + near) / float(far - near)
+        return mat
+
+    @staticmethod
+    def from_look_at(eye, target, up):
+        """Return a view matrix like gluLookAt, looking from eye towards
+        target with the given up direction.
+        """
+
+        forward = normalize_v3(Vec3(*target) - Vec3(*eye))
+        side = normalize_v3(forward.cross(Vec3(*up)))
+        cam_up = side.cross(forward)
+
+        mat = Matrix44()
+        #   [column][row]
+        for col in range(3):
+            mat.data[col][0] = side[col]
+            mat.data[col][1] = cam_up[col]
+            mat.data[col][2] = -forward[col]
+        mat.data[3][0] = -side.dot(eye)
+        mat.data[3][1] = -cam_up.dot(eye)
+        mat.data[3][2] = forward.dot(eye)
+        return mat
+
     @staticmethod
     def from_rot_x(angle_degrees):
         mat = Matrix44()
@@ -392,15 +468,303 @@ class Matrix44(object):
 
 
 def rotate_v3f_deg_xyz(vec_a, rot):
-    rot_mat = Matrix44.from_rot_x(rot[0])
-    new_vec = rot_mat * vec_a
+    """Rotate vec_a around x by rot[0], then y by rot[1], then z by rot[2].
+
+    Angles are in degrees.
+    """
+
+    return Matrix44.from_euler_deg(rot) * vec_a
+
+
+# Stacked matrices are (N, 4, 4) arrays where each [i] is laid out like
+# Matrix44.data, in column-major order: stack[i][col][row].
+
+# The index of each axis name in an euler order string.
+EULER_AXES = {"x": 0, "y": 1, "z": 2}
+
+
+def _axis_rot_mat33_array(axis, angles_rad):
+    """Return (N, 3, 3) row-major rotation matrices around one axis."""
+
+    c = numpy.cos(angles_rad)
+    s = numpy.sin(angles_rad)
+    mats = numpy.zeros(c.shape + (3, 3))
+    i, j = [k for k in range(3) if k != axis]
+    mats[..., axis, axis] = 1.0
+    mats[..., i, i] = c
+    mats[..., j, j] = c
+    # For y, the cyclic order is z, x, so the signs are swapped.
+    sign = -1.0 if axis == 1 else 1.0
+    mats[..., i, j] = -sign * s
+    mats[..., j, i] = sign * s
+    return mats
+
+
+def check_euler_order(order):
+    """Raise ValueError unless order is a permutation of "xyz"."""
+
+    if sorted(order) != ["x", "y", "z"]:
+        raise ValueError(
+            "Euler order must be a permutation of 'xyz', got %r" % order)
+
+
+def euler_rad_to_mat44_array(eulers, order="xyz"):
+    """Return an (N, 4, 4) stack of rotation matrices from an (N, 3) array
+    of x, y, z angles in radians.
+
+    order gives the axes in the order the rotations are applied to a vector.
+    The default "xyz" matches rotate_v3f_deg_xyz() and Quat.to_euler_rad().
+    The angles are always given in x, y, z order, whatever the order.
+    """
+
+    check_euler_order(order)
+    eulers = numpy.asarray(eulers, dtype=float)
+
+    rot = None
+    for axis_name in order:
+        axis = EULER_AXES[axis_name]
+        axis_rot = _axis_rot_mat33_array(axis, eulers[..., axis])
+        rot = axis_rot if rot is None else numpy.matmul(axis_rot, rot)
+
+    mats = numpy.zeros(eulers.shape[:-1] + (4, 4))
+    # Transpose the row-major result into column-major order.
+    mats[..., :3, :3] = numpy.swapaxes(rot, -1, -2)
+    mats[..., 3, 3] = 1.0
+    return mats
+
+
+def euler_deg_to_mat44_array(eulers, order="xyz"):
+    """Same as euler_rad_to_mat44_array() with angles in degrees."""
+
+    return euler_rad_to_mat44_array(numpy.radians(eulers), order)
+
 
-    rotMat = Matrix44.from_rot_y(rot[1])
-    new_vec = rotMat * new_vec
+def axis_angle_rad_to_mat44_array(axes, angles_rad):
+    """Return an (N, 4, 4) stack of rotation matrices from an (N, 3) array of
+    axes and an (N,) array of angles in radians.
+
+    The batched version of Matrix44.from_axis_angle_rad().
+    """
+
+    axes = numpy.asarray(axes, dtype=float)
+    angles_rad = numpy.asarray(angles_rad, dtype=float)
+    axes = axes / numpy.sqrt(
+        numpy.einsum("...i,...i->...", axes, axes))[..., None]
+    x, y, z = axes[..., 0], axes[..., 1], axes[..., 2]
+
+    c = numpy.cos(angles_rad)
+    s = numpy.sin(angles_rad)
+    t = 1.0 - c
+
+    mats = numpy.zeros(numpy.broadcast(x, c).shape + (4, 4))
+    mats[..., 0, 0] = c + x * x * t
+    mats[..., 1, 1] = c + y * y * t
+    mats[..., 2, 2] = c + z * z * t
+    mats[..., 0, 1] = x * y * t + z * s
+    mats[..., 1, 0] = x * y * t - z * s
+    mats[..., 0, 2] = x * z * t - y * s
+    mats[..., 2, 0] = x * z * t + y * s
+    mats[..., 1, 2] = y * z * t + x * s
+    mats[..., 2, 1] = y * z * t - x * s
+    mats[..., 3, 3] = 1.0
+    return mats
+
+
+def axis_angle_deg_to_mat44_array(axes, angles_deg):
+    """Same as axis_angle_rad_to_mat44_array() with angles in degrees."""
+
+    return axis_angle_rad_to_mat44_array(axes, numpy.radians(angles_deg))
+
+
+# When 1 + cos(angle) between two unit vectors is below this, they are
+# treated as antiparallel.
+ANTIPARALLEL_EPSILON = 1e-12
+
+
+def normalize_v3_array(vecs):
+    """Return an (N, 3) array of vecs scaled to unit length."""
+
+    return vecs / numpy.sqrt(
+        numpy.einsum("...i,...i->...", vecs, vecs))[..., None]
+
+
+def perpendicular_v3_array(vecs):
+    """Return a unit vector perpendicular to each vector in vecs."""
+
+    # Cross with the basis axis that is furthest from each vector.
+    basis = numpy.zeros(vecs.shape)
+    numpy.put_along_axis(
+        basis, numpy.argmin(numpy.abs(vecs), axis=-1)[..., None], 1.0,
+        axis=-1)
+    return normalize_v3_array(numpy.cross(vecs, basis))
+
+
+def quat_array_to_mat44_array(quats):
+    """Return an (N, 4, 4) stack of column-major rotation matrices, each laid
+    out like Matrix44.data, from an (N, 4) array of unit quaternions.
+
+    The batched version of Quat.as_matrix44().
+    """
+
+    quats = numpy.asarray(quats, dtype=float)
+    x, y, z, w = (quats[..., i] for i in range(4))
+
+    mats = numpy.zeros(quats.shape[:-1] + (4, 4))
+    # [column][row]
+    mats[..., 0, 0] = 1.0 - 2.0 * y * y - 2.0 * z * z
+    mats[..., 1, 0] = 2.0 * x * y - 2.0 * z * w
+    mats[..., 2, 0] = 2.0 * x * z + 2.0 * y * w
+    mats[..., 0, 1] = 2.0 * x * y + 2.0 * z * w
+    mats[..., 1, 1] = 1.0 - 2.0 * x * x - 2.0 * z * z
+    mats[..., 2, 1] = 2.0 * y * z - 2.0 * x * w
+    mats[..., 0, 2] = 2.0 * x * z - 2.0 * y * w
+    mats[..., 1, 2] = 2.0 * y * z + 2.0 * x * w
+    mats[..., 2, 2] = 1.0 - 2.0 * x * x - 2.0 * y * y
+    mats[..., 3, 3] = 1.0
+    return mats
+
+
+def rot_from_vectors_quat_array(start_vecs, end_vecs):
+    """Return an (N, 4) array of shortest arc rotations from each start
+    vector to the matching end vector.
+
+    The batched version of Quat.rot_from_vectors().  No trig functions are
+    used: with unit vectors a and b the quaternion is (a x b, 1 + a . b),
+    normalized.  Antiparallel pairs use a 180 degree rotation around an axis
+    perpendicular to a.
+    """
+
+    starts = normalize_v3_array(numpy.asarray(start_vecs, dtype=float))
+    ends = normalize_v3_array(numpy.asarray(end_vecs, dtype=float))
+    starts, ends = numpy.broadcast_arrays(starts, ends)
+
+    quats = numpy.empty(starts.shape[:-1] + (4,))
+    quats[..., :3] = numpy.cross(starts, ends)
+    quats[..., 3] = 1.0 + numpy.einsum("...i,...i->...", starts, ends)
+
+    antiparallel = quats[..., 3] <= ANTIPARALLEL_EPSILON
+    if numpy.any(antiparallel):
+        quats[antiparallel, :3] = perpendicular_v3_array(
+            starts[antiparallel])
+        quats[antiparallel, 3] = 0.0
+
+    return quats / numpy.sqrt(numpy.einsum("...i,...i->...", quats,
+                                           quats))[..., None]
+
+
+def rot_from_vectors_mat44_array(start_vecs, end_vecs):
+    """Return an (N, 4, 4) stack of shortest arc rotation matrices that
+    rotate each start vector onto the matching end vector.
+
+    The batched version of Matrix44.rot_from_vectors(), built from the
+    unit quaternions of rot_from_vectors_quat_array(), which keeps the
+    matrices orthonormal as the vectors near antiparallel.
+    """
+
+    return quat_array_to_mat44_array(
+        rot_from_vectors_quat_array(start_vecs, end_vecs))
+
+
+def perspective_deg_mat44_array(fov_y_deg, aspect, near, far):
+    """Return an (N, 4, 4) stack of perspective projection matrices.
+
+    The batched version of Matrix44.from_perspective_deg().  Each argument
+    is a number or an (N,) array.
+    """
+
+    f = 1.0 / numpy.tan(numpy.radians(numpy.asarray(fov_y_deg, dtype=float))
+                        * 0.5)
+    aspect = numpy.asarray(aspect, dtype=float)
+    near = numpy.asarray(near, dtype=float)
+    far = numpy.asarray(far, dtype=float)
+
+    mats = numpy.zeros(numpy.broadcast(f, aspect, near, far).shape + (4, 4))
+    # [column][row]
+    mats[..., 0, 0] = f / aspect
+    mats[..., 1, 1] = f
+    mats[..., 2, 2] = (far + near) / (near - far)
+    mats[..., 2, 3] = -1.0
+    mats[..., 3, 2] = 2.0 * far * near / (near - far)
+    return mats
+
+
+def ortho_mat44_array(left, right, bottom, top, near, far):
+    """Return an (N, 4, 4) stack of orthographic projection matrices.
+
+    The batched version of Matrix44.from_ortho().  Each argument is a number
+    or an (N,) array.
+    """
+
+    left, right, bottom, top, near, far = [
+        numpy.asarray(value, dtype=float)
+        for value in (left, right, bottom, top, near, far)]
+
+    mats = numpy.zeros(numpy.broadcast(
+        left, right, bottom, top, near, far).shape + (4, 4))
+    # [column][row]
+    mats[..., 0, 0] = 2.0 / (right - left)
+    mats[..., 1, 1] = 2.0 / (top - bottom)
+    mats[..., 2, 2] = -2.0 / (far - near)
+    mats[..., 3, 0] = -(right + left) / (right - left)
+    mats[..., 3, 1] = -(top + bottom) / (top - bottom)
+    mats[..., 3, 2] = -(far + near) / (far - near)
+    mats[..., 3, 3] = 1.0
+    return mats
+
+
+def look_at_mat44_array(eyes, targets, ups):
+    """Return an (N, 4, 4) stack of view matrices.
+
+    The batched version of Matrix44.from_look_at().  Each argument is a
+    single vector or an (N, 3) array.
+    """
+
+    eyes = numpy.asarray(eyes, dtype=float)
+    targets = numpy.asarray(targets, dtype=float)
+    ups = numpy.asarray(ups, dtype=float)
+
+    forward = normalize_v3_array(targets - eyes)
+    side = normalize_v3_array(numpy.cross(forward, ups))
+    cam_up = numpy.cross(side, forward)
+    eyes, forward = numpy.broadcast_arrays(eyes, forward)
+
+    mats = numpy.zeros(forward.shape[:-1] + (4, 4))
+    # [column][row]
+    mats[..., :3, 0] = side
+    mats[..., :3, 1] = cam_up
+    mats[..., :3, 2] = -forward
+    mats[..., 3, 0] = -numpy.einsum("...i,...i->...", side, eyes)
+    mats[..., 3, 1] = -numpy.einsum("...i,...i->...", cam_up, eyes)
+    mats[..., 3, 2] = numpy.einsum("...i,...i->...", forward, eyes)
+    mats[..., 3, 3] = 1.0
+    return mats
+
+
+def transform_v3_array(mats, vecs):
+    """Transform an (N, 3) array of vectors by a single stacked matrix
+    (4, 4) or by one matrix per vector (N, 4, 4).
+
+    The same as Matrix44 * Vec3 for each vector.
+    """
+
+    mats = numpy.asarray(mats)
+    vecs = numpy.asarray(vecs, dtype=float)
+    if mats.ndim == 2:
+        return numpy.dot(vecs, mats[:3, :3]) + mats[3, :3]
+
+    return (numpy.einsum("...i,...ij->...j", vecs, mats[..., :3, :3]) +
+            mats[..., 3, :3])
+
+
+def rotate_v3_array_euler_deg(vecs, eulers, order="xyz"):
+    """Rotate an (N, 3) array of vectors by euler angles in degrees.
+
+    eulers is either one x, y, z triple, which is converted to a single
+    matrix and applied to every vector, or an (N, 3) array with one triple
+    per vector.
+    """
 
-    rot_mat = Matrix44.from_rot_z(rot[2])
-    new_vec = rot_mat * new_vec
-    return new_vec
+    return transform_v3_array(euler_deg_to_mat44_array(eulers, order), vecs)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,138 @@
+"""
+Morph targets (blend shapes) stored as sparse vertex deltas.
+
+Most targets only move a small part of a mesh, so each MorphTarget stores the
+indices of the vertices it touches and a delta for each of them.
+MorphBlender sums weighted targets on top of the base positions into a
+preallocated (V, 3) position buffer.
+"""
+
+import numpy
+
+
+class MorphTarget(object):
+
+    def __init__(self, indices, deltas, name=None):
+        """Initialize from the indices of the touched vertices and an (M, 3)
+        array with the delta of each of them.
+
+        Indices must be unique and not negative.
+        """
+
+        self.indices = numpy.asarray(indices, dtype=numpy.intp)
+        self.deltas = numpy.asarray(deltas, dtype=float).reshape(-1, 3)
+        self.name = name
+
+        if len(self.indices) != len(self.deltas):
+            raise ValueError(
+                "MorphTarget has %d indices but %d deltas" % (
+                    len(self.indices), len(self.deltas)))
+        if len(self.indices) and self.indices.min() < 0:
+            raise ValueError(
+                "MorphTarget %s has a negative vertex index" % name)
+        if len(numpy.unique(self.indices)) != len(self.indices):
+            raise ValueError(
+                "MorphTarget %s has repeated vertex indices" % name)
+
+    def __len__(self):
+        """Return the number of vertices touched by this target."""
+        return len(self.indices)
+
+    def __repr__(self):
+        return str("MorphTarget(%s, %d vertices)" % (self.name, len(self)))
+
+    def check_vertex_count(self, num_vertices):
+        """Raise ValueError if this target touches a vertex at or past
+        num_vertices.
+        """
+
+        if len(self) and self.indices.max() >= num_vertices:
+            raise ValueError(
+                "MorphTarget %s touches vertex %d of %d" % (
+                    self.name, self.indices.max(), num_vertices))
+
+    @staticmethod
+    def from_deltas(deltas, tolerance=0.0, name=None):
+        """Return a new MorphTarget from a dense (V, 3) array of deltas,
+        keeping only vertices with a delta component larger than tolerance.
+        """
+
+        deltas = numpy.asarray(deltas, dtype=float).reshape(-1, 3)
+        indices = numpy.flatnonzero(
+            (numpy.abs(deltas) > tolerance).any(axis=1))
+        return MorphTarget(indices, deltas[indices], name)
+
+    @staticmethod
+    def from_positions(base_positions, target_positions, tolerance=0.0,
+                       name=None):
+        """Return a new MorphTarget from base and target (V, 3) positions.
+
+        Either argument may also be a list of Vec3.
+        """
+
+        base = numpy.asarray(base_positions, dtype=float)
+        target = numpy.asarray(target_positions, dtype=float)
+        return MorphTarget.from_deltas(target - base, tolerance, name)
+
+    def to_deltas(self, num_vertices):
+        """Return a dense (num_vertices, 3) array of deltas."""
+
+        self.check_vertex_count(num_vertices)
+        deltas = numpy.zeros((num_vertices, 3))
+        deltas[self.indices] = self.deltas
+        return deltas
+
+
+class MorphBlender(object):
+
+    def __init__(self, base_positions):
+        """Initialize from a (V, 3) array or list of Vec3 base positions."""
+
+        self.base_positions = numpy.array(
+            base_positions, dtype=float).reshape(-1, 3)
+        self.positions = self.base_positions.copy()
+        self.targets = []
+
+    def __len__(self):
+        """Return the number of targets."""
+        return len(self.targets)
+
+    def add_target(self, target):
+        """Add a MorphTarget and return its index for the weights passed to
+        blend().
+        """
+
+        target.check_vertex_count(len(self.base_positions))
+        self.targets.append(target)
+        return len(self.targets) - 1
+
+    def blend(self, weights, out=None):
+        """Return the base positions plus the weighted sum of the targets.
+
+        weights has one entry per target, in the order they were added.
+        Targets with a weight of zero are skipped.  The result is written
+        into out if given, otherwise into self.positions, which is reused
+        on every call.
+        """
+
+        if len(weights) != len(self.targets):
+            raise ValueError("Expected %d weights, got %d" % (
+                len(self.targets), len(weights)))
+
+        if out is None:
+            out = self.positions
+        out[...] = self.base_positions
+
+        for target, weight in zip(self.targets, weights):
+            if weight == 0.0 or not len(target):
+                continue
+            # Indices are unique within a target, so a fancy-index += is safe
+            out[target.indices] += weight * target.deltas
+
+        return out
+
+    def nbytes(self):
+        """Return the bytes used by the sparse target data."""
+
+        return sum(target.indices.nbytes + target.deltas.nbytes
+                   for target in self.targets)
@@ -0,0 +1,203 @@
+"""
+OBB
+Oriented bounding boxes fitted to points with principal component analysis,
+and batched separating axis overlap tests.
+
+An OBB array is three arrays: (N, 3) centers, (N, 3, 3) axes and (N, 3)
+half extents.  axes[i] holds one unit world space vector per row, for the
+box's local x, y and z, so a local point p maps to center + p . axes like
+the row vector convention of Matrix44.  Fitted axes are sorted from the
+longest spread of points to the shortest and are always right handed.
+"""
+
+import numpy
+
+from pedemath.bounds import flatten_point_sets
+from pedemath.bounds import min_max_to_rect3_array
+from pedemath.matrix import Matrix44
+from pedemath.quat import mat44_array_to_quat_array
+from pedemath.quat import Quat
+from pedemath.rect3 import Rect3
+from pedemath.vec3 import Vec3
+
+# Added to the rotation terms of the separating axis test so nearly
+# parallel edges, whose cross products are close to zero, don't report a
+# false separation.
+OBB_PARALLEL_EPSILON = 1e-9
+
+
+def obb_array_from_point_sets(point_sets):
+    """Fit one OBB to each of many point sets.
+
+    point_sets is a (B, N, 3) array or a list of (Ni, 3) arrays (or lists
+    of Vec3) that may differ in size; every set must have a point.
+    Return (centers, axes, half_extents).
+    """
+
+    points, counts, starts, sets = flatten_point_sets(point_sets)
+    if not len(counts):
+        return numpy.empty((0, 3)), numpy.empty((0, 3, 3)), numpy.empty(
+            (0, 3))
+
+    means = numpy.add.reduceat(points, starts) / counts[:, None]
+    offsets = points - means[sets]
+    covs = numpy.add.reduceat(offsets[:, :, None] * offsets[:, None, :],
+                              starts) / counts[:, None, None]
+
+    # eigh returns eigenvectors as columns sorted by increasing eigenvalue.
+    _, vectors = numpy.linalg.eigh(covs)
+    axes = vectors.transpose(0, 2, 1)[:, ::-1].copy()
+    left_handed = numpy.linalg.det(axes) < 0.0
+    axes[left_handed, 2] *= -1.0
+
+    local = numpy.einsum("nj,nij->ni", offsets, axes[sets])
+    local_mins = numpy.minimum.reduceat(local, starts)
+    local_maxs = numpy.maximum.reduceat(local, starts)
+
+    centers = means + numpy.einsum("ni,nij->nj",
+                                   (local_mins + local_maxs) * 0.5, axes)
+    return centers, axes, (local_maxs - local_mins) * 0.5
+
+
+def obb_array_overlap(centers_a, axes_a, half_a, centers_b, axes_b,
+                      half_b):
+    """Return a bool array, True where OBBs a and b overlap.
+
+    Arguments are OBB arrays that broadcast against each other, so box i
+    can be tested against box i, or every box against every other with
+    centers_a[:, None], axes_a[:, None], half_a[:, None].  Uses the 15 axis
+    separating axis test; touching boxes overlap.
+    """
+
+    half_a = numpy.asarray(half_a, dtype=float)
+    half_b = numpy.asarray(half_b, dtype=float)
+
+    # b's axes and center expressed in a's frame.
+    axes_a = numpy.asarray(axes_a, dtype=float)
+    rot = numpy.matmul(axes_a, numpy.swapaxes(axes_b, -1, -2))
+    abs_rot = numpy.abs(rot) + OBB_PARALLEL_EPSILON
+    offset = (numpy.asarray(centers_b, dtype=float) -
+              numpy.asarray(centers_a, dtype=float))
+    offset = numpy.matmul(axes_a, offset[..., None])[..., 0]
+
+    # a's face normals.
+    radius_b = numpy.matmul(abs_rot, half_b[..., None])[..., 0]
+    separated = (numpy.abs(offset) > half_a + radius_b).any(axis=-1)
+
+    # b's face normals.
+    radius_a = numpy.matmul(half_a[..., None, :], abs_rot)[..., 0, :]
+    offset_b = numpy.matmul(offset[..., None, :], rot)[..., 0, :]
+    separated |= (numpy.abs(offset_b) > radius_a + half_b).any(axis=-1)
+
+    # Cross products of one axis from each box.
+    for i in range(3):
+        i1, i2 = (i + 1) % 3, (i + 2) % 3
+        for j in range(3):
+            j1, j2 = (j + 1) % 3, (j + 2) % 3
+            radius_a = (half_a[..., i1] * abs_rot[..., i2, j] +
+                        half_a[..., i2] * abs_rot[..., i1, j])
+            radius_b = (half_b[..., j1] * abs_rot[..., i, j2] +
+                        half_b[..., j2] * abs_rot[..., i, j1])
+            distance = numpy.abs(offset[..., i2] * rot[..., i1, j] -
+                                 offset[..., i1] * rot[..., i2, j])
+            separated |= distance > radius_a + radius_b
+
+    return ~separated
+
+
+def obb_array_to_min_max(centers, axes, half_extents):
+    """Return (mins, maxs) of the axis aligned boxes around OBBs."""
+
+    centers = numpy.asarray(centers, dtype=float)
+    extents = numpy.einsum("...i,...ij->...j",
+                           numpy.asarray(half_extents, dtype=float),
+                           numpy.abs(axes))
+    return centers - extents, centers + extents
+
+
+def obb_array_to_rect3_array(centers, axes, half_extents):
+    """Return an (N, 6) Rect3 array bounding OBBs."""
+
+    return min_max_to_rect3_array(*obb_array_to_min_max(centers, axes,
+                                                        half_extents))
+
+
+class OBB(object):
+
+    def __init__(self, center, axes, half_extents):
+        """Initialize from a Vec3 center, axes as a Quat rotating the box's
+        local axes into place or a 3x3 array with one unit axis per row, and
+        a Vec3 of half extents along each axis.
+        """
+
+        self.center = Vec3(*center)
+        if isinstance(axes, Quat):
+            axes = axes.as_rot_mat33()
+        self.axes = numpy.array(axes, dtype=float).reshape(3, 3)
+        self.half_extents = Vec3(*half_extents)
+
+    @staticmethod
+    def from_points(points):
+        """Return a new OBB fitted to an (N, 3) array or a list of Vec3."""
+
+        centers, axes, half_extents = obb_array_from_point_sets([points])
+        return OBB(centers[0], axes[0], half_extents[0])
+
+    def __str__(self):
+        return "OBB(%s, %s, %s)" % (self.center, self.get_rot(),
+                                    self.half_extents)
+
+    def __repr__(self):
+        return "OBB(%r, %r, %r)" % (self.center, self.axes.tolist(),
+                                    self.half_extents)
+
+    def get_rot(self):
+        """Return the rotation of the box as a Quat."""
+
+        mat = numpy.identity(4)
+        mat[:3, :3] = self.axes
+        return Quat(*mat44_array_to_quat_array(mat))
+
+    def as_matrix44(self):
+        """Return a Matrix44 mapping the cube from -1 to 1 on each axis onto
+        the box.
+        """
+
+        mat = Matrix44()
+        mat.data[:3, :3] = self.axes * numpy.array(
+            self.half_extents.as_tuple())[:, None]
+        mat.data[3, :3] = self.center.as_tuple()
+        return mat
+
+    def corners(self):
+        """Return the (8, 3) array of the box's corners."""
+
+        signs = numpy.array([(x, y, z) for x in (-1, 1) for y in (-1, 1)
+                             for z in (-1, 1)], dtype=float)
+        return (numpy.array(self.center.as_tuple()) + numpy.dot(
+            signs * self.half_extents.as_tuple(), self.axes))
+
+    def contains_points(self, points):
+        """Return an (N,) bool array, True for points inside the box or on
+        its faces.
+        """
+
+        local = numpy.dot(numpy.asarray(points, dtype=float) -
+                          self.center.as_tuple(), self.axes.T)
+        return (numpy.abs(local) <= self.half_extents.as_tuple()).all(
+            axis=-1)
+
+    def overlaps(self, other):
+        """Return True if this box overlaps another OBB."""
+
+        return bool(obb_array_overlap(
+            self.center.as_tuple(), self.axes, self.half_extents.as_tuple(),
+            other.center.as_tuple(), other.axes,
+            other.half_extents.as_tuple()))
+
+    def to_rect3(self):
+        """Return the axis aligned Rect3 around the box."""
+
+        box = obb_array_to_rect3_array(self.center.as_tuple(), self.axes,
+                                       self.half_extents.as_tuple())
+        return Rect3(*[float(value) for value in box])
@@ -0,0 +1,342 @@
+"""
+Polygon
+Simple 2D polygons stored as an (N, 2) array of vertices, with vectorized
+area, centroid and point in polygon tests over arrays of points.
+
+Point tests use the even-odd rule with half open edges, so a point is
+inside where a ray from it crosses the boundary an odd number of times.
+Points within rounding error of an edge may be classified either way.
+"""
+
+import numpy
+
+from pedemath.rect import Rect
+from pedemath.triangulate import triangulate_polygon
+from pedemath.vec2 import Vec2
+
+
+def _as_points(points):
+    return numpy.asarray(points, dtype=float).reshape(-1, 2)
+
+
+def _ray_crossings(points, starts, ends):
+    """Return an (N, E) bool array, True where the ray from each point
+    towards +x crosses each edge.
+    """
+
+    y0, y1 = starts[:, 1], ends[:, 1]
+    spans = (y0 > points[:, 1, None]) != (y1 > points[:, 1, None])
+    dy = numpy.where(y1 != y0, y1 - y0, 1.0)
+    cross_x = starts[:, 0] + (points[:, 1, None] - y0) * (
+        (ends[:, 0] - starts[:, 0]) / dy)
+    return spans & (cross_x > points[:, 0, None])
+
+
+class Polygon(object):
+
+    def __init__(self, points):
+        """Initialize from an (N, 2) array or a list of Vec2 with at least
+        three vertices, in either winding.  A last vertex repeating the
+        first is dropped.
+        """
+
+        coords = _as_points(points)
+        if len(coords) > 1 and (coords[0] == coords[-1]).all():
+            coords = coords[:-1]
+        if len(coords) < 3:
+            raise ValueError("A polygon needs at least 3 vertices")
+
+        self.coords = coords
+        self.grid = None
+
+    def __len__(self):
+        return len(self.coords)
+
+    def __str__(self):
+        return "Polygon(%s)" % ", ".join(str(Vec2(*point))
+                                         for point in self.coords)
+
+    def __repr__(self):
+        return "Polygon(%r)" % (self.coords.tolist(),)
+
+    def edges(self):
+        """Return (starts, ends), the (N, 2) arrays of each edge's
+        vertices.
+        """
+
+        return self.coords, numpy.roll(self.coords, -1, axis=0)
+
+    def signed_area(self):
+        """Return the area, positive if the vertices wind counter-clockwise
+        and negative if clockwise.
+        """
+
+        # Relative to the first vertex, so large coordinates don't cancel.
+        offsets = self.coords - self.coords[0]
+        following = numpy.roll(offsets, -1, axis=0)
+        return float((offsets[:, 0] * following[:, 1] -
+                      offsets[:, 1] * following[:, 0]).sum()) * 0.5
+
+    def area(self):
+        return abs(self.signed_area())
+
+    def winding(self):
+        """Return 1 if the vertices wind counter-clockwise, -1 if clockwise
+        and 0 if the polygon has no area.
+        """
+
+        area = self.signed_area()
+        return (area > 0.0) - (area < 0.0)
+
+    def centroid(self):
+        """Return the center of mass as a Vec2.  Raise ValueError if the
+        polygon has no area.
+        """
+
+        offsets = self.coords - self.coords[0]
+        following = numpy.roll(offsets, -1, axis=0)
+        cross = (offsets[:, 0] * following[:, 1] -
+                 offsets[:, 1] * following[:, 0])
+        area = cross.sum() * 0.5
+        if area == 0.0:
+            raise ValueError("Polygon has no area")
+
+        center = ((offsets + following) * cross[:, None]).sum(axis=0) / (
+            6.0 * area)
+        return Vec2(*(center + self.coords[0]))
+
+    def bounds(self):
+        """Return the Rect around the polygon."""
+
+        mins = self.coords.min(axis=0)
+        size = self.coords.max(axis=0) - mins
+        return Rect(float(mins[0]), float(mins[1]), float(size[0]),
+                    float(size[1]))
+
+    def build_grid(self, cells=None):
+        """Build a uniform grid over the polygon's bounds that speeds up
+        contains_points() for polygons with many edges, and return self.
+
+        cells is the number of cells along each side, by default about the
+        square root of the number of edges.  Each cell lists the edges
+        touching it and whether its center is inside, so a point only needs
+        to be tested against the edges of its cell.
+        """
+
+        if cells is None:
+            cells = int(numpy.sqrt(len(self.coords))) + 1
+        self.grid = _Grid(self, cells)
+        return self
+
+    def contains_points(self, points, block_size=4096):
+        """Return an (N,) bool array, True for points inside the polygon.
+
+        points is an (N, 2) array or a list of Vec2.  Points outside the
+        bounds are rejected first, and the rest are tested block_size at a
+        time against every edge, or against their grid cell's edges after
+        build_grid().
+        """
+
+        points = _as_points(points)
+        bounds = self.bounds()
+        inside = ((points[:, 0] >= bounds.x) &
+                  (points[:, 0] <= bounds.x + bounds.width) &
+                  (points[:, 1] >= bounds.y) &
+                  (points[:, 1] <= bounds.y + bounds.height))
+        candidates = numpy.flatnonzero(inside)
+
+        starts, ends = self.edges()
+        for first in range(0, len(candidates), block_size):
+            block = candidates[first:first + block_size]
+            if self.grid is not None:
+                inside[block] = self.grid.contains_points(points[block])
+            else:
+                crossings = _ray_crossings(points[block], starts, ends)
+                inside[block] = crossings.sum(axis=1) % 2 == 1
+
+        return inside
+
+    def contains_point(self, point):
+        """Return True if a Vec2 or (x, y) point is inside the polygon."""
+
+        return bool(self.contains_points([point[0], point[1]])[0])
+
+    def triangulate(self, holes=()):
+        """Return a (T, 3) array of counter-clockwise triangles covering
+        the polygon, less holes, a list of Polygon or point arrays inside
+        it.  Indices count through coords and then each hole's vertices,
+        as in triangulate_polygon().
+        """
+
+        return triangulate_polygon(
+            self.coords, [hole.coords if isinstance(hole, Polygon) else hole
+                          for hole in holes])
+
+
+class _Grid(object):
+    """Per cell edge lists and center inside flags for a Polygon.
+
+    A point p in a cell is inside if the cell's center c is, flipped once
+    for every edge crossed going from p across to the corner k = (c.x, p.y)
+    and then up or down to c.  Both legs stay in the cell, so only its
+    edges are tested.  p is tested with the same rays as without a grid,
+    and c with the same upward rays that find whether it is inside.  Edges
+    through k would count differently along each leg, so both legs decide
+    which side of an edge k is on from one orientation sign, with ties
+    broken as if k were moved slightly up and right.
+    """
+
+    def __init__(self, polygon, cells):
+        bounds = polygon.bounds()
+        self.cells = cells
+        self.origin = numpy.array([bounds.x, bounds.y])
+        self.cell_size = numpy.maximum(
+            numpy.array([bounds.width, bounds.height]) / cells, 1e-300)
+        self.starts, self.ends = polygon.edges()
+
+        cell_indices = numpy.arange(cells)
+        centers = self.origin + (cell_indices[:, None] + 0.5) * self.cell_size
+        # centers_inside[row, column], from the sorted crossings of the
+        # line through each column of centers, counted upwards like the
+        # second leg of contains_points().
+        self.centers_inside = numpy.empty((cells, cells), dtype=bool)
+        x0, x1 = self.starts[:, 0], self.ends[:, 0]
+        for column, center_x in enumerate(centers[:, 0]):
+            spans = (x0 > center_x) != (x1 > center_x)
+            cross_y = numpy.sort(self.starts[spans, 1] + (
+                center_x - x0[spans]) * (
+                    (self.ends[spans, 1] - self.starts[spans, 1]) /
+                    (x1[spans] - x0[spans])))
+            crossings = len(cross_y) - numpy.searchsorted(
+                cross_y, centers[:, 1], side="right")
+            self.centers_inside[:, column] = crossings % 2 == 1
+        self.centers = centers
+
+        edge_cells, edges = self._edge_cells()
+        order = numpy.argsort(edge_cells, kind="stable")
+        self.cell_edges = edges[order]
+        self.cell_starts = numpy.searchsorted(edge_cells[order],
+                                              numpy.arange(cells * cells + 1))
+
+    def _cell_coords(self, points):
+        cell_coords = numpy.floor((points - self.origin) / self.cell_size)
+        return numpy.clip(cell_coords, 0, self.cells - 1).astype(numpy.intp)
+
+    def _edge_cells(self):
+        """Return (cells, edges) listing each cell an edge touches, as
+        row * cells + column.
+
+        Each edge is cut at the column boundaries and each piece lists the
+        rows between its ends, so long diagonal edges only list the cells
+        along them.  Cells are grown slightly so points rounded into a
+        neighboring cell still see the edge.
+        """
+
+        margin = self.cell_size * 1e-6
+        starts, ends = self.starts, self.ends
+        mins, maxs = numpy.minimum(starts, ends), numpy.maximum(starts, ends)
+        low_columns = self._cell_coords(mins - margin)[:, 0]
+        high_columns = self._cell_coords(maxs + margin)[:, 0]
+        counts = high_columns - low_columns + 1
+
+        edges = numpy.repeat(numpy.arange(len(starts)), counts)
+        columns = low_columns[edges] + numpy.arange(len(edges)) - (
+            numpy.repeat(numpy.cumsum(counts) - counts, counts))
+
+        # The y range of each edge piece within its column.
+        column_min = self.origin[0] + columns * self.cell_size[0] - margin[0]
+        piece_x = numpy.column_stack([
+            numpy.maximum(mins[edges, 0], column_min),
+            numpy.minimum(maxs[edges, 0],
+                          column_min + self.cell_size[0] + margin[0] * 2.0)])
+        x0, y0 = starts[edges, 0], starts[edges, 1]
+        dx = ends[edges, 0] - x0
+        slope = (ends[edges, 1] - y0) / numpy.where(dx != 0.0, dx, 1.0)
+        piece_y = y0[:, None] + (piece_x - x0[:, None]) * slope[:, None]
+        vertical = dx == 0.0
+        piece_y[vertical] = numpy.column_stack([mins[edges[vertical], 1],
+                                                maxs[edges[vertical], 1]])
+
+        low_rows = self._cell_coords(numpy.column_stack(
+            [piece_x[:, 0], piece_y.min(axis=1) - margin[1]]))[:, 1]
+        high_rows = self._cell_coords(numpy.column_stack(
+            [piece_x[:, 0], piece_y.max(axis=1) + margin[1]]))[:, 1]
+        counts = high_rows - low_rows + 1
+
+        pieces = numpy.repeat(numpy.arange(len(edges)), counts)
+        rows = low_rows[pieces] + numpy.arange(len(pieces)) - (
+            numpy.repeat(numpy.cumsum(counts) - counts, counts))
+        return rows * self.cells + columns[pieces], edges[pieces]
+
+    def contains_points(self, points):
+        cell_coords = self._cell_coords(points)
+        cells = cell_coords[:, 1] * self.cells + cell_coords[:, 0]
+        inside = self.centers_inside[cell_coords[:, 1], cell_coords[:, 0]]
+
+        # One entry for each point and edge of its cell.
+        counts = self.cell_starts[cells + 1] - self.cell_starts[cells]
+        owners = numpy.repeat(numpy.arange(len(points)), counts)
+        within = numpy.arange(len(owners)) - numpy.repeat(
+            numpy.cumsum(counts) - counts, counts)
+        edges = self.cell_edges[self.cell_starts[cells][owners] + within]
+        starts, ends = self.starts[edges], self.ends[edges]
+        points = points[owners]
+        center_x = self.centers[cell_coords[owners, 0], 0]
+        center_y = self.centers[cell_coords[owners, 1], 1]
+
+        # Which side of each edge k = (c.x, p.y) is on, counting k as on
+        # the left of edges through it that point right, or straight down.
+        x0, y0 = starts[:, 0], starts[:, 1]
+        x1, y1 = ends[:, 0], ends[:, 1]
+        edge_x, edge_y = x1 - x0, y1 - y0
+        turn = edge_x * (points[:, 1] - y0) - edge_y * (center_x - x0)
+        left = (turn > 0.0) | ((turn == 0.0) & (
+            (edge_x > 0.0) | ((edge_x == 0.0) & (edge_y < 0.0))))
+
+        # Across from p to k: edges the ray from one crosses and the ray
+        # from the other doesn't.
+        spans_y = (y0 > points[:, 1]) != (y1 > points[:, 1])
+        dy = numpy.where(y1 != y0, edge_y, 1.0)
+        cross_x = x0 + (points[:, 1] - y0) * (edge_x / dy)
+        flips = spans_y & ((cross_x > points[:, 0]) !=
+                           (left == (edge_y > 0.0)))
+
+        # Up or down from k to c, counted with upward rays.
+        spans_x = (x0 > center_x) != (x1 > center_x)
+        dx = numpy.where(x1 != x0, edge_x, 1.0)
+        cross_y = y0 + (center_x - x0) * (edge_y / dx)
+        flips ^= spans_x & ((left != (edge_x > 0.0)) != (cross_y > center_y))
+
+        return inside ^ (numpy.bincount(owners, weights=flips,
+                                        minlength=len(inside)) % 2 == 1)
+
+
+def points_in_polygons(polygons, points):
+    """Return (point_indices, polygon_indices) for every point inside each
+    of a list of Polygons, sorted by polygon then point.
+
+    Each polygon only tests the points inside its bounds.
+    """
+
+    points = _as_points(points)
+    order = numpy.argsort(points[:, 0], kind="stable")
+    sorted_x = points[order, 0]
+
+    found_points = []
+    found_polygons = []
+    for index, polygon in enumerate(polygons):
+        bounds = polygon.bounds()
+        # Points in the polygon's x range, from the sorted x coordinates.
+        low = numpy.searchsorted(sorted_x, bounds.x, side="left")
+        high = numpy.searchsorted(sorted_x, bounds.x + bounds.width,
+                                  side="right")
+        candidates = numpy.sort(order[low:high])
+        inside = candidates[polygon.contains_points(points[candidates])]
+        found_points.append(inside)
+        found_polygons.append(numpy.full(len(inside), index,
+                                         dtype=numpy.intp))
+
+    if not found_points:
+        return (numpy.empty(0, dtype=numpy.intp),
+                numpy.empty(0, dtype=numpy.intp))
+    return numpy.concatenate(found_points), numpy.concatenate(found_polygons)
@@ -0,0 +1,218 @@
+"""
+Polylines
+Arc length, resampling and simplification of 2D or 3D polylines.
+
+A polyline is an (N, D) array of points, or a list of Vec2 or Vec3, joined
+in order.  Simplification keeps the first and last points and returns the
+kept points, or their indices with return_indices.
+"""
+
+import heapq
+import math
+
+import numpy
+
+
+def _as_polyline(points):
+    points = numpy.asarray(points, dtype=float)
+    if points.ndim != 2:
+        raise ValueError("Expected an (N, D) array of points, not shape %r" %
+                         (points.shape,))
+    return points
+
+
+def arc_length_array(points):
+    """Return the (N,) distances along a polyline to each of its points,
+    starting from 0.
+    """
+
+    points = _as_polyline(points)
+    lengths = numpy.zeros(len(points))
+    numpy.cumsum(numpy.linalg.norm(numpy.diff(points, axis=0), axis=1),
+                 out=lengths[1:])
+    return lengths
+
+
+def resample_polyline(points, spacing):
+    """Return an (M, D) array of points spacing apart along a polyline,
+    from its first point, plus its last point if the spacing doesn't land
+    on it.
+    """
+
+    if spacing <= 0.0:
+        raise ValueError("spacing must be positive, not %r" % (spacing,))
+
+    points = _as_polyline(points)
+    if len(points) < 2:
+        return points.copy()
+
+    lengths = arc_length_array(points)
+    total = lengths[-1]
+    distances = numpy.arange(0.0, total, spacing)
+    if not len(distances) or distances[-1] < total:
+        distances = numpy.append(distances, total)
+
+    # The segment each distance falls in, after any zero length segments.
+    segments = numpy.clip(numpy.searchsorted(lengths, distances,
+                                             side="right") - 1,
+                          0, len(points) - 2)
+    segment_lengths = lengths[segments + 1] - lengths[segments]
+    t = (distances - lengths[segments]) / numpy.where(
+        segment_lengths > 0.0, segment_lengths, 1.0)
+    t = numpy.clip(t, 0.0, 1.0)
+    return points[segments] + (
+        points[segments + 1] - points[segments]) * t[:, None]
+
+
+def simplify_douglas_peucker(points, tolerance, return_indices=False):
+    """Return a polyline simplified with the Douglas-Peucker algorithm,
+    keeping points until every dropped point is within tolerance of the
+    simplified line.  tolerance must not be negative.
+
+    Instead of recursing, each pass measures every undecided point against
+    the segment between the kept points around it and splits every range
+    at its furthest point at once, so each pass is a few array operations
+    over the whole polyline.
+    """
+
+    if tolerance < 0.0:
+        raise ValueError("tolerance must be zero or more, not %r" %
+                         (tolerance,))
+
+    points = _as_polyline(points)
+    count = len(points)
+    if count < 3:
+        indices = numpy.arange(count)
+        return indices if return_indices else points.copy()
+
+    keep = numpy.zeros(count, dtype=bool)
+    keep[[0, -1]] = True
+    # Points whose range still has a point further than tolerance, and the
+    # kept points around them.
+    open_points = numpy.arange(1, count - 1)
+    starts = numpy.zeros(len(open_points), dtype=numpy.intp)
+    ends = numpy.full(len(open_points), count - 1, dtype=numpy.intp)
+    tolerance_sq = tolerance * tolerance
+
+    # Contiguous coordinate columns are much faster to gather and sum than
+    # the rows of points.
+    columns = [numpy.ascontiguousarray(points[:, i])
+               for i in range(points.shape[1])]
+
+    while len(open_points):
+        segment_vecs = [column[ends] - column[starts] for column in columns]
+        offsets = [column[open_points] - column[starts]
+                   for column in columns]
+        length_sq = sum(vec * vec for vec in segment_vecs)
+        t = sum(offset * vec for offset, vec in zip(offsets, segment_vecs))
+        t /= numpy.where(length_sq > 0.0, length_sq, 1.0)
+        numpy.clip(t, 0.0, 1.0, out=t)
+        dists_sq = sum((offset - vec * t) ** 2
+                       for offset, vec in zip(offsets, segment_vecs))
+
+        # open_points are sorted, so each range's points are together.
+        firsts = numpy.flatnonzero(numpy.diff(starts, prepend=-1))
+        ranges = numpy.repeat(numpy.arange(len(firsts)),
+                              numpy.diff(firsts, append=len(starts)))
+        maxs = numpy.maximum.reduceat(dists_sq, firsts)
+        candidates = numpy.flatnonzero(dists_sq == maxs[ranges])
+        _, first_max = numpy.unique(ranges[candidates], return_index=True)
+        splits = open_points[candidates[first_max]]
+        keep[splits[maxs > tolerance_sq]] = True
+
+        still_open = (maxs[ranges] > tolerance_sq) & ~keep[open_points]
+        split_of_point = splits[ranges]
+        below = open_points < split_of_point
+        ends = numpy.where(below, split_of_point, ends)[still_open]
+        starts = numpy.where(below, starts, split_of_point)[still_open]
+        open_points = open_points[still_open]
+
+    indices = numpy.flatnonzero(keep)
+    if return_indices:
+        return indices
+    return points[indices]
+
+
+def _triangle_area_array(a, b, c):
+    ab = b - a
+    ac = c - a
+    if a.shape[-1] == 2:
+        return numpy.abs(ab[:, 0] * ac[:, 1] - ab[:, 1] * ac[:, 0]) * 0.5
+    return numpy.linalg.norm(numpy.cross(ab, ac), axis=-1) * 0.5
+
+
+def _neighbor_area(xs, ys, zs, a, b, c, floor):
+    """Return the area of the triangle of points a, b and c from coordinate
+    lists, or floor if that is larger.  zs is None for 2D points.
+    """
+
+    abx, aby = xs[b] - xs[a], ys[b] - ys[a]
+    acx, acy = xs[c] - xs[a], ys[c] - ys[a]
+    cross_z = abx * acy - aby * acx
+    if zs is None:
+        area = abs(cross_z) * 0.5
+    else:
+        abz, acz = zs[b] - zs[a], zs[c] - zs[a]
+        area = math.sqrt((aby * acz - abz * acy) ** 2 +
+                         (abz * acx - abx * acz) ** 2 + cross_z ** 2) * 0.5
+    return area if area > floor else floor
+
+
+def simplify_visvalingam(points, min_area=0.0, count=None,
+                         return_indices=False):
+    """Return a polyline simplified with the Visvalingam-Whyatt algorithm.
+
+    Points are removed one at a time, smallest first by the area of the
+    triangle they make with their neighbors, while that area is below
+    min_area or while more than count points remain.  A point's area is
+    never less than the area of a point removed before it, so areas grow
+    as points are removed.
+    """
+
+    points = _as_polyline(points)
+    total = len(points)
+    if points.shape[1] not in (2, 3):
+        raise ValueError("Expected 2D or 3D points")
+    if total < 3:
+        indices = numpy.arange(total)
+        return indices if return_indices else points.copy()
+
+    areas = [0.0] + _triangle_area_array(points[:-2], points[1:-1],
+                                         points[2:]).tolist() + [0.0]
+    heap = [(area, i) for i, area in enumerate(areas[1:-1], 1)]
+    heapq.heapify(heap)
+    before = list(range(-1, total - 1))
+    after = list(range(1, total + 1))
+    removed = [False] * total
+    remaining = total
+    # Plain lists and _neighbor_area() are much faster than numpy for one
+    # triangle at a time.
+    xs, ys = points[:, 0].tolist(), points[:, 1].tolist()
+    zs = points[:, 2].tolist() if points.shape[1] == 3 else None
+    heappop, heappush = heapq.heappop, heapq.heappush
+    last = total - 1
+
+    while heap and remaining > 2:
+        area, i = heap[0]
+        if removed[i] or area != areas[i]:
+            heappop(heap)
+            continue
+        if area >= min_area and (count is None or remaining <= count):
+            break
+
+        heappop(heap)
+        removed[i] = True
+        remaining -= 1
+        prev_i, next_i = before[i], after[i]
+        after[prev_i] = next_i
+        before[next_i] = prev_i
+        for j in (prev_i, next_i):
+            if 0 < j < last:
+                areas[j] = new_area = _neighbor_area(
+                    xs, ys, zs, before[j], j, after[j], area)
+                heappush(heap, (new_area, j))
+
+    indices = numpy.flatnonzero(~numpy.array(removed))
+    if return_indices:
+        return indices
+    return points[indices]
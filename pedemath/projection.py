@@ -0,0 +1,64 @@
+"""
+Batched projection of 3D points to the screen.
+
+Points are transformed by a model-view-projection Matrix44 into clip space,
+divided by w and mapped to a viewport, following the OpenGL conventions:
+clip space is -w <= x, y, z <= w and window depth is in [0, 1].
+"""
+
+import numpy
+
+
+def _viewport_tuple(viewport):
+    if hasattr(viewport, "width"):
+        return viewport.x, viewport.y, viewport.width, viewport.height
+    return tuple(viewport)
+
+
+def clip_v3_array(mvp, points):
+    """Return the (N, 4) clip space coordinates of (N, 3) points.
+
+    mvp is a Matrix44 or a (4, 4) array laid out like Matrix44.data.
+    """
+
+    data = numpy.asarray(getattr(mvp, "data", mvp), dtype=float)
+    points = numpy.asarray(points, dtype=float).reshape(-1, 3)
+    # Column-major: clip[row] = sum(point[col] * data[col][row]) + data[3][row]
+    return numpy.dot(points, data[:3]) + data[3]
+
+
+def project_v3_array(mvp, points, viewport, flip_y=False):
+    """Project (N, 3) points to window coordinates.
+
+    mvp: model-view-projection Matrix44 or (4, 4) array like Matrix44.data.
+    viewport: a Rect or (x, y, width, height) tuple, as for glViewport.
+    flip_y: if True, y grows downwards from the top of the viewport instead
+        of upwards from the bottom.
+
+    Return (screen, depth, clipped):
+    screen: (N, 2) window x, y.
+    depth: (N,) window depth, 0 at the near plane and 1 at the far plane.
+    clipped: (N,) bool, True for points outside the clip volume.  Their
+        screen and depth values are not meaningful, and are nan when w is 0.
+    """
+
+    x, y, width, height = _viewport_tuple(viewport)
+    clip = clip_v3_array(mvp, points)
+    w = clip[:, 3]
+
+    clipped = ~((numpy.abs(clip[:, :3]) <= w[:, None]).all(axis=1) &
+                (w > 0.0))
+
+    inv_w = numpy.full(w.shape, numpy.nan)
+    numpy.divide(1.0, w, out=inv_w, where=w != 0.0)
+    ndc = clip[:, :3] * inv_w[:, None]
+
+    screen = numpy.empty((len(ndc), 2))
+    screen[:, 0] = x + (ndc[:, 0] + 1.0) * (width * 0.5)
+    if flip_y:
+        screen[:, 1] = y + (1.0 - ndc[:, 1]) * (height * 0.5)
+    else:
+        screen[:, 1] = y + (ndc[:, 1] + 1.0) * (height * 0.5)
+    depth = (ndc[:, 2] + 1.0) * 0.5
+
+    return screen, depth, clipped
@@ -1,7 +1,13 @@
 import logging
 import math
 
+import numpy
+
+from pedemath.matrix import check_euler_order
+from pedemath.matrix import EULER_AXES
 from pedemath.matrix import Matrix44
+from pedemath.matrix import quat_array_to_mat44_array
+from pedemath.matrix import rot_from_vectors_quat_array
 from pedemath.vec3 import add_v3
 from pedemath.vec3 import normalize_v3
 from pedemath.vec3 import scale_v3
@@ -58,6 +64,199 @@ def nlerp_quat(from_quat, to_quat, percent):
     return result
 
 
+# Quaternion arrays have shape (N, 4) and store x, y, z, w in that order,
+# the same order Quat uses for indexing.
+
+
+def dot_quat_array(quats1, quats2):
+    """Return the dot product of each pair of quaternions as an (N,) array."""
+
+    return numpy.einsum("...i,...i->...", quats1, quats2)
+
+
+def normalize_quat_array(quats):
+    """Return a new array with each quaternion normalized."""
+
+    quats = numpy.asarray(quats, dtype=float)
+    return quats / numpy.sqrt(dot_quat_array(quats, quats))[..., None]
+
+
+def mul_quat_array(quats1, quats2):
+    """Return the products quats1[i] * quats2[i] as an (N, 4) array.
+
+    Either argument may be a single quaternion, which is then broadcast.
+    """
+
+    quats1 = numpy.asarray(quats1, dtype=float)
+    quats2 = numpy.asarray(quats2, dtype=float)
+    x1, y1, z1, w1 = (quats1[..., i] for i in range(4))
+    x2, y2, z2, w2 = (quats2[..., i] for i in range(4))
+
+    return numpy.stack((
+        w1 * x2 + x1 * w2 + y1 * z2 - z1 * y2,
+        w1 * y2 - x1 * z2 + y1 * w2 + z1 * x2,
+        w1 * z2 + x1 * y2 - y1 * x2 + z1 * w2,
+        w1 * w2 - x1 * x2 - y1 * y2 - z1 * z2), axis=-1)
+
+
+def euler_rad_to_quat_array(eulers, order="xyz"):
+    """Return an (N, 4) quaternion array from an (N, 3) array of x, y, z
+    euler angles in radians.
+
+    order gives the axes in the order the rotations are applied to a vector,
+    as in pedemath.matrix.euler_rad_to_mat44_array().  With the default
+    "xyz" order this is the inverse of Quat.to_euler_rad().
+    """
+
+    check_euler_order(order)
+
+    eulers = numpy.asarray(eulers, dtype=float)
+    quats = None
+    for axis_name in order:
+        axis = EULER_AXES[axis_name]
+        half_angles = eulers[..., axis] * 0.5
+        axis_quats = numpy.zeros(half_angles.shape + (4,))
+        axis_quats[..., axis] = numpy.sin(half_angles)
+        axis_quats[..., 3] = numpy.cos(half_angles)
+        quats = (axis_quats if quats is None
+                 else mul_quat_array(axis_quats, quats))
+
+    return quats
+
+
+def euler_deg_to_quat_array(eulers, order="xyz"):
+    """Same as euler_rad_to_quat_array() with angles in degrees."""
+
+    return euler_rad_to_quat_array(numpy.radians(eulers), order)
+
+
+def rotate_vec_quat_array(quats, vecs):
+    """Rotate each vector in vecs (N, 3) by the matching unit quaternion.
+
+    Uses the same formula as Quat.rotate_vec():
+    v + 2.0*cross(q.xyz, cross(q.xyz,v) + q.w*v)
+    """
+
+    quats = numpy.asarray(quats, dtype=float)
+    vecs = numpy.asarray(vecs, dtype=float)
+    xyz = quats[..., :3]
+    tmp = numpy.cross(xyz, vecs) + quats[..., 3:] * vecs
+    return vecs + 2.0 * numpy.cross(xyz, tmp)
+
+
+def mat44_array_to_quat_array(mats):
+    """Return an (N, 4) quaternion array from an (N, 4, 4) stack of
+    column-major rotation matrices.
+
+    The batched version of Quat.set_from_matrix44().  Every matrix picks one
+    of the same four branches, by trace or by largest diagonal element, and
+    each branch is computed only for the matrices that use it.
+    """
+
+    mats = numpy.asarray(mats, dtype=float)
+    m00 = mats[..., 0, 0]
+    m11 = mats[..., 1, 1]
+    m22 = mats[..., 2, 2]
+    trace = m00 + m11 + m22 + 1.0
+
+    use_w = trace > 0.00000001
+    use_x = ~use_w & (m00 > m11) & (m00 > m22)
+    use_y = ~use_w & ~use_x & (m11 > m22)
+    use_z = ~use_w & ~use_x & ~use_y
+
+    quats = numpy.empty(mats.shape[:-2] + (4,))
+
+    m = mats[use_w]
+    n4 = numpy.sqrt(trace[use_w]) * 2.0
+    quats[use_w] = numpy.stack((
+        (m[:, 1, 2] - m[:, 2, 1]) / n4,
+        (m[:, 2, 0] - m[:, 0, 2]) / n4,
+        (m[:, 0, 1] - m[:, 1, 0]) / n4,
+        n4 / 4.0), axis=-1)
+
+    m = mats[use_x]
+    s = 2.0 * numpy.sqrt(1.0 + m[:, 0, 0] - m[:, 1, 1] - m[:, 2, 2])
+    quats[use_x] = numpy.stack((
+        s / 4.0,
+        (m[:, 1, 0] + m[:, 0, 1]) / s,
+        (m[:, 2, 0] + m[:, 0, 2]) / s,
+        (m[:, 1, 2] - m[:, 2, 1]) / s), axis=-1)
+
+    m = mats[use_y]
+    s = 2.0 * numpy.sqrt(1.0 - m[:, 0, 0] + m[:, 1, 1] - m[:, 2, 2])
+    quats[use_y] = numpy.stack((
+        (m[:, 1, 0] + m[:, 0, 1]) / s,
+        s / 4.0,
+        (m[:, 2, 1] + m[:, 1, 2]) / s,
+        (m[:, 2, 0] - m[:, 0, 2]) / s), axis=-1)
+
+    m = mats[use_z]
+    s = 2.0 * numpy.sqrt(1.0 - m[:, 0, 0] - m[:, 1, 1] + m[:, 2, 2])
+    quats[use_z] = numpy.stack((
+        (m[:, 2, 0] + m[:, 0, 2]) / s,
+        (m[:, 2, 1] + m[:, 1, 2]) / s,
+        s / 4.0,
+        (m[:, 0, 1] - m[:, 1, 0]) / s), axis=-1)
+
+    return quats
+
+
+def quat_array_to_euler_rad(quats):
+    """Return an (N, 3) array of x, y, z euler angles in radians from an
+    (N, 4) quaternion array.
+
+    The batched version of Quat.to_euler_rad().
+    """
+
+    quats = numpy.asarray(quats, dtype=float)
+    x, y, z, w = (quats[..., i] for i in range(4))
+    sqw = w * w
+    sqx = x * x
+    sqy = y * y
+    sqz = z * z
+
+    eulers = numpy.empty(quats.shape[:-1] + (3,))
+    eulers[..., 0] = numpy.arctan2(2.0 * (y * z + x * w),
+                                   (-sqx - sqy + sqz + sqw))
+    # Clip so rounding error near +-90 degrees doesn't give nan.
+    eulers[..., 1] = numpy.arcsin(
+        numpy.clip(-2.0 * (x * z - y * w), -1.0, 1.0))
+    eulers[..., 2] = numpy.arctan2(2.0 * (x * y + z * w),
+                                   (sqx - sqy - sqz + sqw))
+    return eulers
+
+
+def quat_array_to_euler_deg(quats):
+    """Same as quat_array_to_euler_rad() with angles in degrees."""
+
+    return numpy.degrees(quat_array_to_euler_rad(quats))
+
+
+def axis_angle_rad_to_quat_array(axes, angles_rad):
+    """Return an (N, 4) quaternion array from an (N, 3) array of axes and an
+    (N,) array of angles in radians.
+
+    The batched version of Quat.from_axis_angle_rad().  The axes are
+    normalized first.
+    """
+
+    axes = numpy.asarray(axes, dtype=float)
+    half_angles = numpy.asarray(angles_rad, dtype=float) * 0.5
+    lengths = numpy.sqrt(numpy.einsum("...i,...i->...", axes, axes))
+
+    quats = numpy.empty(numpy.broadcast(
+        axes[..., 0], half_angles).shape + (4,))
+    quats[..., :3] = axes * (numpy.sin(half_angles) / lengths)[..., None]
+    quats[..., 3] = numpy.cos(half_angles)
+    return quats
+
+
+def axis_angle_deg_to_quat_array(axes, angles_deg):
+    """Same as axis_angle_rad_to_quat_array() with angles in degrees."""
+
+    return axis_angle_rad_to_quat_array(axes, numpy.radians(angles_deg))
+
+
 class Quat(object):
 
     def __init__(self, x=0.0, y=0.0, z=0.0, w=1.0):
@@ -191,6 +390,30 @@ class Quat(object):
         return add_v3(vec, scale_v3(
             xyz.cross(xyz.cross(vec) + scale_v3(vec, self.w)), 2.0))
 
+    def rotate_vec_array(self, vecs, out=None):
+        """Rotate an (N, 3) array or list of Vec3 and return an (N, 3) array.
+
+        The quaternion is converted once to a rotation matrix, which is then
+        applied to every vector.  Even for a handful of vectors this is
+        cheaper than the cross product formula in rotate_vec(), so use
+        rotate_vec() only for a single Vec3.
+
+        If out is given it must be a C-contiguous (N, 3) float64 array and
+        the result is stored in it.
+        """
+
+        vecs = numpy.asarray(vecs, dtype=float)
+        return numpy.dot(vecs, self.as_rot_mat33(), out=out)
+
+    def as_rot_mat33(self):
+        """Return the 3x3 rotation part of as_matrix44() as a numpy array,
+        in the same column major order, so each row is the rotated x, y or
+        z axis.
+        """
+
+        return quat_array_to_mat44_array(
+            [self.x, self.y, self.z, self.w])[:3, :3]
+
     def to_euler_rad(self, dst_euler_vec3=None):
         """Returns euler angles
 
@@ -229,6 +452,25 @@ class Quat(object):
                                  ) * (180.0 / math.pi)
         return euler_vec3
 
+    @staticmethod
+    def from_euler_rad(euler_vec3, order="xyz"):
+        """Return a new Quat from x, y, z euler angles in radians.
+
+        With the default order this is the inverse of to_euler_rad().
+        """
+
+        quat = euler_rad_to_quat_array(
+            [euler_vec3[0], euler_vec3[1], euler_vec3[2]], order)
+        return Quat(*quat)
+
+    @staticmethod
+    def from_euler_deg(euler_vec3, order="xyz"):
+        """Return a new Quat from x, y, z euler angles in degrees."""
+
+        quat = euler_deg_to_quat_array(
+            [euler_vec3[0], euler_vec3[1], euler_vec3[2]], order)
+        return Quat(*quat)
+
     def get_y_rot_rads(self):
         return math.asin(-2.0 * (self.x * self.z - self.y * self.w))
 
@@ -269,6 +511,18 @@ class Quat(object):
 
         return quat
 
+    @staticmethod
+    def rot_from_vectors(start_vec, end_vec):
+        """Return a new Quat for the shortest arc rotation from one vector to
+        another.
+
+        The vectors don't need to be normalized.  If they point in opposite
+        directions, the result is a 180 degree rotation around an axis
+        perpendicular to start_vec.
+        """
+
+        return Quat(*rot_from_vectors_quat_array(start_vec, end_vec))
+
     def as_matrix44(self, matrix=None):
 
         if not matrix:
@@ -324,8 +578,6 @@ class Quat(object):
             self.w = n4 / 4.0
             return self
 
-        # TODO: unittests for code below when trace is small.
-
         # matrix trace <= 0
         if mat.data[0][0] > mat.data[1][1] and mat.data[0][0] > mat.data[2][2]:
             s = 2.0 * math.sqrt(1.0 + mat.data[0][0] - mat.data[1][1] -
@@ -333,7 +585,7 @@ class Quat(object):
             self.x = s / 4.0
             self.y = (mat.data[1][0] + mat.data[0][1]) / s
             self.z = (mat.data[2][0] + mat.data[0][2]) / s
-            self.w = (mat.data[2][1] - mat.data[1][2]) / s
+            self.w = (mat.data[1][2] - mat.data[2][1]) / s
             return self
         elif mat.data[1][1] > mat.data[2][2]:
             s = 2.0 * math.sqrt(1.0 - mat.data[0][0] + mat.data[1][1] -
@@ -349,7 +601,7 @@ class Quat(object):
             self.x = (mat.data[2][0] + mat.data[0][2]) / s
             self.y = (mat.data[2][1] + mat.data[1][2]) / s
             self.z = s / 4.0
-            self.w = (mat.data[1][0] - mat.data[0][1]) / s
+            self.w = (mat.data[0][1] - mat.data[1][0]) / s
             return self
 
     # @classmethod
@@ -0,0 +1,138 @@
+"""
+RayBatch
+Arrays of rays with origins and directions, and batched slab tests against
+axis aligned boxes.
+
+Boxes are half-open like Rect3.collidepoint(): a point is inside when
+min <= p < max on every axis.  A ray hits a box when it passes through an
+interval of positive length of such points, so rays that only graze the max
+faces miss, rays along the min faces hit and boxes with a zero size are
+never hit.
+"""
+
+import numpy
+
+from pedemath.bounds import rect3_array_min_max
+
+
+def slab_test_min_max(origins, directions, inv_dirs, t_max, mins, maxs,
+                      closed=False):
+    """Return (hit, t_entry) for rays against axis aligned boxes given by
+    their min and max corners.
+
+    origins, directions, inv_dirs (1 / directions), mins and maxs are
+    (..., 3) arrays and t_max a (...,) array, all broadcast together.  hit
+    is True where a ray enters a box before t_max, and t_entry is where,
+    clamped to 0 for rays starting inside, or inf for misses.
+
+    Boxes are half-open as described above.  If closed is True, boxes
+    include their max faces and rays touching a box at a single point hit
+    it, as needed for conservative BVH traversal.
+    """
+
+    with numpy.errstate(invalid="ignore"):
+        t0 = (mins - origins) * inv_dirs
+        t1 = (maxs - origins) * inv_dirs
+
+    # Rays parallel to a slab are inside it for all t or for none.
+    parallel = directions == 0.0
+    if closed:
+        inside = (origins >= mins) & (origins <= maxs)
+    else:
+        inside = (origins >= mins) & (origins < maxs)
+    t_low = numpy.where(parallel, numpy.where(inside, -numpy.inf, numpy.inf),
+                        numpy.minimum(t0, t1))
+    t_high = numpy.where(parallel, numpy.where(inside, numpy.inf, -numpy.inf),
+                         numpy.maximum(t0, t1))
+
+    t_entry = numpy.maximum(t_low.max(axis=-1), 0.0)
+    t_exit = numpy.minimum(t_high.min(axis=-1), t_max)
+    hit = t_entry <= t_exit if closed else t_entry < t_exit
+    return hit, numpy.where(hit, t_entry, numpy.inf)
+
+
+class RayBatch(object):
+
+    def __init__(self, origins, directions, t_max=None):
+        """Initialize from (N, 3) origins and directions.
+
+        Directions don't need to be normalized; distances are measured in
+        multiples of each direction.  t_max is an optional number or (N,)
+        array limiting how far each ray reaches.
+        """
+
+        self.origins = numpy.asarray(origins, dtype=float).reshape(-1, 3)
+        self.directions = numpy.asarray(directions,
+                                        dtype=float).reshape(-1, 3)
+        if t_max is None:
+            t_max = numpy.inf
+        self.t_max = numpy.broadcast_to(
+            numpy.asarray(t_max, dtype=float), (len(self.origins),))
+
+        with numpy.errstate(divide="ignore"):
+            self.inv_directions = 1.0 / self.directions
+
+    @staticmethod
+    def from_segments(starts, ends):
+        """Return a new RayBatch of segments, with t from 0 at starts to 1 at
+        ends.
+        """
+
+        starts = numpy.asarray(starts, dtype=float)
+        return RayBatch(starts, numpy.asarray(ends, dtype=float) - starts,
+                        1.0)
+
+    def __len__(self):
+        return len(self.origins)
+
+    def point_at(self, t):
+        """Return the (N, 3) points at distance t, a number or (N,) array,
+        along each ray.
+        """
+
+        t = numpy.asarray(t, dtype=float)
+        return self.origins + self.directions * t[..., None]
+
+    def intersect_min_max(self, mins, maxs):
+        """Test ray i against box i for (N, 3) min and max corners.
+
+        Return (hit, t_entry): an (N,) bool array and the (N,) distance
+        where each ray enters its box, 0 if it starts inside and inf if it
+        misses.
+        """
+
+        return slab_test_min_max(
+            self.origins, self.directions, self.inv_directions, self.t_max,
+            numpy.asarray(mins, dtype=float), numpy.asarray(maxs, dtype=float))
+
+    def intersect_min_max_all(self, mins, maxs, block_size=256):
+        """Test every ray against every box from (M, 3) min and max corners.
+
+        Return (hit, t_entry) as (N, M) arrays, see intersect_min_max().
+        Rays are processed block_size at a time to bound temporary memory.
+        """
+
+        mins = numpy.asarray(mins, dtype=float).reshape(-1, 3)
+        maxs = numpy.asarray(maxs, dtype=float).reshape(-1, 3)
+
+        hit = numpy.empty((len(self), len(mins)), dtype=bool)
+        t_entry = numpy.empty((len(self), len(mins)))
+        for start in range(0, len(self), block_size):
+            rays = slice(start, start + block_size)
+            hit[rays], t_entry[rays] = slab_test_min_max(
+                self.origins[rays, None], self.directions[rays, None],
+                self.inv_directions[rays, None], self.t_max[rays, None],
+                mins, maxs)
+
+        return hit, t_entry
+
+    def intersect_rect3_array(self, boxes):
+        """Same as intersect_min_max() for an (N, 6) Rect3 array."""
+
+        return self.intersect_min_max(*rect3_array_min_max(boxes))
+
+    def intersect_rect3_array_all(self, boxes, block_size=256):
+        """Same as intersect_min_max_all() for an (M, 6) Rect3 array."""
+
+        mins, maxs = rect3_array_min_max(boxes)
+        return self.intersect_min_max_all(mins, maxs, block_size)
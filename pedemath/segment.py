@@ -0,0 +1,341 @@
+"""
+Intersections of 2D line segments.
+
+Segments are given as (N, 2) arrays of start and end points, or lists of
+Vec2.  Segments intersect when they share at least one point, including
+touching at an endpoint; collinear overlapping segments intersect at the
+first point of their overlap along the first segment.
+
+The _all functions test every pair block_size segments at a time, and
+segment_intersections_2d_sweep() finds the same pairs with a Bentley-Ottmann
+sweep, which only tests segments that are neighbors along the sweep line.
+"""
+
+import heapq
+
+import numpy
+
+
+def _cross(vecs_a, vecs_b):
+    return vecs_a[..., 0] * vecs_b[..., 1] - vecs_a[..., 1] * vecs_b[..., 0]
+
+
+def _as_segments(starts, ends):
+    return (numpy.asarray(starts, dtype=float).reshape(-1, 2),
+            numpy.asarray(ends, dtype=float).reshape(-1, 2))
+
+
+def intersect_segments_2d_array(starts_a, ends_a, starts_b, ends_b,
+                                ignore_shared_endpoints=False):
+    """Return (hit, points) for broadcastable (..., 2) segments a and b.
+
+    hit is True where the segments intersect and points holds the (..., 2)
+    intersection points, nan where they don't.  If ignore_shared_endpoints
+    is True, segments that only touch at an endpoint they both have, like
+    consecutive segments of a polyline, don't count as intersecting.
+    """
+
+    starts_a = numpy.asarray(starts_a, dtype=float)
+    starts_b = numpy.asarray(starts_b, dtype=float)
+    dir_a = numpy.asarray(ends_a, dtype=float) - starts_a
+    dir_b = numpy.asarray(ends_b, dtype=float) - starts_b
+    offset = starts_b - starts_a
+
+    denom = _cross(dir_a, dir_b)
+    t_num = _cross(offset, dir_b)
+    u_num = _cross(offset, dir_a)
+
+    # Crossing lines.
+    crossing = denom != 0.0
+    safe_denom = numpy.where(crossing, denom, 1.0)
+    t = t_num / safe_denom
+    u = u_num / safe_denom
+    hit = crossing & (t >= 0.0) & (t <= 1.0) & (u >= 0.0) & (u <= 1.0)
+    points = starts_a + dir_a * t[..., None]
+
+    # Parallel segments on the same line overlap where their projections
+    # onto it do.  Zero length segments use the other segment's direction.
+    collinear = ~crossing & (t_num == 0.0) & (u_num == 0.0)
+    len_sq_a = (dir_a ** 2).sum(axis=-1)
+    line = numpy.where((len_sq_a > 0.0)[..., None], dir_a, dir_b)
+    line_len_sq = (line ** 2).sum(axis=-1)
+    both_points = line_len_sq == 0.0
+    line_len_sq = numpy.where(both_points, 1.0, line_len_sq)
+
+    proj_a0 = (starts_a * line).sum(axis=-1)
+    proj_a1 = proj_a0 + (dir_a * line).sum(axis=-1)
+    proj_b0 = (starts_b * line).sum(axis=-1)
+    proj_b1 = proj_b0 + (dir_b * line).sum(axis=-1)
+    low = numpy.maximum(numpy.minimum(proj_a0, proj_a1),
+                        numpy.minimum(proj_b0, proj_b1))
+    high = numpy.minimum(numpy.maximum(proj_a0, proj_a1),
+                         numpy.maximum(proj_b0, proj_b1))
+    # The first overlap point along a.
+    first = numpy.where(proj_a1 >= proj_a0, low, high)
+    overlap = collinear & numpy.where(both_points,
+                                      (offset == 0.0).all(axis=-1),
+                                      low <= high)
+    overlap_points = starts_a + line * (
+        (first - proj_a0) / line_len_sq)[..., None]
+
+    points = numpy.where(overlap[..., None], overlap_points, points)
+    hit = hit | overlap
+
+    if ignore_shared_endpoints:
+        ends_a = starts_a + dir_a
+        ends_b = starts_b + dir_b
+        shared = numpy.zeros(hit.shape, dtype=bool)
+        for point_a in (starts_a, ends_a):
+            for point_b in (starts_b, ends_b):
+                shared |= (point_a == point_b).all(axis=-1)
+        hit &= ~shared | (overlap & (low < high))
+
+    points = numpy.where(hit[..., None], points, numpy.nan)
+    return hit, points
+
+
+def segment_intersections_2d_all(starts, ends, other_starts=None,
+                                 other_ends=None, block_size=256,
+                                 ignore_shared_endpoints=False):
+    """Return (indices_a, indices_b, points) for every intersecting pair of
+    segments, testing all pairs block_size segments at a time.
+
+    Without other_starts and other_ends, pairs i < j of the same segments
+    are tested.  Otherwise every segment is tested against every other
+    segment, and indices_b refer to the other segments.  Pairs are sorted by
+    indices_a then indices_b, and points is the (K, 2) array of
+    intersection points.
+    """
+
+    starts, ends = _as_segments(starts, ends)
+    same = other_starts is None
+    if same:
+        other_starts, other_ends = starts, ends
+    else:
+        other_starts, other_ends = _as_segments(other_starts, other_ends)
+
+    mins, maxs = numpy.minimum(starts, ends), numpy.maximum(starts, ends)
+    other_mins = numpy.minimum(other_starts, other_ends)
+    other_maxs = numpy.maximum(other_starts, other_ends)
+
+    found = []
+    for start in range(0, len(starts), block_size):
+        rows = slice(start, start + block_size)
+        col_start = start if same else 0
+        # Only pairs with overlapping bounds get the full test.
+        near = ((mins[rows, None] <= other_maxs[col_start:]) &
+                (other_mins[col_start:] <= maxs[rows, None])).all(axis=-1)
+        if same:
+            near &= (numpy.arange(near.shape[0])[:, None] <
+                     numpy.arange(near.shape[1]))
+        block_a, block_b = numpy.nonzero(near)
+        block_a += start
+        block_b += col_start
+        hit, points = intersect_segments_2d_array(
+            starts[block_a], ends[block_a], other_starts[block_b],
+            other_ends[block_b], ignore_shared_endpoints)
+        found.append((block_a[hit], block_b[hit], points[hit]))
+
+    if not found:
+        return (numpy.empty(0, dtype=numpy.intp),
+                numpy.empty(0, dtype=numpy.intp), numpy.empty((0, 2)))
+    return tuple(numpy.concatenate(parts) for parts in zip(*found))
+
+
+class _Sweep(object):
+    """The state of a left to right sweep over segments.  status lists the
+    segments crossing the sweep line, bottom to top.
+    """
+
+    def __init__(self, starts, ends):
+        # Each segment goes from its lexicographically smaller point, so
+        # vertical segments go up.
+        swap = ((ends[:, 0] < starts[:, 0]) |
+                ((ends[:, 0] == starts[:, 0]) & (ends[:, 1] < starts[:, 1])))
+        lows = numpy.where(swap[:, None], ends, starts)
+        highs = numpy.where(swap[:, None], starts, ends)
+        self.x0, self.y0 = lows[:, 0].tolist(), lows[:, 1].tolist()
+        self.x1, self.y1 = highs[:, 0].tolist(), highs[:, 1].tolist()
+
+        scale = max(numpy.abs(lows).max(), numpy.abs(highs).max(), 1.0)
+        self.tolerance = 1e-9 * scale
+        self.status = []
+        self.events = [(x, y, 0, i)
+                       for i, (x, y) in enumerate(zip(self.x0, self.y0))]
+        self.events.extend((x, y, 1, i)
+                           for i, (x, y) in enumerate(zip(self.x1, self.y1)))
+        heapq.heapify(self.events)
+        self.scheduled = set()
+        self.pairs = set()
+
+    def y_at(self, seg, x, y):
+        """Return where seg crosses the sweep line at x.  Vertical segments
+        are at y, clamped to their ends.
+        """
+
+        x0, x1 = self.x0[seg], self.x1[seg]
+        if x1 == x0:
+            return min(max(y, self.y0[seg]), self.y1[seg])
+        return self.y0[seg] + (x - x0) * (self.y1[seg] - self.y0[seg]) / (
+            x1 - x0)
+
+    def slope(self, seg):
+        dx = self.x1[seg] - self.x0[seg]
+        if dx == 0.0:
+            return float("inf")
+        return (self.y1[seg] - self.y0[seg]) / dx
+
+    def lower_bound(self, x, y):
+        """Return the first status index with a segment at or above y."""
+
+        low, high = 0, len(self.status)
+        limit = y - self.tolerance
+        while low < high:
+            mid = (low + high) // 2
+            if self.y_at(self.status[mid], x, y) < limit:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def schedule(self, seg_a, seg_b, x, y):
+        """Queue the intersection of two neighbors if it is after (x, y)."""
+
+        pair = (seg_a, seg_b) if seg_a < seg_b else (seg_b, seg_a)
+        if pair in self.scheduled:
+            return
+
+        px, py = self.x0[seg_a], self.y0[seg_a]
+        rx, ry = self.x1[seg_a] - px, self.y1[seg_a] - py
+        qx, qy = self.x0[seg_b], self.y0[seg_b]
+        sx, sy = self.x1[seg_b] - qx, self.y1[seg_b] - qy
+        denom = rx * sy - ry * sx
+        if denom == 0.0:
+            # Collinear overlaps are found where one starts inside the other.
+            return
+
+        t = ((qx - px) * sy - (qy - py) * sx) / denom
+        u = ((qx - px) * ry - (qy - py) * rx) / denom
+        if t < 0.0 or t > 1.0 or u < 0.0 or u > 1.0:
+            return
+
+        self.scheduled.add(pair)
+        point = (px + t * rx, py + t * ry)
+        if point > (x, y):
+            heapq.heappush(self.events, point + (2, pair))
+        else:
+            self.pairs.add(pair)
+
+    def remove_through(self, x, y, named):
+        """Remove the segments that end at or cross (x, y) from the status
+        and return (index, through): where they were and the segments.
+        """
+
+        index = self.lower_bound(x, y)
+        stop = index
+        limit = y + self.tolerance
+        while (stop < len(self.status) and
+               self.y_at(self.status[stop], x, y) <= limit):
+            stop += 1
+
+        through = self.status[index:stop]
+        # Segments that rounding moved out of place are found the slow way.
+        stray = named.difference(through)
+        for seg in stray:
+            if seg in self.status:
+                position = self.status.index(seg)
+                del self.status[position]
+                if position < index:
+                    index -= 1
+                    stop -= 1
+        through.extend(seg for seg in stray if seg not in through)
+        del self.status[index:stop]
+        return index, through
+
+    def add_pairs(self, involved):
+        """Record every pair of segments meeting at one point."""
+
+        involved = sorted(involved)
+        for i, seg_a in enumerate(involved):
+            for seg_b in involved[i + 1:]:
+                self.pairs.add((seg_a, seg_b))
+
+    def insert_going_on(self, index, x, y, involved):
+        """Put the segments starting at or crossing (x, y) back in the
+        status at index, ordered just after it, and schedule the new
+        neighbors.
+        """
+
+        going_on = [seg for seg in involved
+                    if (self.x1[seg], self.y1[seg]) > (x, y)]
+        going_on.sort(key=self.slope)
+        self.status[index:index] = going_on
+
+        above = index + len(going_on)
+        if not going_on:
+            if index > 0 and above < len(self.status):
+                self.schedule(self.status[index - 1], self.status[index],
+                              x, y)
+            return
+        if index > 0:
+            self.schedule(self.status[index - 1], going_on[0], x, y)
+        if above < len(self.status):
+            self.schedule(going_on[-1], self.status[above], x, y)
+
+    def handle_point(self, x, y, starting, named):
+        """Process every event at (x, y): segments in starting begin there
+        and the segments in named end or cross there.
+        """
+
+        index, through = self.remove_through(x, y, named)
+        involved = set(through).union(starting)
+        self.add_pairs(involved)
+        self.insert_going_on(index, x, y, involved)
+
+    def run(self):
+        events = self.events
+        while events:
+            x, y = events[0][:2]
+            starting = []
+            named = set()
+            while events and events[0][0] == x and events[0][1] == y:
+                _, _, kind, item = heapq.heappop(events)
+                if kind == 0:
+                    starting.append(item)
+                elif kind == 1:
+                    named.add(item)
+                else:
+                    named.update(item)
+            self.handle_point(x, y, starting, named)
+
+        return self.pairs
+
+
+def segment_intersections_2d_sweep(starts, ends,
+                                   ignore_shared_endpoints=False):
+    """Return (indices_a, indices_b, points) for every intersecting pair
+    i < j of segments, like segment_intersections_2d_all().
+
+    Uses a Bentley-Ottmann sweep over the n segment ends and k
+    intersections, instead of testing all pairs.  The segments crossing
+    the sweep line are kept in a plain list searched with bisection rather
+    than a balanced tree, so each event takes O(log n) comparisons but
+    O(n) time to insert and remove segments, O((n + k) n) in all.  The
+    list moves are fast enough that this is much quicker than testing all
+    pairs for tens of thousands of segments.  The pairs the sweep finds
+    are confirmed with intersect_segments_2d_array(), so results match the
+    all pairs test.
+    """
+
+    starts, ends = _as_segments(starts, ends)
+    if not len(starts):
+        return (numpy.empty(0, dtype=numpy.intp),
+                numpy.empty(0, dtype=numpy.intp), numpy.empty((0, 2)))
+
+    pairs = _Sweep(starts, ends).run()
+    pairs = numpy.array(sorted(pairs), dtype=numpy.intp).reshape(-1, 2)
+    indices_a, indices_b = pairs[:, 0], pairs[:, 1]
+    hit, points = intersect_segments_2d_array(
+        starts[indices_a], ends[indices_a], starts[indices_b],
+        ends[indices_b], ignore_shared_endpoints)
+    return indices_a[hit], indices_b[hit], points[hit]
@@ -0,0 +1,105 @@
+"""
+Cascaded shadow map helpers.
+
+The camera frustum is split into slices along its view direction and an
+orthographic light projection is fitted to the Rect3 bounds of each slice's
+corners in light space.  All cascades are computed in one batched call.
+"""
+
+import numpy
+
+from pedemath.bounds import min_max_to_rect3_array
+from pedemath.matrix import ortho_mat44_array
+
+
+def cascade_split_distances(near, far, num_cascades, blend=0.5):
+    """Return the (num_cascades + 1,) view distances of the slice
+    boundaries, from near to far.
+
+    blend mixes logarithmic splits (1.0), which keep the shadow resolution
+    per slice even, with uniform splits (0.0).
+    """
+
+    fractions = numpy.arange(num_cascades + 1) / float(num_cascades)
+    log_splits = near * (far / float(near)) ** fractions
+    uniform_splits = near + (far - near) * fractions
+    splits = blend * log_splits + (1.0 - blend) * uniform_splits
+    splits[0], splits[-1] = near, far
+    return splits
+
+
+def frustum_slice_corners_array(view, fov_y_deg, aspect, distances):
+    """Return the (C, 8, 3) world space corners of the C frustum slices
+    between consecutive view distances of a perspective camera.
+
+    view is the camera's view Matrix44 or a (4, 4) array like Matrix44.data.
+    The first four corners of each slice are on its near side.
+    """
+
+    data = numpy.asarray(getattr(view, "data", view), dtype=float)
+    distances = numpy.asarray(distances, dtype=float)
+
+    half_height = distances * numpy.tan(numpy.radians(fov_y_deg) * 0.5)
+    half_width = half_height * aspect
+    signs = numpy.array([(-1, -1), (1, -1), (1, 1), (-1, 1)], dtype=float)
+
+    # (D, 4, 3) view space corners; the camera looks down -z.
+    corners = numpy.empty((len(distances), 4, 3))
+    corners[..., 0] = signs[:, 0] * half_width[:, None]
+    corners[..., 1] = signs[:, 1] * half_height[:, None]
+    corners[..., 2] = -distances[:, None]
+
+    # Inverting the column-major data gives the inverse in the same layout.
+    inv_view = numpy.linalg.inv(data)
+    corners = numpy.dot(corners, inv_view[:3, :3]) + inv_view[3, :3]
+    return numpy.concatenate((corners[:-1], corners[1:]), axis=1)
+
+
+def fit_ortho_to_corners_array(light_views, corners, z_padding=0.0):
+    """Return (projections, bounds) fitting an orthographic projection to
+    each set of corners as seen by a light.
+
+    light_views: one (4, 4) light view matrix or a (C, 4, 4) stack.
+    corners: (C, K, 3) world space points, e.g. from
+        frustum_slice_corners_array().
+    z_padding: extra distance towards the light so casters outside the
+        slice still cast shadows into it.
+
+    projections is a (C, 4, 4) stack of orthographic matrices and bounds is
+    the (C, 6) Rect3 array of the corners in light view space.
+    """
+
+    light_views = numpy.asarray(light_views, dtype=float)
+    corners = numpy.asarray(corners, dtype=float)
+    if light_views.ndim == 2:
+        light_views = light_views[None]
+
+    light_corners = (
+        numpy.einsum("cki,cij->ckj", corners, light_views[:, :3, :3]) +
+        light_views[:, None, 3, :3])
+    mins = light_corners.min(axis=1)
+    maxs = light_corners.max(axis=1)
+
+    # The light looks down -z, so near and far come from -max z and -min z.
+    projections = ortho_mat44_array(
+        mins[:, 0], maxs[:, 0], mins[:, 1], maxs[:, 1],
+        -maxs[:, 2] - z_padding, -mins[:, 2])
+    return projections, min_max_to_rect3_array(mins, maxs)
+
+
+def cascade_shadow_mat44_array(view, fov_y_deg, aspect, near, far,
+                               light_view, num_cascades, blend=0.5,
+                               z_padding=0.0):
+    """Return (projections, splits, bounds) for the cascades of one camera
+    and one light.
+
+    See cascade_split_distances(), frustum_slice_corners_array() and
+    fit_ortho_to_corners_array().
+    """
+
+    splits = cascade_split_distances(near, far, num_cascades, blend)
+    corners = frustum_slice_corners_array(view, fov_y_deg, aspect, splits)
+    light_data = getattr(light_view, "data", light_view)
+    projections, bounds = fit_ortho_to_corners_array(light_data, corners,
+                                                     z_padding)
+    return projections, splits, bounds
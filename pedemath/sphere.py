@@ -0,0 +1,267 @@
+"""
+Bounding spheres for point sets.
+
+ritter_sphere() is fast and approximate, usually within a few percent of
+the smallest sphere, and welzl_sphere() finds the smallest sphere in
+expected linear time.  Sphere arrays are an (N, 3) array of centers and an
+(N,) array of radii, as used by Frustum.cull_spheres().
+"""
+
+import numpy
+
+from pedemath.bounds import flatten_point_sets
+from pedemath.vec3 import Vec3
+
+# Points this far outside a sphere, relative to its radius, still count as
+# inside so rounding can't make the searches below loop forever.
+SPHERE_EPSILON = 1e-9
+
+
+def _as_points(points):
+    points = numpy.asarray(points, dtype=float).reshape(-1, 3)
+    if not len(points):
+        raise ValueError("Can't bound an empty point set")
+    return points
+
+
+def _grow_to_points(points, center, radius):
+    """Return (center, radius) grown until it holds every point, by
+    repeatedly moving the far side of the sphere out to the furthest point.
+    """
+
+    while True:
+        dist_sq = ((points - center) ** 2).sum(axis=1)
+        furthest = dist_sq.argmax()
+        dist = numpy.sqrt(dist_sq[furthest])
+        if dist <= radius * (1.0 + SPHERE_EPSILON):
+            return center, radius
+
+        new_radius = (radius + dist) * 0.5
+        center = center + (points[furthest] - center) * (
+            (new_radius - radius) / dist)
+        radius = new_radius
+
+
+def _ritter_sphere_array(points):
+    # Ritter's initial guess: the furthest point from the first point, and
+    # the furthest point from that one, as a diameter.
+    start = points[((points - points[0]) ** 2).sum(axis=1).argmax()]
+    end = points[((points - start) ** 2).sum(axis=1).argmax()]
+    return _grow_to_points(points, (start + end) * 0.5,
+                           numpy.linalg.norm(end - start) * 0.5)
+
+
+def ritter_sphere(points):
+    """Return (center, radius) of an approximate bounding sphere for an
+    (N, 3) array or a list of Vec3, with center a Vec3.
+
+    Ritter's method, except that instead of one pass growing the sphere
+    for each point outside it in turn, each pass grows it to the furthest
+    point outside, which needs only a few vectorized passes and gives a
+    tighter sphere.
+    """
+
+    center, radius = _ritter_sphere_array(_as_points(points))
+    return Vec3(*center), float(radius)
+
+
+def _sphere_from_support(support):
+    """Return (center, radius) of the smallest sphere with 1 to 4 points on
+    its surface.
+    """
+
+    origin = support[0]
+    if len(support) == 1:
+        return origin, 0.0
+    if len(support) == 2:
+        return (origin + support[1]) * 0.5, numpy.linalg.norm(
+            support[1] - origin) * 0.5
+
+    edges = numpy.array(support[1:]) - origin
+    if len(support) == 3:
+        normal = numpy.cross(edges[0], edges[1])
+        normal_sq = normal.dot(normal)
+        if normal_sq > 1e-24 * edges[0].dot(edges[0]) * edges[1].dot(
+                edges[1]):
+            offset = numpy.cross(
+                edges[0].dot(edges[0]) * edges[1] -
+                edges[1].dot(edges[1]) * edges[0], normal) / (
+                    2.0 * normal_sq)
+            return origin + offset, numpy.linalg.norm(offset)
+
+        # Collinear: the sphere around the two furthest apart points.
+        return max((_sphere_from_support([support[i], support[j]])
+                    for i, j in ((0, 1), (0, 2), (1, 2))),
+                   key=lambda sphere: sphere[1])
+
+    # 2 (c - origin) . edge = |edge|^2 for each edge.
+    det = numpy.linalg.det(edges)
+    scale = numpy.prod(numpy.linalg.norm(edges, axis=1))
+    if abs(det) > 1e-12 * scale:
+        offset = numpy.linalg.solve(2.0 * edges, (edges ** 2).sum(axis=1))
+        return origin + offset, numpy.linalg.norm(offset)
+
+    # Coplanar: the smallest sphere through three of the points holding
+    # the fourth.
+    points = numpy.array(support)
+    spheres = [_sphere_from_support([support[i] for i in triple])
+               for triple in ((0, 1, 2), (0, 1, 3), (0, 2, 3), (1, 2, 3))]
+    holding = [sphere for sphere in spheres
+               if _first_outside(points, 0, *sphere) < 0]
+    if not holding:
+        return max(spheres, key=lambda sphere: sphere[1])
+    return min(holding, key=lambda sphere: sphere[1])
+
+
+def _first_outside(points, start, center, radius):
+    """Return the index of the first point from start outside a sphere, or
+    -1.  Checks chunks of growing size since the first point outside is
+    often close to start.
+    """
+
+    limit_sq = (radius * (1.0 + SPHERE_EPSILON)) ** 2
+    chunk = 256
+    while start < len(points):
+        stop = start + chunk
+        dist_sq = ((points[start:stop] - center) ** 2).sum(axis=1)
+        outside = numpy.flatnonzero(dist_sq > limit_sq)
+        if len(outside):
+            return start + outside[0]
+        start = stop
+        chunk *= 4
+
+    return -1
+
+
+def _welzl(points, support):
+    """Return the smallest sphere holding points with every support point
+    on its surface.
+    """
+
+    if support:
+        center, radius = _sphere_from_support(support)
+        if len(support) == 4:
+            return center, radius
+        start = 0
+    else:
+        center, radius = points[0], 0.0
+        start = 1
+
+    while True:
+        outside = _first_outside(points, start, center, radius)
+        if outside < 0:
+            return center, radius
+
+        center, radius = _welzl(points[:outside],
+                                support + [points[outside]])
+        start = outside + 1
+
+
+def welzl_sphere(points, seed=None):
+    """Return (center, radius) of the smallest bounding sphere for an
+    (N, 3) array or a list of Vec3, with center a Vec3.
+
+    Welzl's algorithm over a random order of the points, with the
+    recursion over points replaced by vectorized searches for the next
+    point outside the current sphere.  seed makes the order repeatable.
+    """
+
+    points = _as_points(points)
+    points = points[numpy.random.RandomState(seed).permutation(len(points))]
+    center, radius = _welzl(points, [])
+    return Vec3(*center), float(radius)
+
+
+def _first_max_per_set(values, starts, sets):
+    """Return (indices, maxs) of the first largest value in each set."""
+
+    maxs = numpy.maximum.reduceat(values, starts)
+    candidates = numpy.flatnonzero(values == maxs[sets])
+    _, first = numpy.unique(sets[candidates], return_index=True)
+    return candidates[first], maxs
+
+
+def ritter_sphere_array_from_point_sets(point_sets):
+    """Return (centers, radii) of approximate bounding spheres for many
+    point sets, see ritter_sphere().
+
+    point_sets is a (B, N, 3) array or a list of (Ni, 3) arrays (or lists
+    of Vec3) that may differ in size; every set must have a point.  All
+    sets are processed together, so many small sets are fast.
+    """
+
+    points, counts, starts, sets = flatten_point_sets(point_sets)
+    if not len(counts):
+        return numpy.empty((0, 3)), numpy.empty(0)
+
+    first = points[starts]
+    start, _ = _first_max_per_set(((points - first[sets]) ** 2).sum(axis=1),
+                                  starts, sets)
+    end, _ = _first_max_per_set(
+        ((points - points[start][sets]) ** 2).sum(axis=1), starts, sets)
+    centers = (points[start] + points[end]) * 0.5
+    radii = numpy.linalg.norm(points[end] - points[start], axis=1) * 0.5
+
+    while True:
+        furthest, dist_sq = _first_max_per_set(
+            ((points - centers[sets]) ** 2).sum(axis=1), starts, sets)
+        dist = numpy.sqrt(dist_sq)
+        grow = numpy.flatnonzero(dist > radii * (1.0 + SPHERE_EPSILON))
+        if not len(grow):
+            return centers, radii
+
+        new_radii = (radii[grow] + dist[grow]) * 0.5
+        centers[grow] += (points[furthest[grow]] - centers[grow]) * (
+            (new_radii - radii[grow]) / dist[grow])[:, None]
+        radii[grow] = new_radii
+
+
+def merge_spheres_array(centers_a, radii_a, centers_b, radii_b):
+    """Return (centers, radii) of the smallest spheres holding both
+    sphere a and sphere b, for broadcastable sphere arrays.
+    """
+
+    centers_a = numpy.asarray(centers_a, dtype=float)
+    centers_b = numpy.asarray(centers_b, dtype=float)
+    radii_a = numpy.asarray(radii_a, dtype=float)
+    radii_b = numpy.asarray(radii_b, dtype=float)
+
+    offsets = centers_b - centers_a
+    dist = numpy.linalg.norm(offsets, axis=-1)
+    radii = (dist + radii_a + radii_b) * 0.5
+    move = (radii - radii_a) / numpy.where(dist > 0.0, dist, 1.0)
+    centers = centers_a + offsets * move[..., None]
+
+    a_holds_b = dist + radii_b <= radii_a
+    b_holds_a = ~a_holds_b & (dist + radii_a <= radii_b)
+    centers = numpy.where(a_holds_b[..., None], centers_a, centers)
+    centers = numpy.where(b_holds_a[..., None], centers_b, centers)
+    radii = numpy.where(a_holds_b, radii_a, numpy.where(b_holds_a, radii_b,
+                                                        radii))
+    return centers, radii
+
+
+def sphere_around_spheres(centers, radii):
+    """Return (center, radius) of a sphere holding every sphere in a sphere
+    array, for example to bound the children of a hierarchy node.
+
+    Starts from the largest sphere and merges in the sphere reaching
+    furthest outside until none do, like ritter_sphere().
+    """
+
+    centers = numpy.asarray(centers, dtype=float).reshape(-1, 3)
+    radii = numpy.asarray(radii, dtype=float).reshape(-1)
+    if not len(radii):
+        raise ValueError("Can't bound an empty sphere array")
+
+    largest = radii.argmax()
+    center, radius = centers[largest], radii[largest]
+    while True:
+        reach = numpy.linalg.norm(centers - center, axis=1) + radii
+        furthest = reach.argmax()
+        if reach[furthest] <= radius * (1.0 + SPHERE_EPSILON):
+            return Vec3(*center), float(radius)
+
+        center, radius = merge_spheres_array(center, radius,
+                                             centers[furthest],
+                                             radii[furthest])
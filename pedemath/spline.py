@@ -0,0 +1,352 @@
+"""
+Splines
+Piecewise cubic curves through 2D or 3D points, evaluated at arrays of
+parameters.
+
+A spline with S segments is parameterized from 0 to S, segment i covering
+i to i + 1.  Both spline types are stored as cubic Bezier segments and
+evaluated from their polynomial coefficients.  Splines don't change after
+they are created, so the arc length tables used to move along them at
+constant speed are built once and cached on the spline.
+"""
+
+import numpy
+
+from pedemath.closest import point_segment_distance_array
+from pedemath.vec2 import Vec2
+from pedemath.vec3 import Vec3
+
+# Bezier control points to polynomial coefficients, a + b t + c t^2 + d t^3.
+_BEZIER_TO_POWER = numpy.array([[1, 0, 0, 0],
+                                [-3, 3, 0, 0],
+                                [3, -6, 3, 0],
+                                [-1, 3, -3, 1]], dtype=float)
+
+# Gauss-Legendre nodes on [0, 1] and their weights, for arc lengths.
+_GAUSS_NODES, _GAUSS_WEIGHTS = numpy.polynomial.legendre.leggauss(5)
+_GAUSS_NODES = (_GAUSS_NODES + 1.0) * 0.5
+_GAUSS_WEIGHTS = _GAUSS_WEIGHTS * 0.5
+
+
+def _split_bezier(controls):
+    """Return (left, right) halves of (N, 4, D) Bezier segments, split at
+    t = 0.5 with de Casteljau's algorithm.
+    """
+
+    p0, p1, p2, p3 = (controls[:, i] for i in range(4))
+    p01, p12, p23 = (p0 + p1) * 0.5, (p1 + p2) * 0.5, (p2 + p3) * 0.5
+    p012, p123 = (p01 + p12) * 0.5, (p12 + p23) * 0.5
+    middle = (p012 + p123) * 0.5
+    return (numpy.stack([p0, p01, p012, middle], axis=1),
+            numpy.stack([middle, p123, p23, p3], axis=1))
+
+
+class BezierSpline(object):
+
+    def __init__(self, points):
+        """Initialize from a chain of 3 S + 1 points, as an array or a list
+        of Vec3 or Vec2: each segment's start, its two control points, and
+        the next segment's start, ending with the last segment's end.
+        """
+
+        points = numpy.asarray(points, dtype=float)
+        if points.ndim != 2 or len(points) < 4 or (len(points) - 1) % 3:
+            raise ValueError(
+                "A Bezier spline needs 3 S + 1 points, not shape %r" % (
+                    points.shape,))
+
+        starts = numpy.arange(0, len(points) - 1, 3)
+        self._set_controls(points[starts[:, None] + numpy.arange(4)])
+
+    def _set_controls(self, controls):
+        # controls is (S, 4, D), and coeffs the matching (S, 4, D)
+        # polynomial coefficients.
+        self.controls = controls
+        self.coeffs = numpy.einsum("ij,sjd->sid", _BEZIER_TO_POWER, controls)
+        self._tables = {}
+
+    def __len__(self):
+        """Return the number of segments."""
+        return len(self.controls)
+
+    def __repr__(self):
+        return "%s(%d segments)" % (type(self).__name__, len(self))
+
+    def _segments(self, params):
+        """Return (segments, t) for an array of spline parameters."""
+
+        params = numpy.asarray(params, dtype=float)
+        segments = numpy.clip(numpy.floor(params).astype(numpy.intp), 0,
+                              len(self) - 1)
+        return segments, params - segments
+
+    def positions(self, params):
+        """Return the (..., D) points at an array of parameters from 0 to
+        the number of segments.
+        """
+
+        segments, t = self._segments(params)
+        coeffs = self.coeffs[segments]
+        t = t[..., None]
+        return ((coeffs[..., 3, :] * t + coeffs[..., 2, :]) * t +
+                coeffs[..., 1, :]) * t + coeffs[..., 0, :]
+
+    def _segment_tangents(self, segments, t):
+        coeffs = self.coeffs[segments]
+        t = t[..., None]
+        return (coeffs[..., 3, :] * (3.0 * t) + coeffs[..., 2, :] * 2.0) * (
+            t) + coeffs[..., 1, :]
+
+    def tangents(self, params):
+        """Return the (..., D) derivatives of position with respect to the
+        parameter at an array of parameters.
+        """
+
+        return self._segment_tangents(*self._segments(params))
+
+    def position(self, param):
+        """Return the point at one parameter as a Vec3 or Vec2."""
+
+        point = self.positions(float(param))
+        return Vec3(*point) if len(point) == 3 else Vec2(*point)
+
+    def flatten(self, tolerance, max_depth=16):
+        """Return (points, params) for a polyline within about tolerance of
+        the spline, and the parameter of each of its points.
+
+        Segments are halved until their control points are within
+        tolerance of the line between their ends, so straight parts use
+        few points and tight bends many.  Every piece at the same depth is
+        tested and split at once.
+        """
+
+        controls = self.controls
+        starts = numpy.arange(len(self), dtype=float)
+        width = 1.0
+        flat_controls = []
+        flat_starts = []
+
+        for depth in range(max_depth + 1):
+            deviation = point_segment_distance_array(
+                controls[:, 1:3], controls[:, :1], controls[:, 3:]).max(
+                    axis=1)
+            flat = deviation <= tolerance
+            if depth == max_depth:
+                flat[:] = True
+            flat_controls.append(controls[flat, 0])
+            flat_starts.append(starts[flat])
+
+            controls = controls[~flat]
+            if not len(controls):
+                break
+            width *= 0.5
+            left, right = _split_bezier(controls)
+            controls = numpy.concatenate([left, right])
+            starts = numpy.concatenate([starts[~flat],
+                                        starts[~flat] + width])
+
+        starts = numpy.concatenate(flat_starts)
+        order = numpy.argsort(starts)
+        points = numpy.concatenate(flat_controls)[order]
+        return (numpy.concatenate([points, self.controls[-1:, 3]]),
+                numpy.append(starts[order], float(len(self))))
+
+    def arc_length_table(self, samples_per_segment=32):
+        """Return the ArcLengthTable for this spline, building it the first
+        time and returning the same table after that.
+        """
+
+        table = self._tables.get(samples_per_segment)
+        if table is None:
+            table = ArcLengthTable.from_spline(self, samples_per_segment)
+            self._tables[samples_per_segment] = table
+        return table
+
+    def length(self):
+        """Return the arc length of the whole spline."""
+
+        return self.arc_length_table().total_length
+
+    def positions_at_distances(self, distances, samples_per_segment=32):
+        """Return the (..., D) points at an array of distances along the
+        spline.
+        """
+
+        table = self.arc_length_table(samples_per_segment)
+        return self.positions(table.params_at(distances))
+
+
+class CatmullRomSpline(BezierSpline):
+
+    def __init__(self, points, alpha=0.5, closed=False):
+        """Initialize a curve passing through every point of an array or a
+        list of Vec3 or Vec2, with at least two points.
+
+        alpha 0 gives the uniform Catmull-Rom spline, 0.5 the centripetal
+        one, which never forms cusps or loops within a segment, and 1 the
+        chordal one.  Their tangents keep their direction but change
+        length at each point, since segments between far apart points are
+        traversed faster.  A closed spline joins the last point back to the
+        first; otherwise the ends are extended by reflecting their
+        neighbors.  Parameter i is at point i.
+        """
+
+        points = numpy.asarray(points, dtype=float)
+        if points.ndim != 2 or len(points) < 2:
+            raise ValueError(
+                "A Catmull-Rom spline needs at least 2 points, not shape "
+                "%r" % (points.shape,))
+
+        if closed:
+            ring = numpy.concatenate([points[-1:], points, points[:2]])
+        else:
+            ring = numpy.concatenate([2.0 * points[:1] - points[1:2], points,
+                                      2.0 * points[-1:] - points[-2:-1]])
+
+        # Each segment runs from p1 to p2 with neighbors p0 and p3, and
+        # knot intervals d0, d1 and d2 from the distances between them.
+        p0, p1, p2, p3 = ring[:-3], ring[1:-2], ring[2:-1], ring[3:]
+        gaps = numpy.linalg.norm(numpy.diff(ring, axis=0), axis=1) ** alpha
+        gaps = numpy.where(gaps > 1e-12, gaps, 1.0)[:, None]
+        d0, d1, d2 = gaps[:-2], gaps[1:-1], gaps[2:]
+
+        # Barry and Goldman's tangents at p1 and p2, scaled to the
+        # segment's parameter range.
+        tangent_1 = ((p1 - p0) / d0 - (p2 - p0) / (d0 + d1) +
+                     (p2 - p1) / d1) * d1
+        tangent_2 = ((p2 - p1) / d1 - (p3 - p1) / (d1 + d2) +
+                     (p3 - p2) / d2) * d1
+
+        self.alpha = alpha
+        self.closed = closed
+        self._set_controls(numpy.stack(
+            [p1, p1 + tangent_1 / 3.0, p2 - tangent_2 / 3.0, p2], axis=1))
+
+
+def _arc_lengths(spline, segments, starts, widths):
+    """Return the arc lengths of spline segments from each start t within
+    them over each width, by Gauss-Legendre quadrature.
+    """
+
+    nodes = starts[..., None] + _GAUSS_NODES * widths[..., None]
+    speeds = numpy.linalg.norm(spline._segment_tangents(
+        segments[..., None], nodes), axis=-1)
+    return speeds.dot(_GAUSS_WEIGHTS) * widths
+
+
+class ArcLengthTable(object):
+
+    def __init__(self, segment_lengths, even_params, even_rates):
+        """Initialize from the (S,) arc length of each segment of a curve,
+        an (S, M + 1) array holding, for each segment, the parameters at
+        M + 1 evenly spaced distances from its start to its end, and the
+        matching (S, M + 1) rates of change of parameter with distance.
+
+        A lookup finds the segment with a binary search and then
+        interpolates between the two entries around the distance with a
+        cubic Hermite curve.  The table is per segment because the speed
+        along Catmull-Rom splines can jump where segments meet.  Tables
+        only hold arrays, so they can be pickled or saved and reused.
+        """
+
+        self.segment_lengths = numpy.asarray(segment_lengths, dtype=float)
+        self.even_params = numpy.asarray(even_params, dtype=float)
+        self.even_rates = numpy.asarray(even_rates, dtype=float)
+        self.segment_starts = numpy.cumsum(self.segment_lengths) - (
+            self.segment_lengths)
+        self.total_length = float(self.segment_lengths.sum())
+
+    @staticmethod
+    def from_spline(spline, samples_per_segment=32, newton_steps=3):
+        """Return a new table for a spline with samples_per_segment steps
+        per segment.
+
+        Lengths come from Gauss-Legendre quadrature, and parameters are
+        refined with newton_steps Newton steps on the arc length, so they
+        stay accurate where the speed along the spline changes quickly.
+        """
+
+        # Everything is (S, M + 1), one row per segment, with t from 0 to 1
+        # within the segment so each row's end stays in its segment.
+        count = samples_per_segment
+        rows = numpy.arange(len(spline))[:, None]
+        steps = numpy.linspace(0.0, 1.0, count + 1)
+        lengths = numpy.zeros((len(spline), count + 1))
+        numpy.cumsum(_arc_lengths(spline, rows, steps[:-1],
+                                  numpy.full(count, 1.0 / count)),
+                     axis=1, out=lengths[:, 1:])
+        segment_lengths = lengths[:, -1]
+
+        # Each target distance starts in the sample interval holding it and
+        # is refined within it.
+        targets = steps * segment_lengths[:, None]
+        samples = numpy.array([
+            numpy.searchsorted(row, row_targets, side="right") - 1
+            for row, row_targets in zip(lengths, targets)])
+        samples = numpy.clip(samples, 0, count - 1)
+        low, high = steps[samples], steps[samples + 1]
+        low_lengths = lengths[rows, samples]
+        widths = lengths[rows, samples + 1] - low_lengths
+        t = low + (high - low) * (targets - low_lengths) / (
+            numpy.where(widths > 0.0, widths, 1.0))
+
+        for _ in range(newton_steps):
+            error = low_lengths + _arc_lengths(spline, rows, low,
+                                               t - low) - targets
+            speeds = numpy.linalg.norm(spline._segment_tangents(rows, t),
+                                       axis=-1)
+            t = numpy.clip(t - error / numpy.maximum(speeds, 1e-300), low,
+                           high)
+
+        # Rates are 1 / speed, limited to 3 times the slope between
+        # neighboring entries so the interpolation never turns back, even
+        # where the speed drops to 0.
+        speeds = numpy.linalg.norm(spline._segment_tangents(rows, t),
+                                   axis=-1)
+        spacing = numpy.where(segment_lengths > 0.0, segment_lengths / count,
+                              1.0)
+        secants = numpy.diff(t, axis=1) / spacing[:, None]
+        limits = numpy.minimum(numpy.pad(secants, ((0, 0), (1, 0)),
+                                         mode="edge"),
+                               numpy.pad(secants, ((0, 0), (0, 1)),
+                                         mode="edge")) * 3.0
+        even_rates = numpy.minimum(1.0 / numpy.maximum(speeds, 1e-300),
+                                   limits)
+        even_params = rows + t
+
+        return ArcLengthTable(segment_lengths, even_params, even_rates)
+
+    def params_at(self, distances):
+        """Return the parameters at an array of distances along the curve,
+        clamped to its ends.
+        """
+
+        distances = numpy.asarray(distances, dtype=float)
+        segments = numpy.clip(numpy.searchsorted(
+            self.segment_starts, distances, side="right") - 1, 0,
+            len(self.segment_lengths) - 1)
+        steps = self.even_params.shape[1] - 1
+        spacing = self.segment_lengths[segments] / steps
+        scaled = numpy.clip(
+            (distances - self.segment_starts[segments]) / numpy.where(
+                spacing > 0.0, spacing, 1.0), 0.0, steps)
+        index = numpy.minimum(scaled.astype(numpy.intp), steps - 1)
+        t = scaled - index
+
+        t_sq = t * t
+        t_cu = t_sq * t
+        return ((2.0 * t_cu - 3.0 * t_sq + 1.0) *
+                self.even_params[segments, index] +
+                (t_cu - 2.0 * t_sq + t) * spacing *
+                self.even_rates[segments, index] +
+                (3.0 * t_sq - 2.0 * t_cu) *
+                self.even_params[segments, index + 1] +
+                (t_cu - t_sq) * spacing *
+                self.even_rates[segments, index + 1])
+
+    def even_params_for(self, count):
+        """Return the parameters of count points evenly spaced along the
+        curve, including both ends.
+        """
+
+        return self.params_at(numpy.linspace(0.0, self.total_length, count))
@@ -0,0 +1,152 @@
+"""
+PointStats
+Streaming mean, covariance and bounds of 3D or 2D points.
+
+Points can be added one at a time, from any iterable of Vec3, Vec2 or
+tuples, or as (N, D) array chunks, and accumulators built separately (for
+example by parallel workers) can be merged.  Chunks are reduced on their
+own and then combined with the running totals using the pairwise update
+of Chan, Golub and LeVeque, which avoids the cancellation of summing
+squares.
+"""
+
+import itertools
+
+import numpy
+
+from pedemath.rect import Rect
+from pedemath.rect3 import Rect3
+from pedemath.vec2 import Vec2
+from pedemath.vec3 import Vec3
+
+
+class PointStats(object):
+
+    def __init__(self, dims=3):
+        """Initialize an empty accumulator for points with dims (2 or 3)
+        coordinates.
+        """
+
+        if dims not in (2, 3):
+            raise ValueError("dims must be 2 or 3, not %r" % (dims,))
+
+        self.dims = dims
+        self.count = 0
+        self.mean = numpy.zeros(dims)
+        # Sum of the outer products of each point's offset from the mean.
+        self.m2 = numpy.zeros((dims, dims))
+        self.mins = numpy.full(dims, numpy.inf)
+        self.maxs = numpy.full(dims, -numpy.inf)
+
+    @staticmethod
+    def from_array(points):
+        """Return a new PointStats for an (N, 2) or (N, 3) array."""
+
+        points = numpy.asarray(points, dtype=float)
+        stats = PointStats(points.shape[-1])
+        stats.add_array(points)
+        return stats
+
+    @staticmethod
+    def from_iter(points, dims=3, chunk_size=4096):
+        """Return a new PointStats for an iterable of points, see
+        add_iter().
+        """
+
+        stats = PointStats(dims)
+        stats.add_iter(points, chunk_size)
+        return stats
+
+    def __len__(self):
+        return self.count
+
+    def _combine(self, count, mean, m2, mins, maxs):
+        if not count:
+            return
+
+        total = self.count + count
+        delta = mean - self.mean
+        self.m2 += m2 + numpy.outer(delta, delta) * (
+            self.count * float(count) / total)
+        self.mean += delta * (float(count) / total)
+        self.count = total
+        numpy.minimum(self.mins, mins, out=self.mins)
+        numpy.maximum(self.maxs, maxs, out=self.maxs)
+
+    def add(self, point):
+        """Add a single Vec3, Vec2 or coordinate tuple."""
+
+        self.add_array([[point[i] for i in range(self.dims)]])
+
+    def add_array(self, points):
+        """Add an (N, D) array chunk of points."""
+
+        points = numpy.asarray(points, dtype=float).reshape(-1, self.dims)
+        if not len(points):
+            return
+
+        mean = points.mean(axis=0)
+        offsets = points - mean
+        self._combine(len(points), mean, numpy.dot(offsets.T, offsets),
+                      points.min(axis=0), points.max(axis=0))
+
+    def add_iter(self, points, chunk_size=4096):
+        """Add every point from an iterable of Vec3, Vec2 or coordinate
+        tuples, chunk_size points at a time, so the iterable can be a
+        stream larger than memory.
+        """
+
+        points = iter(points)
+        dims = range(self.dims)
+        while True:
+            chunk = [[point[i] for i in dims]
+                     for point in itertools.islice(points, chunk_size)]
+            if not chunk:
+                return
+            self.add_array(chunk)
+
+    def merge(self, other):
+        """Add all points accumulated by another PointStats and return
+        self.
+        """
+
+        if other.dims != self.dims:
+            raise ValueError("Can't merge %dD and %dD stats" % (
+                other.dims, self.dims))
+
+        self._combine(other.count, other.mean, other.m2, other.mins,
+                      other.maxs)
+        return self
+
+    def covariance(self, ddof=0):
+        """Return the (D, D) covariance matrix, divided by count - ddof.
+        Use ddof=1 for the unbiased sample covariance.
+        """
+
+        if self.count <= ddof:
+            raise ValueError("Not enough points for the covariance")
+
+        return self.m2 / (self.count - ddof)
+
+    def mean_vec(self):
+        """Return the mean as a Vec3 or Vec2."""
+
+        if not self.count:
+            raise ValueError("No points added")
+
+        return Vec3(*self.mean) if self.dims == 3 else Vec2(*self.mean)
+
+    def bounds(self):
+        """Return a Rect3 (or Rect for 2D) spanning the min and max of every
+        point added.
+        """
+
+        if not self.count:
+            raise ValueError("No points added")
+
+        size = self.maxs - self.mins
+        if self.dims == 3:
+            return Rect3(*[float(value) for value in
+                           tuple(self.mins) + tuple(size)])
+        return Rect(*[float(value) for value in
+                      tuple(self.mins) + tuple(size)])
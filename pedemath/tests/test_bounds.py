@@ -0,0 +1,138 @@
+
+import unittest
+
+import numpy
+
+from pedemath.bounds import flatten_point_sets
+from pedemath.bounds import min_max_to_rect3_array
+from pedemath.bounds import rect3_array_min_max
+from pedemath.bounds import rect3_array_to_list
+from pedemath.bounds import rect3_list_to_array
+from pedemath.bounds import transform_min_max_array
+from pedemath.bounds import transform_rect3
+from pedemath.bounds import transform_rect3_array
+from pedemath.matrix import euler_deg_to_mat44_array
+from pedemath.matrix import Matrix44
+from pedemath.rect3 import Rect3
+from pedemath.vec3 import Vec3
+
+
+class Rect3ArrayTestCase(unittest.TestCase):
+    """Test conversions between Rect3 and Rect3 arrays."""
+
+    def test_round_trip(self):
+        """Ensure a list of Rect3 converts to an array and back."""
+
+        rects = [Rect3(1, 2, 3, 4, 5, 6), Rect3(-1, 0, 0, 0.5, 1, 1)]
+        boxes = rect3_list_to_array(rects)
+
+        self.assertEqual((2, 6), boxes.shape)
+        self.assertEqual(rects, rect3_array_to_list(boxes))
+
+    def test_min_max(self):
+        """Ensure corners are computed from position and size."""
+
+        mins, maxs = rect3_array_min_max([[1, 2, 3, 4, 5, 6]])
+
+        numpy.testing.assert_array_equal([[1, 2, 3]], mins)
+        numpy.testing.assert_array_equal([[5, 7, 9]], maxs)
+        numpy.testing.assert_array_equal(
+            [[1, 2, 3, 4, 5, 6]], min_max_to_rect3_array(mins, maxs))
+
+
+def _corner_bounds(mat, rect):
+    """Return (min, max) of the eight transformed corners of a Rect3."""
+
+    corners = [mat * Vec3(rect.x + dx * rect.width, rect.y + dy * rect.height,
+                          rect.z + dz * rect.depth)
+               for dx in (0, 1) for dy in (0, 1) for dz in (0, 1)]
+    corners = numpy.array([(c.x, c.y, c.z) for c in corners])
+    return corners.min(axis=0), corners.max(axis=0)
+
+
+class TransformRect3TestCase(unittest.TestCase):
+    """Test transforming boxes with Arvo's method."""
+
+    def setUp(self):
+        self.mat = Matrix44.from_euler_deg(Vec3(30, -45, 70))
+        self.mat.data[3, :3] = [1, -2, 3]
+        self.mat.data[:3, 0] *= 2.0
+
+    def test_single(self):
+        """Ensure a Rect3 is bounded like its transformed corners."""
+
+        rect = Rect3(1, 2, 3, 4, 0.5, 2)
+        result = transform_rect3(self.mat, rect)
+        low, high = _corner_bounds(self.mat, rect)
+
+        self.assertIsInstance(result, Rect3)
+        numpy.testing.assert_allclose(low, [result.x, result.y, result.z],
+                                      atol=1e-5)
+        numpy.testing.assert_allclose(
+            high - low, [result.width, result.height, result.depth],
+            atol=1e-5)
+
+    def test_identity(self):
+        """Ensure the identity leaves boxes unchanged."""
+
+        boxes = [[1, 2, 3, 4, 5, 6], [-1, 0, 0, 0, 1, 2]]
+        numpy.testing.assert_allclose(
+            boxes, transform_rect3_array(numpy.identity(4), boxes))
+
+    def test_one_matrix_per_box(self):
+        """Ensure stacked matrices are applied to their own box."""
+
+        rng = numpy.random.RandomState(5)
+        mats = euler_deg_to_mat44_array(rng.uniform(-180, 180, (10, 3)))
+        mats[:, 3, :3] = rng.uniform(-5, 5, (10, 3))
+        boxes = numpy.concatenate((rng.uniform(-5, 5, (10, 3)),
+                                   rng.uniform(0, 3, (10, 3))), axis=1)
+
+        mins, maxs = transform_min_max_array(mats, *rect3_array_min_max(
+            boxes))
+        for mat_data, rect, low, high in zip(
+                mats, rect3_array_to_list(boxes), mins, maxs):
+            mat = Matrix44()
+            mat.data[:] = mat_data
+            expected_low, expected_high = _corner_bounds(mat, rect)
+            # Matrix44 stores float32.
+            numpy.testing.assert_allclose(expected_low, low, atol=1e-5)
+            numpy.testing.assert_allclose(expected_high, high, atol=1e-5)
+
+    def test_one_box_many_matrices(self):
+        """Ensure a single box broadcasts against a stack of matrices."""
+
+        mats = euler_deg_to_mat44_array([[0, 0, 0], [0, 0, 90]])
+        result = transform_rect3_array(mats, [0, 0, 0, 2, 1, 1])
+
+        numpy.testing.assert_allclose(
+            [[0, 0, 0, 2, 1, 1], [-1, 0, 0, 1, 2, 1]], result, atol=1e-12)
+
+
+class FlattenPointSetsTestCase(unittest.TestCase):
+    """Test flatten_point_sets()."""
+
+    def test_ragged(self):
+        """Ensure sets of Vec3 and arrays are joined with their sizes, first
+        indices and set of each point.
+        """
+
+        points, counts, starts, sets = flatten_point_sets(
+            [[Vec3(1, 2, 3)], numpy.zeros((2, 3)), [[4, 5, 6]]])
+
+        self.assertEqual((4, 3), points.shape)
+        numpy.testing.assert_array_equal([1, 2, 1], counts)
+        numpy.testing.assert_array_equal([0, 1, 3], starts)
+        numpy.testing.assert_array_equal([0, 1, 1, 2], sets)
+
+    def test_stacked(self):
+        """Ensure a (B, N, 3) array gives B sets of N points, and empty sets
+        raise ValueError.
+        """
+
+        _, counts, _, sets = flatten_point_sets(numpy.zeros((3, 2, 3)))
+        numpy.testing.assert_array_equal([2, 2, 2], counts)
+        numpy.testing.assert_array_equal([0, 0, 1, 1, 2, 2], sets)
+
+        self.assertRaises(ValueError, flatten_point_sets,
+                          [[[0, 0, 0]], []])
@@ -0,0 +1,65 @@
+
+import unittest
+
+import numpy
+
+from pedemath.bvh import BoxBVH
+from pedemath.bvh import ranges_to_indices
+
+
+class RangesToIndicesTestCase(unittest.TestCase):
+    """Test ranges_to_indices()."""
+
+    def test_ranges(self):
+        """Ensure each range is expanded in order."""
+
+        self.assertEqual([5, 6, 7, 0, 10, 11],
+                         list(ranges_to_indices([5, 0, 3, 10], [3, 1, 0, 2])))
+
+
+class BoxBVHBuildTestCase(unittest.TestCase):
+    """Test the structure built by BoxBVH."""
+
+    def setUp(self):
+        rng = numpy.random.RandomState(7)
+        self.mins = rng.uniform(-10, 10, size=(1001, 3))
+        self.maxs = self.mins + rng.uniform(0, 1, size=(1001, 3))
+        self.bvh = BoxBVH(self.mins, self.maxs, leaf_size=6)
+
+    def test_every_primitive_in_one_leaf(self):
+        """Ensure the leaves cover each primitive exactly once."""
+
+        leaves = numpy.flatnonzero(self.bvh.left < 0)
+        prims = self.bvh.node_prims(leaves)
+
+        self.assertEqual(list(range(1001)), sorted(prims))
+        self.assertTrue((self.bvh.count[leaves] <= 6).all())
+
+    def test_root_covers_everything(self):
+        """Ensure the root bounds are the bounds of all primitives."""
+
+        root = self.bvh.root
+        self.assertEqual(1001, self.bvh.count[root])
+        numpy.testing.assert_array_equal(self.mins.min(axis=0),
+                                         self.bvh.node_min[root])
+        numpy.testing.assert_array_equal(self.maxs.max(axis=0),
+                                         self.bvh.node_max[root])
+
+    def test_nodes_contain_children(self):
+        """Ensure each internal node contains both children."""
+
+        internal = numpy.flatnonzero(self.bvh.left >= 0)
+        for child in (self.bvh.left[internal], self.bvh.right[internal]):
+            self.assertTrue((self.bvh.node_min[internal] <=
+                             self.bvh.node_min[child]).all())
+            self.assertTrue((self.bvh.node_max[internal] >=
+                             self.bvh.node_max[child]).all())
+            self.assertTrue((self.bvh.count[child] > 0).all())
+
+    def test_empty(self):
+        """Ensure an empty BVH has no root and traverses to nothing."""
+
+        bvh = BoxBVH(numpy.zeros((0, 3)), numpy.zeros((0, 3)))
+
+        self.assertEqual(-1, bvh.root)
+        self.assertEqual(0, len(bvh.traverse(None, None)))
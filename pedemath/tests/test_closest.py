@@ -0,0 +1,163 @@
+
+import unittest
+
+import numpy
+
+from pedemath.closest import closest_point_on_segment_array
+from pedemath.closest import closest_point_on_segment_array_all
+from pedemath.closest import closest_point_on_triangle_array
+from pedemath.closest import closest_point_on_triangle_array_all
+from pedemath.closest import nearest_segment_array
+from pedemath.closest import nearest_triangle_array
+from pedemath.closest import point_segment_distance_array
+from pedemath.closest import point_segment_distance_array_all
+from pedemath.closest import point_triangle_distance_array
+from pedemath.closest import point_triangle_distance_array_all
+
+
+def _sampled_triangle_distances(points, a, b, c, samples=200):
+    """Return the (N,) distance from each point to a dense sampling of one
+    triangle.
+    """
+
+    u, v = numpy.meshgrid(numpy.linspace(0, 1, samples),
+                          numpy.linspace(0, 1, samples))
+    keep = u + v <= 1.0
+    surface = (a + numpy.outer(u[keep], b - a) + numpy.outer(v[keep], c - a))
+    return numpy.sqrt(((points[:, None] - surface) ** 2).sum(-1)).min(1)
+
+
+class ClosestPointOnSegmentTestCase(unittest.TestCase):
+    """Test the point to segment queries."""
+
+    def test_clamped(self):
+        """Ensure closest points are clamped to the segment ends."""
+
+        closest, t = closest_point_on_segment_array(
+            [[1, 1, 0], [5, 1, 0], [-3, 0, 0]], [0, 0, 0], [2, 0, 0])
+
+        numpy.testing.assert_array_equal(
+            [[1, 0, 0], [2, 0, 0], [0, 0, 0]], closest)
+        numpy.testing.assert_array_equal([0.5, 1, 0], t)
+
+    def test_2d_paired(self):
+        """Ensure point i is tested against segment i in 2D."""
+
+        distances = point_segment_distance_array(
+            [[0, 3], [4, 4]], [[0, 0], [0, 0]], [[0, 1], [1, 0]])
+
+        numpy.testing.assert_allclose([2, 5], distances)
+
+    def test_zero_length(self):
+        """Ensure a zero length segment acts as a point."""
+
+        closest, t = closest_point_on_segment_array([3, 4], [0, 0], [0, 0])
+
+        numpy.testing.assert_array_equal([0, 0], closest)
+        self.assertEqual(0.0, t)
+
+    def test_all_matches_paired(self):
+        """Ensure all pairs match the paired query."""
+
+        rng = numpy.random.RandomState(3)
+        points = rng.normal(size=(20, 3))
+        starts = rng.normal(size=(7, 3))
+        ends = rng.normal(size=(7, 3))
+
+        closest, t = closest_point_on_segment_array_all(
+            points, starts, ends, block_size=6)
+        distances = point_segment_distance_array_all(points, starts, ends,
+                                                     block_size=6)
+
+        self.assertEqual((20, 7, 3), closest.shape)
+        for j in range(7):
+            paired_closest, paired_t = closest_point_on_segment_array(
+                points, starts[j], ends[j])
+            numpy.testing.assert_allclose(paired_closest, closest[:, j])
+            numpy.testing.assert_allclose(paired_t, t[:, j])
+            numpy.testing.assert_allclose(
+                point_segment_distance_array(points, starts[j], ends[j]),
+                distances[:, j])
+
+    def test_nearest(self):
+        """Ensure the nearest segment is found."""
+
+        segments, closest, distances = nearest_segment_array(
+            [[0.5, 0.5], [3, 0.25]], [[0, 0], [2, 0]], [[1, 0], [2, 1]])
+
+        self.assertEqual([0, 1], list(segments))
+        numpy.testing.assert_allclose([[0.5, 0], [2, 0.25]], closest)
+        numpy.testing.assert_allclose([0.5, 1], distances)
+
+
+class ClosestPointOnTriangleTestCase(unittest.TestCase):
+    """Test the point to triangle queries."""
+
+    def setUp(self):
+        self.a = numpy.array([0.0, 0.0, 0.0])
+        self.b = numpy.array([2.0, 0.0, 0.0])
+        self.c = numpy.array([0.0, 2.0, 0.0])
+
+    def test_regions(self):
+        """Ensure each vertex, edge and face region is handled."""
+
+        points = numpy.array([[-1, -1, 1], [3, -1, 0], [-1, 3, 0],
+                              [1, -1, 0], [-1, 1, 0], [2, 2, 0],
+                              [0.5, 0.5, 3]])
+        closest, bary = closest_point_on_triangle_array(
+            points, self.a, self.b, self.c)
+
+        numpy.testing.assert_allclose(
+            [[0, 0, 0], [2, 0, 0], [0, 2, 0], [1, 0, 0], [0, 1, 0],
+             [1, 1, 0], [0.5, 0.5, 0]], closest, atol=1e-12)
+        numpy.testing.assert_allclose(numpy.ones(7), bary.sum(axis=1))
+
+    def test_matches_sampling(self):
+        """Ensure distances match a dense sampling of the triangle."""
+
+        rng = numpy.random.RandomState(4)
+        points = rng.uniform(-3, 3, size=(50, 3))
+        a, b, c = rng.normal(size=(3, 3))
+
+        distances = point_triangle_distance_array(points, a, b, c)
+
+        numpy.testing.assert_allclose(
+            _sampled_triangle_distances(points, a, b, c), distances,
+            atol=0.05)
+        self.assertTrue((distances <= _sampled_triangle_distances(
+            points, a, b, c) + 1e-9).all())
+
+    def test_2d_inside(self):
+        """Ensure 2D points inside a triangle have distance 0."""
+
+        distances = point_triangle_distance_array(
+            [[0.5, 0.5], [3, 0]], [0, 0], [2, 0], [0, 2])
+
+        numpy.testing.assert_allclose([0, 1], distances)
+
+    def test_all_and_nearest(self):
+        """Ensure all pairs match the paired query and nearest picks the
+        closest triangle.
+        """
+
+        rng = numpy.random.RandomState(5)
+        points = rng.normal(size=(15, 3))
+        a, b, c = rng.normal(size=(3, 6, 3))
+
+        closest, bary = closest_point_on_triangle_array_all(
+            points, a, b, c, block_size=4)
+        distances = point_triangle_distance_array_all(points, a, b, c,
+                                                      block_size=4)
+        triangles, nearest, nearest_distances = nearest_triangle_array(
+            points, a, b, c, block_size=4)
+
+        self.assertEqual((15, 6, 3), bary.shape)
+        for j in range(6):
+            paired_closest, _ = closest_point_on_triangle_array(
+                points, a[j], b[j], c[j])
+            numpy.testing.assert_allclose(paired_closest, closest[:, j])
+        numpy.testing.assert_array_equal(distances.argmin(axis=1), triangles)
+        numpy.testing.assert_allclose(distances.min(axis=1),
+                                      nearest_distances)
+        numpy.testing.assert_allclose(closest[numpy.arange(15), triangles],
+                                      nearest)
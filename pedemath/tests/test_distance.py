@@ -0,0 +1,167 @@
+
+import time
+import unittest
+
+import numpy
+
+from pedemath.distance import _map_blocks
+from pedemath.distance import nearest_point_array
+from pedemath.distance import nearest_point_blocks
+from pedemath.distance import pairwise_distance_array
+from pedemath.distance import pairwise_distance_blocks
+from pedemath.distance import within_distance_pairs
+from pedemath.vec3 import Vec3
+
+
+def _brute_force(points_a, points_b):
+    points_a = numpy.asarray(points_a, dtype=float)
+    points_b = numpy.asarray(points_b, dtype=float)
+    return numpy.linalg.norm(points_a[:, None] - points_b, axis=-1)
+
+
+class PairwiseDistanceTestCase(unittest.TestCase):
+    """Test pairwise_distance_array() and pairwise_distance_blocks()."""
+
+    def setUp(self):
+        rng = numpy.random.RandomState(6)
+        self.points_a = rng.uniform(-10, 10, size=(37, 3))
+        self.points_b = rng.uniform(-10, 10, size=(23, 3))
+
+    def test_matches_brute_force(self):
+        """Ensure every block size and worker count gives the same result.
+        """
+
+        expected = _brute_force(self.points_a, self.points_b)
+        for block_size in (1, 5, 1024):
+            for workers in (None, 3):
+                numpy.testing.assert_allclose(
+                    expected, pairwise_distance_array(
+                        self.points_a, self.points_b, block_size, workers))
+
+    def test_squared(self):
+        """Ensure squared distances can be returned."""
+
+        numpy.testing.assert_allclose(
+            _brute_force(self.points_a, self.points_b) ** 2,
+            pairwise_distance_array(self.points_a, self.points_b,
+                                    squared=True))
+
+    def test_blocks(self):
+        """Ensure blocks are bounded by block_size and cover every pair."""
+
+        covered = numpy.zeros((37, 23), dtype=int)
+        for rows, cols, dist in pairwise_distance_blocks(
+                self.points_a, self.points_b, block_size=10):
+            self.assertTrue(dist.shape[0] <= 10 and dist.shape[1] <= 10)
+            covered[rows, cols] += 1
+
+        self.assertTrue((covered == 1).all())
+
+    def test_workers_keep_pace(self):
+        """Ensure worker threads stay only a few tiles ahead of a slow
+        reader, and still yield every tile in order.
+        """
+
+        started = []
+
+        def work(task):
+            started.append(task)
+            return task
+
+        blocks = _map_blocks(work, range(100), 2)
+        self.assertEqual(0, next(blocks))
+        time.sleep(0.2)
+        self.assertLessEqual(len(started), 5)
+        self.assertEqual(list(range(1, 100)), list(blocks))
+
+    def test_vec3_lists(self):
+        """Ensure lists of Vec3 are accepted."""
+
+        result = pairwise_distance_array([Vec3(0, 0, 0), Vec3(1, 0, 0)],
+                                         [Vec3(0, 3, 4)])
+
+        numpy.testing.assert_allclose([[5], [numpy.sqrt(26)]], result)
+
+    def test_far_from_origin(self):
+        """Ensure small distances far from the origin stay accurate."""
+
+        offset = numpy.array([1e6, -1e6, 1e6])
+        result = pairwise_distance_array([offset], [offset + [0, 0, 1e-3]])
+
+        self.assertAlmostEqual(1e-3, result[0, 0], places=9)
+
+
+class NearestPointTestCase(unittest.TestCase):
+    """Test nearest_point_array() and nearest_point_blocks()."""
+
+    def test_matches_brute_force(self):
+        """Ensure the nearest point matches the full distance matrix."""
+
+        rng = numpy.random.RandomState(7)
+        points_a = rng.normal(size=(50, 2))
+        points_b = rng.normal(size=(41, 2))
+        expected = _brute_force(points_a, points_b)
+
+        for workers in (None, 2):
+            indices, distances = nearest_point_array(
+                points_a, points_b, block_size=8, workers=workers)
+
+            numpy.testing.assert_array_equal(expected.argmin(axis=1),
+                                             indices)
+            numpy.testing.assert_allclose(expected.min(axis=1), distances)
+
+    def test_blocks_in_order(self):
+        """Ensure blocks are yielded in order of points_a."""
+
+        rng = numpy.random.RandomState(8)
+        starts = [rows.start for rows, _, _ in nearest_point_blocks(
+            rng.normal(size=(25, 3)), rng.normal(size=(4, 3)), block_size=7,
+            workers=4)]
+
+        self.assertEqual([0, 7, 14, 21], starts)
+
+    def test_empty_b(self):
+        """Ensure an empty set to search raises ValueError."""
+
+        self.assertRaises(ValueError, nearest_point_array, [[0, 0, 0]],
+                          numpy.empty((0, 3)))
+
+
+class WithinDistanceTestCase(unittest.TestCase):
+    """Test within_distance_pairs()."""
+
+    def test_matches_brute_force(self):
+        """Ensure every pair within the distance is returned in order."""
+
+        rng = numpy.random.RandomState(9)
+        points_a = rng.uniform(0, 10, size=(60, 3))
+        points_b = rng.uniform(0, 10, size=(45, 3))
+        expected = _brute_force(points_a, points_b)
+        expected_a, expected_b = numpy.nonzero(expected <= 2.5)
+
+        for workers in (None, 3):
+            indices_a, indices_b, distances = within_distance_pairs(
+                points_a, points_b, 2.5, block_size=16, workers=workers)
+
+            numpy.testing.assert_array_equal(expected_a, indices_a)
+            numpy.testing.assert_array_equal(expected_b, indices_b)
+            numpy.testing.assert_allclose(expected[expected_a, expected_b],
+                                          distances)
+
+    def test_exact_boundary(self):
+        """Ensure pairs exactly at the distance are included."""
+
+        indices_a, indices_b, _ = within_distance_pairs(
+            [[0, 0, 0], [0.1, 0, 0]], [[0.3, 0, 0], [5, 0, 0]], 0.2)
+
+        self.assertEqual([1], list(indices_a))
+        self.assertEqual([0], list(indices_b))
+
+    def test_empty(self):
+        """Ensure empty inputs give empty results."""
+
+        indices_a, _, distances = within_distance_pairs(
+            numpy.empty((0, 3)), [[0, 0, 0]], 1.0)
+
+        self.assertEqual(0, len(indices_a))
+        self.assertEqual(0, len(distances))
@@ -0,0 +1,173 @@
+
+import unittest
+
+import numpy
+
+from pedemath.dualquat import blend_dualquat_array
+from pedemath.dualquat import DualQuat
+from pedemath.dualquat import dualquat_array_to_mat44_array
+from pedemath.dualquat import dualquat_array_from_mat44_array
+from pedemath.dualquat import dualquat_array_from_mat44_list
+from pedemath.dualquat import dualquat_array_from_quat_trans
+from pedemath.dualquat import skin_dualquat
+from pedemath.dualquat import transform_vec_dualquat_array
+from pedemath.matrix import Matrix44
+from pedemath.quat import Quat
+from pedemath.vec3 import Vec3
+
+
+def _rot_trans_matrix(axis, angle_deg, trans):
+    return Matrix44.from_trans(trans) * Matrix44.from_axis_angle_deg(
+        axis, angle_deg)
+
+
+class DualQuatFromQuatTransTestCase(unittest.TestCase):
+    """Test DualQuat.from_quat_trans()."""
+
+    def test_identity(self):
+        """Ensure the default DualQuat does not move a vector."""
+
+        dual_quat = DualQuat()
+        self.assertEqual(Vec3(1, 2, 3), dual_quat.transform_vec(Vec3(1, 2, 3)))
+
+    def test_get_trans(self):
+        """Ensure the translation can be recovered."""
+
+        rot = Quat.from_axis_angle_deg(Vec3(0, 1, 1), 70)
+        dual_quat = DualQuat.from_quat_trans(rot, Vec3(1, -2, 3))
+
+        self.assertTrue(Vec3(1, -2, 3).almost_equal(dual_quat.get_trans()))
+        self.assertEqual(rot, dual_quat.get_rot())
+
+    def test_transform_vec(self):
+        """Ensure the vector is rotated first, then translated."""
+
+        rot = Quat.from_axis_angle_deg(Vec3(0, 0, 1), 90)
+        dual_quat = DualQuat.from_quat_trans(rot, Vec3(10, 0, 0))
+
+        self.assertTrue(Vec3(10, 1, 0).almost_equal(
+            dual_quat.transform_vec(Vec3(1, 0, 0))))
+
+    def test_mul(self):
+        """Ensure (a * b) applies b first, like Matrix44."""
+
+        dq_a = DualQuat.from_quat_trans(
+            Quat.from_axis_angle_deg(Vec3(0, 0, 1), 90), Vec3(1, 2, 3))
+        dq_b = DualQuat.from_quat_trans(
+            Quat.from_axis_angle_deg(Vec3(1, 0, 0), 30), Vec3(-4, 0, 1))
+        vec = Vec3(0.5, 1.5, -2)
+
+        expected = dq_a.transform_vec(dq_b.transform_vec(vec))
+        result = (dq_a * dq_b).transform_vec(vec)
+        self.assertTrue(expected.almost_equal(result))
+
+
+class DualQuatMatrix44TestCase(unittest.TestCase):
+    """Test conversions between DualQuat and Matrix44."""
+
+    def test_from_matrix44(self):
+        """Ensure transforming by the DualQuat matches the Matrix44."""
+
+        mat = _rot_trans_matrix(Vec3(1, 2, 3), 50, Vec3(3, 4, 5))
+        dual_quat = DualQuat.from_matrix44(mat)
+        vec = Vec3(-1, 2, 0.5)
+
+        self.assertTrue((mat * vec).almost_equal(
+            dual_quat.transform_vec(vec), places=5))
+
+    def test_as_matrix44_round_trip(self):
+        """Ensure converting back to a Matrix44 gives the original matrix."""
+
+        mat = _rot_trans_matrix(Vec3(0, 1, 0), -120, Vec3(-2, 0, 7))
+        self.assertTrue(mat.almost_equal(
+            DualQuat.from_matrix44(mat).as_matrix44()))
+
+    def test_array_to_mat44_array(self):
+        """Ensure the batched conversion matches as_matrix44()."""
+
+        mats = [_rot_trans_matrix(Vec3(1, 0, 0), 20, Vec3(1, 2, 3)),
+                _rot_trans_matrix(Vec3(0, 1, 1), 200, Vec3(0, -5, 1))]
+        dual_quats = dualquat_array_from_mat44_list(mats)
+
+        result = dualquat_array_to_mat44_array(dual_quats)
+        for mat, data in zip(mats, result):
+            numpy.testing.assert_allclose(mat.data, data, atol=1e-5)
+
+    def test_array_from_mat44_array(self):
+        """Ensure the batched conversion matches DualQuat.from_matrix44()."""
+
+        mat = _rot_trans_matrix(Vec3(1, 1, 0), 75, Vec3(4, -2, 1))
+        result = dualquat_array_from_mat44_array(mat.data[None])
+
+        numpy.testing.assert_allclose(
+            [DualQuat.from_matrix44(mat).as_array()], result, atol=1e-6)
+
+
+class DualQuatArrayTestCase(unittest.TestCase):
+    """Test the batched dual quaternion functions."""
+
+    def setUp(self):
+        self.dual_quats = [
+            DualQuat.from_quat_trans(
+                Quat.from_axis_angle_deg(Vec3(0, 0, 1), 90), Vec3(1, 0, 0)),
+            DualQuat.from_quat_trans(
+                Quat.from_axis_angle_deg(Vec3(1, 1, 0), -45), Vec3(0, 2, 3)),
+        ]
+        self.dq_array = numpy.array([dq.as_array() for dq in self.dual_quats])
+
+    def test_from_quat_trans(self):
+        """Ensure the batched constructor matches DualQuat.from_quat_trans."""
+
+        quats = [dq.real for dq in self.dual_quats]
+        trans = [dq.get_trans() for dq in self.dual_quats]
+        result = dualquat_array_from_quat_trans(
+            [[q.x, q.y, q.z, q.w] for q in quats],
+            [t.as_tuple() for t in trans])
+
+        numpy.testing.assert_allclose(self.dq_array, result, atol=1e-12)
+
+    def test_transform_vec(self):
+        """Ensure the batched transform matches DualQuat.transform_vec."""
+
+        vecs = [Vec3(1, 2, 3), Vec3(-3, 0.5, 4)]
+        result = transform_vec_dualquat_array(
+            self.dq_array, [v.as_tuple() for v in vecs])
+
+        for dual_quat, vec, row in zip(self.dual_quats, vecs, result):
+            self.assertTrue(dual_quat.transform_vec(vec).almost_equal(
+                Vec3(*row)))
+
+    def test_blend_single_influence(self):
+        """Ensure a full weight on one joint gives that joint's transform."""
+
+        blended = blend_dualquat_array(
+            self.dq_array, [[1, 0], [0, 1]], [[1.0, 0.0], [1.0, 0.0]])
+
+        numpy.testing.assert_allclose(self.dq_array[::-1], blended,
+                                      atol=1e-12)
+
+    def test_blend_antipodal(self):
+        """Ensure a negated joint quaternion blends like the original."""
+
+        dq_array = numpy.array([self.dq_array[0], -self.dq_array[0]])
+        blended = blend_dualquat_array(dq_array, [[0, 1]], [[0.5, 0.5]])
+
+        numpy.testing.assert_allclose(self.dq_array[:1], blended, atol=1e-12)
+
+    def test_skin(self):
+        """Ensure skinning between a joint and its own translation blends
+        the translation halfway.
+        """
+
+        dq_array = numpy.array([
+            DualQuat().as_array(),
+            DualQuat.from_quat_trans(Quat(), Vec3(0, 4, 0)).as_array()])
+        vecs = numpy.array([[1.0, 0.0, 0.0], [0.0, 0.0, 1.0]])
+
+        skinned, normals = skin_dualquat(
+            vecs, dq_array, [[0, 1], [0, 1]], [[0.5, 0.5], [0.0, 1.0]],
+            normals=vecs)
+
+        numpy.testing.assert_allclose([[1, 2, 0], [0, 4, 1]], skinned,
+                                      atol=1e-12)
+        numpy.testing.assert_allclose(vecs, normals, atol=1e-12)
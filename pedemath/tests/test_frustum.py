@@ -0,0 +1,119 @@
+
+import unittest
+
+import numpy
+
+from pedemath.bounds import rect3_list_to_array
+from pedemath.bvh import BoxBVH
+from pedemath.frustum import Frustum
+from pedemath.frustum import FRUSTUM_INSIDE
+from pedemath.frustum import FRUSTUM_INTERSECT
+from pedemath.frustum import FRUSTUM_OUTSIDE
+from pedemath.matrix import Matrix44
+from pedemath.rect3 import Rect3
+from pedemath.vec3 import Vec3
+
+
+def _perspective_90():
+    """Return an OpenGL style 90 degree perspective matrix, near 1, far 10.
+    """
+
+    mat = Matrix44()
+    near, far = 1.0, 10.0
+    # [column][row]
+    mat.data[2][2] = -(far + near) / (far - near)
+    mat.data[2][3] = -1.0
+    mat.data[3][2] = -2.0 * far * near / (far - near)
+    mat.data[3][3] = 0.0
+    return mat
+
+
+class FrustumFromMatrix44TestCase(unittest.TestCase):
+    """Test Frustum.from_matrix44()."""
+
+    def test_identity_is_unit_cube(self):
+        """Ensure the identity matrix gives the [-1, 1] clip cube."""
+
+        frustum = Frustum.from_matrix44(Matrix44())
+
+        self.assertEqual(
+            [True, True, False, False],
+            list(frustum.contains_points(
+                [(0, 0, 0), (1, -1, 1), (1.01, 0, 0), (0, 0, -1.5)])))
+
+    def test_perspective(self):
+        """Ensure points are tested against the perspective volume."""
+
+        frustum = Frustum.from_matrix44(_perspective_90())
+
+        self.assertEqual(
+            [True, True, False, False, False],
+            list(frustum.contains_points(
+                [(0, 0, -2), (4.9, 0, -5), (0, 0, -0.5), (0, 0, -11),
+                 (0, 3, -2)])))
+
+    def test_transformed(self):
+        """Ensure a view matrix moves the planes."""
+
+        view = Matrix44.from_trans(Vec3(-100, 0, 0))
+        frustum = Frustum.from_matrix44(_perspective_90() * view)
+
+        self.assertEqual([True, False], list(
+            frustum.contains_points([(100, 0, -2), (0, 0, -2)])))
+
+
+class FrustumClassifyTestCase(unittest.TestCase):
+    """Test box and sphere classification."""
+
+    def setUp(self):
+        self.frustum = Frustum.from_matrix44(_perspective_90())
+
+    def test_spheres(self):
+        """Ensure spheres are inside, outside or intersecting."""
+
+        result = self.frustum.classify_spheres(
+            [(0, 0, -5), (0, 0, -5), (0, 0, -20)], [1.0, 10.0, 1.0])
+
+        self.assertEqual([FRUSTUM_INSIDE, FRUSTUM_INTERSECT, FRUSTUM_OUTSIDE],
+                         list(result))
+
+    def test_boxes(self):
+        """Ensure Rect3 boxes are inside, outside or intersecting."""
+
+        boxes = rect3_list_to_array([
+            Rect3(-1, -1, -6, 2, 2, 2),
+            Rect3(-1, -1, -1.5, 2, 2, 2),
+            Rect3(20, 0, -6, 1, 1, 1)])
+
+        self.assertEqual([FRUSTUM_INSIDE, FRUSTUM_INTERSECT, FRUSTUM_OUTSIDE],
+                         list(self.frustum.classify_boxes(boxes)))
+        self.assertEqual([0, 1], list(self.frustum.cull_boxes(boxes)))
+
+    def test_cull_spheres(self):
+        """Ensure the indices of visible spheres are returned."""
+
+        result = self.frustum.cull_spheres(
+            [(0, 0, 5), (0, 0, -5), (3, 0, -2)], 1.5)
+        self.assertEqual([1, 2], list(result))
+
+
+class FrustumCullBVHTestCase(unittest.TestCase):
+    """Test Frustum.cull_bvh()."""
+
+    def test_matches_flat_cull(self):
+        """Ensure hierarchical culling gives the same boxes as testing every
+        box.
+        """
+
+        rng = numpy.random.RandomState(3)
+        mins = rng.uniform(-20, 20, size=(2000, 3))
+        boxes = numpy.concatenate(
+            (mins, rng.uniform(0.1, 2, size=(2000, 3))), axis=1)
+        bvh = BoxBVH.from_rect3_array(boxes, leaf_size=4)
+
+        view = Matrix44.from_rot_y(30) * Matrix44.from_trans(Vec3(2, 0, 5))
+        frustum = Frustum.from_matrix44(_perspective_90() * view)
+
+        expected = frustum.cull_boxes(boxes)
+        self.assertTrue(0 < len(expected) < len(boxes))
+        numpy.testing.assert_array_equal(expected, frustum.cull_bvh(bvh))
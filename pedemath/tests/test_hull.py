@@ -0,0 +1,218 @@
+
+import unittest
+
+import numpy
+
+from pedemath.hull import convex_hull_2d
+from pedemath.hull import convex_hull_3d
+from pedemath.hull import convex_hull_volume
+from pedemath.hull import min_area_rect_2d
+from pedemath.vec2 import Vec2
+from pedemath.vec3 import Vec3
+
+
+def _is_convex_hull(points, hull):
+    """Return True if hull turns strictly left at every vertex and every
+    point is inside or on it.
+    """
+
+    edges = numpy.roll(hull, -1, axis=0) - hull
+    next_edges = numpy.roll(edges, -1, axis=0)
+    turns = edges[:, 0] * next_edges[:, 1] - edges[:, 1] * next_edges[:, 0]
+    offsets = points[:, None] - hull
+    sides = edges[:, 0] * offsets[..., 1] - edges[:, 1] * offsets[..., 0]
+    return (turns > 0).all() and (sides >= -1e-9).all()
+
+
+class ConvexHull2DTestCase(unittest.TestCase):
+    """Test convex_hull_2d()."""
+
+    def test_square_with_extras(self):
+        """Ensure interior, edge and duplicate points are dropped and the
+        hull is counter-clockwise from the lowest x then y.
+        """
+
+        points = [Vec2(1, 1), Vec2(2, 2), Vec2(0, 0), Vec2(1, 0),
+                  Vec2(2, 0), Vec2(0, 2), Vec2(0, 0), Vec2(0, 1)]
+
+        self.assertEqual([Vec2(0, 0), Vec2(2, 0), Vec2(2, 2), Vec2(0, 2)],
+                         convex_hull_2d(points))
+        self.assertEqual([2, 4, 1, 5],
+                         list(convex_hull_2d(points, return_indices=True)))
+
+    def test_degenerate(self):
+        """Ensure empty, single, duplicate and collinear inputs."""
+
+        self.assertEqual(0, len(convex_hull_2d(numpy.empty((0, 2)),
+                                               return_indices=True)))
+        self.assertEqual([Vec2(3, 4)], convex_hull_2d([(3, 4), (3, 4)]))
+        self.assertEqual(
+            [1, 2], list(convex_hull_2d([(1, 1), (0, 0), (3, 3), (2, 2)],
+                                        return_indices=True)))
+
+    def test_random(self):
+        """Ensure large sets, which use the octagon filter, give a convex
+        hull around every point.
+        """
+
+        rng = numpy.random.RandomState(20)
+        for points in (rng.normal(size=(5000, 2)),
+                       rng.randint(0, 10, size=(5000, 2)).astype(float)):
+            indices = convex_hull_2d(points, return_indices=True)
+
+            self.assertTrue(_is_convex_hull(points, points[indices]))
+            self.assertEqual(points[:, 0].min(), points[indices[0], 0])
+
+    def test_circle(self):
+        """Ensure points on a circle are all on the hull."""
+
+        angles = numpy.linspace(0, 2 * numpy.pi, 100, endpoint=False)
+        points = numpy.stack((numpy.cos(angles), numpy.sin(angles)), axis=1)
+        indices = convex_hull_2d(points[::-1], return_indices=True)
+
+        self.assertEqual(100, len(indices))
+        self.assertTrue(_is_convex_hull(points, points[::-1][indices]))
+
+
+class MinAreaRect2DTestCase(unittest.TestCase):
+    """Test min_area_rect_2d()."""
+
+    def test_rotated_rectangle(self):
+        """Ensure a rotated rectangle of points is found exactly."""
+
+        rng = numpy.random.RandomState(21)
+        local = rng.uniform(0, 1, size=(500, 2)) * [4, 1]
+        local = numpy.concatenate((local, [[0, 0], [4, 0], [4, 1], [0, 1]]))
+        angle = 0.4
+        rot = numpy.array([[numpy.cos(angle), numpy.sin(angle)],
+                           [-numpy.sin(angle), numpy.cos(angle)]])
+
+        corners, area = min_area_rect_2d(local.dot(rot) + [5, -2])
+
+        self.assertAlmostEqual(4.0, area)
+        side_lengths = numpy.linalg.norm(
+            numpy.roll(corners, -1, axis=0) - corners, axis=1)
+        numpy.testing.assert_allclose(sorted(side_lengths), [1, 1, 4, 4])
+
+    def test_matches_brute_force(self):
+        """Ensure the area matches trying every hull edge."""
+
+        rng = numpy.random.RandomState(22)
+        for _ in range(50):
+            points = rng.normal(size=(rng.randint(3, 60), 2)) * [3, 1]
+            hull = points[convex_hull_2d(points, return_indices=True)]
+            best = numpy.inf
+            for i in range(len(hull)):
+                edge = hull[(i + 1) % len(hull)] - hull[i]
+                axes = numpy.array([edge, (-edge[1], edge[0])])
+                axes /= numpy.linalg.norm(edge)
+                spans = numpy.ptp(hull.dot(axes.T), axis=0)
+                best = min(best, spans[0] * spans[1])
+
+            corners, area = min_area_rect_2d(points)
+
+            self.assertAlmostEqual(best, area)
+            self.assertTrue(_is_convex_hull(points, corners))
+
+    def test_collinear(self):
+        """Ensure collinear points give a flat rectangle."""
+
+        corners, area = min_area_rect_2d([Vec2(0, 0), Vec2(1, 1),
+                                          Vec2(3, 3)])
+
+        self.assertEqual(0.0, area)
+        numpy.testing.assert_array_equal([0, 0], corners[0])
+        numpy.testing.assert_array_equal([3, 3], corners[1])
+
+
+def _check_hull_3d(test, points, vertices, faces, normals):
+    """Assert every point is below every face and normals match windings.
+    """
+
+    corners = points[faces]
+    windings = numpy.cross(corners[:, 1] - corners[:, 0],
+                           corners[:, 2] - corners[:, 0])
+    numpy.testing.assert_allclose(
+        normals, windings / numpy.linalg.norm(windings, axis=1)[:, None],
+        atol=1e-9)
+    heights = (numpy.dot(points, normals.T) -
+               numpy.einsum("fi,fi->f", normals, corners[:, 0]))
+    test.assertTrue((heights <= 1e-9).all())
+    numpy.testing.assert_array_equal(numpy.unique(faces), vertices)
+
+
+class ConvexHull3DTestCase(unittest.TestCase):
+    """Test convex_hull_3d()."""
+
+    def test_cube(self):
+        """Ensure a cube with points inside and on its faces gives the
+        corners, 12 triangles and its volume.
+        """
+
+        rng = numpy.random.RandomState(23)
+        corners = numpy.array([(x, y, z) for x in (0, 2) for y in (0, 2)
+                               for z in (0, 2)], dtype=float)
+        face_centers = numpy.array([(1, 1, 0), (1, 1, 2), (0, 1, 1)],
+                                   dtype=float)
+        points = numpy.concatenate((rng.uniform(0, 2, size=(200, 3)),
+                                    corners, face_centers))
+        vertices, faces, normals = convex_hull_3d(points)
+
+        numpy.testing.assert_array_equal(numpy.arange(200, 208), vertices)
+        self.assertEqual((12, 3), faces.shape)
+        _check_hull_3d(self, points, vertices, faces, normals)
+        self.assertAlmostEqual(8.0, convex_hull_volume(points, faces))
+
+    def test_random(self):
+        """Ensure random clouds give closed, convex hulls."""
+
+        rng = numpy.random.RandomState(24)
+        for points in (rng.normal(size=(3000, 3)),
+                       rng.randint(0, 4, size=(500, 3)).astype(float)):
+            vertices, faces, normals = convex_hull_3d(points)
+
+            _check_hull_3d(self, points, vertices, faces, normals)
+            # A closed triangle mesh has V - E + F = 2, with E = 3F / 2.
+            self.assertEqual(2, len(vertices) - len(faces) // 2)
+
+    def test_sphere(self):
+        """Ensure points on a sphere are all hull vertices."""
+
+        rng = numpy.random.RandomState(25)
+        points = rng.normal(size=(300, 3))
+        points /= numpy.linalg.norm(points, axis=1)[:, None]
+
+        vertices, faces, normals = convex_hull_3d(points)
+
+        self.assertEqual(300, len(vertices))
+        self.assertEqual(596, len(faces))
+        _check_hull_3d(self, points, vertices, faces, normals)
+
+    def test_coplanar(self):
+        """Ensure points on a plane give a two sided flat hull."""
+
+        points = [Vec3(x, y, 2 * x + 1) for x in (0, 1, 2) for y in (0, 1)]
+        vertices, faces, normals = convex_hull_3d(points)
+
+        numpy.testing.assert_array_equal([0, 1, 4, 5], vertices)
+        self.assertEqual(4, len(faces))
+        numpy.testing.assert_allclose(normals[:2], -normals[2:])
+        numpy.testing.assert_allclose(
+            [2, 0, 1], numpy.abs(normals[0]) * numpy.sqrt(5))
+
+    def test_degenerate(self):
+        """Ensure empty, single point and collinear inputs have no faces.
+        """
+
+        vertices, faces, _ = convex_hull_3d(numpy.empty((0, 3)))
+        self.assertEqual((0, 3), faces.shape)
+        self.assertEqual(0, len(vertices))
+
+        vertices, faces, _ = convex_hull_3d([(1, 1, 1)] * 3)
+        self.assertEqual([0], list(vertices))
+        self.assertEqual(0, len(faces))
+
+        vertices, faces, _ = convex_hull_3d([(0, 0, 0), (3, 3, 3),
+                                             (1, 1, 1)])
+        self.assertEqual([0, 1], list(vertices))
+        self.assertEqual(0, len(faces))
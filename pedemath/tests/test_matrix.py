@@ -2,8 +2,21 @@
 import math
 import unittest
 
+import numpy
+
 from pedemath.vec3 import Vec3
+from pedemath.matrix import axis_angle_deg_to_mat44_array
+from pedemath.matrix import euler_deg_to_mat44_array
+from pedemath.matrix import look_at_mat44_array
 from pedemath.matrix import Matrix44
+from pedemath.matrix import normalize_v3_array
+from pedemath.matrix import ortho_mat44_array
+from pedemath.matrix import perpendicular_v3_array
+from pedemath.matrix import perspective_deg_mat44_array
+from pedemath.matrix import rot_from_vectors_mat44_array
+from pedemath.matrix import rotate_v3_array_euler_deg
+from pedemath.matrix import rotate_v3f_deg_xyz
+from pedemath.matrix import transform_v3_array
 
 
 class TestMatrix44MakeIdentity(unittest.TestCase):
@@ -448,3 +461,279 @@ class Matrix44FromAxisAngleTestCase(unittest.TestCase):
         self.assertAlmostEqual(mat.data[3][1], 0)
         self.assertAlmostEqual(mat.data[3][2], 0)
         self.assertAlmostEqual(mat.data[3][3], 1)
+
+
+class Matrix44FromEulerTestCase(unittest.TestCase):
+    """Test Matrix44.from_euler_deg() and the batched euler functions."""
+
+    def test_matches_separate_rotations(self):
+        """Ensure the fused matrix matches rotating around x, y, then z."""
+
+        rot = (30, -45, 110)
+        vec = Vec3(1, 2, 3)
+        expected = Matrix44.from_rot_z(rot[2]) * (
+            Matrix44.from_rot_y(rot[1]) * (Matrix44.from_rot_x(rot[0]) * vec))
+
+        self.assertTrue(expected.almost_equal(
+            Matrix44.from_euler_deg(rot) * vec, places=5))
+        self.assertTrue(expected.almost_equal(
+            rotate_v3f_deg_xyz(vec, rot), places=5))
+
+    def test_order(self):
+        """Ensure the order arg changes which rotation is applied first."""
+
+        rot = (90, 0, 90)
+        vec = Vec3(0, 1, 0)
+
+        # x first: y -> z, then z leaves it alone.
+        self.assertTrue(Vec3(0, 0, 1).almost_equal(
+            Matrix44.from_euler_deg(rot, "xyz") * vec, places=5))
+        # z first: y -> -x, then x leaves it alone.
+        self.assertTrue(Vec3(-1, 0, 0).almost_equal(
+            Matrix44.from_euler_deg(rot, "zyx") * vec, places=5))
+
+    def test_invalid_order(self):
+        """Ensure a ValueError is raised for an invalid order."""
+
+        self.assertRaises(ValueError, Matrix44.from_euler_deg, (0, 0, 0),
+                          "xxz")
+
+    def test_array_matches_single(self):
+        """Ensure each stacked matrix matches Matrix44.from_euler_deg()."""
+
+        eulers = [(10, 20, 30), (-90, 45, 0), (0, 0, 180)]
+        mats = euler_deg_to_mat44_array(eulers, "yzx")
+
+        self.assertEqual((3, 4, 4), mats.shape)
+        for rot, data in zip(eulers, mats):
+            numpy.testing.assert_allclose(
+                Matrix44.from_euler_deg(rot, "yzx").data, data, atol=1e-6)
+
+    def test_rotate_array_one_rotation(self):
+        """Ensure one euler triple is applied to every vector."""
+
+        vecs = [Vec3(1, 0, 0), Vec3(0, 1, 2), Vec3(-3, 1, 1)]
+        result = rotate_v3_array_euler_deg(vecs, (30, 60, 90))
+
+        for vec, row in zip(vecs, result):
+            self.assertTrue(rotate_v3f_deg_xyz(vec, (30, 60, 90)).almost_equal(
+                Vec3(*row), places=5))
+
+    def test_rotate_array_per_vector(self):
+        """Ensure one euler triple per vector is applied to its vector."""
+
+        vecs = [Vec3(1, 0, 0), Vec3(0, 1, 2)]
+        eulers = [(0, 0, 90), (90, 0, 0)]
+        result = rotate_v3_array_euler_deg(vecs, eulers)
+
+        numpy.testing.assert_allclose([[0, 1, 0], [0, -2, 1]], result,
+                                      atol=1e-12)
+
+
+class TransformV3ArrayTestCase(unittest.TestCase):
+    """Test transform_v3_array()."""
+
+    def test_matches_matrix44_mul(self):
+        """Ensure the result matches Matrix44 * Vec3."""
+
+        mat = Matrix44.from_trans(Vec3(1, 2, 3)) * Matrix44.from_rot_y(30)
+        vecs = [Vec3(1, 0, 0), Vec3(4, 5, -6)]
+        result = transform_v3_array(mat.data, vecs)
+
+        for vec, row in zip(vecs, result):
+            self.assertTrue((mat * vec).almost_equal(Vec3(*row), places=5))
+
+
+class AxisAngleToMat44ArrayTestCase(unittest.TestCase):
+    """Test axis_angle_deg_to_mat44_array()."""
+
+    def test_matches_from_axis_angle_deg(self):
+        """Ensure each matrix matches Matrix44.from_axis_angle_deg()."""
+
+        axes = [(1, 0, 0), (1, 2, 3), (0, -4, 1)]
+        angles = [90, -35, 180]
+        mats = axis_angle_deg_to_mat44_array(axes, angles)
+
+        for axis, angle, data in zip(axes, angles, mats):
+            numpy.testing.assert_allclose(
+                Matrix44.from_axis_angle_deg(Vec3(*axis), angle).data, data,
+                atol=1e-6)
+
+
+class V3ArrayTestCase(unittest.TestCase):
+    """Test normalize_v3_array() and perpendicular_v3_array()."""
+
+    def test_perpendicular_v3_array(self):
+        """Ensure unit perpendiculars are found for vectors along and off
+        the axes.
+        """
+
+        vecs = numpy.array([[1, 0, 0], [0, 0, -2], [1, 2, 3], [-5, 1, 1]],
+                           dtype=float)
+        perps = perpendicular_v3_array(vecs)
+
+        numpy.testing.assert_array_almost_equal(
+            numpy.ones(4), numpy.linalg.norm(perps, axis=1))
+        numpy.testing.assert_array_almost_equal(
+            numpy.zeros(4), (perps * vecs).sum(axis=1))
+        numpy.testing.assert_array_almost_equal(
+            [[1, 0, 0], [0, 0, -1]], normalize_v3_array(vecs[:2]))
+
+
+class Matrix44RotFromVectorsTestCase(unittest.TestCase):
+    """Test Matrix44.rot_from_vectors()."""
+
+    def test_rotates_start_to_end(self):
+        """Ensure start_vec is rotated onto the direction of end_vec."""
+
+        mat = Matrix44.rot_from_vectors(Vec3(0, 0, -1), Vec3(0.0, -0.5, 0.0))
+        self.assertTrue(Vec3(0, -1, 0).almost_equal(
+            mat * Vec3(0, 0, -1), places=6))
+
+    def test_shortest_arc(self):
+        """Ensure the rotation axis is perpendicular to both vectors."""
+
+        mat = Matrix44.rot_from_vectors(Vec3(1, 0, 0), Vec3(0, 1, 0))
+        self.assertTrue(Vec3(0, 0, 1).almost_equal(
+            mat * Vec3(0, 0, 1), places=6))
+
+    def test_parallel(self):
+        """Ensure parallel vectors give the identity."""
+
+        mat = Matrix44.rot_from_vectors(Vec3(1, 2, 3), Vec3(2, 4, 6))
+        self.assertTrue(mat.almost_equal(Matrix44()))
+
+    def test_antiparallel(self):
+        """Ensure opposite vectors give a 180 degree rotation."""
+
+        for vec in (Vec3(1, 0, 0), Vec3(0, 0, 1), Vec3(1, -2, 3)):
+            mat = Matrix44.rot_from_vectors(vec, -vec)
+            self.assertTrue((-vec).almost_equal(mat * vec, places=5))
+
+    def test_array(self):
+        """Ensure each stacked matrix matches the single version."""
+
+        starts = [(1, 0, 0), (0, 1, 0), (1, 1, 1), (0, 0, 2)]
+        ends = [(0, 1, 0), (0, -3, 0), (1, 1, 1), (1, 2, 3)]
+        mats = rot_from_vectors_mat44_array(starts, ends)
+
+        self.assertEqual((4, 4, 4), mats.shape)
+        for start, end, data in zip(starts, ends, mats):
+            numpy.testing.assert_allclose(
+                Matrix44.rot_from_vectors(Vec3(*start), Vec3(*end)).data,
+                data, atol=1e-6)
+
+    def test_array_nearly_antiparallel(self):
+        """Ensure nearly opposite vectors still give orthonormal matrices
+        that rotate the start onto the end, to within the antiparallel
+        threshold.
+        """
+
+        offsets = numpy.array([1e-4, 1e-5, 1e-6, 1e-7])
+        starts = numpy.tile([1.0, 0.0, 0.0], (4, 1))
+        ends = numpy.column_stack([-numpy.ones(4), offsets, offsets * 0.5])
+        rots = rot_from_vectors_mat44_array(starts, ends)[:, :3, :3]
+
+        numpy.testing.assert_allclose(
+            numpy.tile(numpy.identity(3), (4, 1, 1)),
+            numpy.matmul(rots, numpy.swapaxes(rots, 1, 2)), atol=1e-12)
+        rotated = numpy.einsum("nij,ni->nj", rots, starts)
+        numpy.testing.assert_allclose(
+            ends / numpy.linalg.norm(ends, axis=1)[:, None], rotated,
+            atol=2e-6)
+
+
+class Matrix44CameraTestCase(unittest.TestCase):
+    """Test the perspective, orthographic and look at builders."""
+
+    def _clip(self, mat, vec):
+        """Return x, y, z, w clip coordinates of vec."""
+
+        return [sum(vec[col] * mat.data[col][row] for col in range(3)) +
+                mat.data[3][row] for row in range(4)]
+
+    def test_perspective_near_far(self):
+        """Ensure the near and far planes map to -1 and 1 after divide."""
+
+        mat = Matrix44.from_perspective_deg(90, 2.0, 1.0, 100.0)
+
+        for z, expected in ((-1.0, -1.0), (-100.0, 1.0)):
+            clip = self._clip(mat, Vec3(0, 0, z))
+            self.assertAlmostEqual(expected, clip[2] / clip[3], places=5)
+
+    def test_perspective_fov(self):
+        """Ensure points on the edge of the fov map to the clip edges."""
+
+        mat = Matrix44.from_perspective_deg(90, 2.0, 1.0, 100.0)
+        clip = self._clip(mat, Vec3(20, 10, -10))
+
+        self.assertAlmostEqual(1.0, clip[0] / clip[3], places=5)
+        self.assertAlmostEqual(1.0, clip[1] / clip[3], places=5)
+
+    def test_ortho(self):
+        """Ensure the box corners map to the clip cube corners."""
+
+        mat = Matrix44.from_ortho(-2, 6, 0, 4, 1, 11)
+
+        self.assertTrue(Vec3(-1, -1, -1).almost_equal(
+            mat * Vec3(-2, 0, -1), places=6))
+        self.assertTrue(Vec3(1, 1, 1).almost_equal(
+            mat * Vec3(6, 4, -11), places=6))
+
+    def test_look_at(self):
+        """Ensure the eye moves to the origin looking down -z."""
+
+        mat = Matrix44.from_look_at(Vec3(1, 2, 3), Vec3(1, 2, -7), (0, 1, 0))
+
+        self.assertTrue(Vec3(0, 0, 0).almost_equal(mat * Vec3(1, 2, 3)))
+        self.assertTrue(Vec3(0, 0, -10).almost_equal(mat * Vec3(1, 2, -7)))
+        self.assertTrue(Vec3(0, 1, 0).almost_equal(mat * Vec3(1, 3, 3)))
+
+    def test_look_at_sideways(self):
+        """Ensure looking down +x puts +x in front of the camera."""
+
+        mat = Matrix44.from_look_at(Vec3(0, 0, 0), Vec3(5, 0, 0),
+                                    Vec3(0, 1, 0))
+
+        self.assertTrue(Vec3(0, 0, -5).almost_equal(mat * Vec3(5, 0, 0),
+                                                    places=6))
+        self.assertTrue(Vec3(1, 0, 0).almost_equal(mat * Vec3(0, 0, 1),
+                                                   places=6))
+
+
+class CameraMat44ArrayTestCase(unittest.TestCase):
+    """Test the batched camera matrix builders."""
+
+    def test_perspective(self):
+        """Ensure each matrix matches Matrix44.from_perspective_deg()."""
+
+        fovs = [30, 60, 90]
+        mats = perspective_deg_mat44_array(fovs, 1.5, [0.1, 1, 2], 100)
+
+        self.assertEqual((3, 4, 4), mats.shape)
+        for fov, near, data in zip(fovs, [0.1, 1, 2], mats):
+            numpy.testing.assert_allclose(
+                Matrix44.from_perspective_deg(fov, 1.5, near, 100).data,
+                data, rtol=1e-6)
+
+    def test_ortho(self):
+        """Ensure each matrix matches Matrix44.from_ortho()."""
+
+        mats = ortho_mat44_array([-1, -5], [1, 3], -2, 2, [0, 1], [10, 50])
+
+        numpy.testing.assert_allclose(
+            Matrix44.from_ortho(-5, 3, -2, 2, 1, 50).data, mats[1],
+            rtol=1e-6)
+
+    def test_look_at(self):
+        """Ensure each matrix matches Matrix44.from_look_at()."""
+
+        eyes = [(0, 0, 5), (1, 2, 3), (-4, 4, 0)]
+        targets = [(0, 0, 0), (3, 2, 1), (0, 0, 0)]
+        mats = look_at_mat44_array(eyes, targets, (0, 1, 0))
+
+        for eye, target, data in zip(eyes, targets, mats):
+            numpy.testing.assert_allclose(
+                Matrix44.from_look_at(Vec3(*eye), Vec3(*target),
+                                      Vec3(0, 1, 0)).data,
+                data, atol=1e-6)
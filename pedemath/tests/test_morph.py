@@ -0,0 +1,116 @@
+
+import unittest
+
+import numpy
+
+from pedemath.morph import MorphBlender
+from pedemath.morph import MorphTarget
+from pedemath.vec3 import Vec3
+
+
+class MorphTargetTestCase(unittest.TestCase):
+    """Test MorphTarget construction."""
+
+    def test_from_deltas_is_sparse(self):
+        """Ensure only vertices that move are stored."""
+
+        deltas = numpy.zeros((10, 3))
+        deltas[2] = (0, 1, 0)
+        deltas[7] = (0, 0, -2)
+        target = MorphTarget.from_deltas(deltas)
+
+        self.assertEqual([2, 7], list(target.indices))
+        self.assertEqual(2, len(target))
+        numpy.testing.assert_array_equal(deltas, target.to_deltas(10))
+
+    def test_from_deltas_tolerance(self):
+        """Ensure deltas within the tolerance are dropped."""
+
+        deltas = [[0.001, 0, 0], [0, 0.5, 0]]
+        target = MorphTarget.from_deltas(deltas, tolerance=0.01)
+
+        self.assertEqual([1], list(target.indices))
+
+    def test_from_positions_vec3(self):
+        """Ensure lists of Vec3 are accepted."""
+
+        base = [Vec3(0, 0, 0), Vec3(1, 1, 1)]
+        target = MorphTarget.from_positions(
+            base, [Vec3(0, 0, 0), Vec3(1, 2, 1)], name="smile")
+
+        self.assertEqual([1], list(target.indices))
+        numpy.testing.assert_array_equal([[0, 1, 0]], target.deltas)
+        self.assertEqual("smile", target.name)
+
+    def test_mismatched_lengths(self):
+        """Ensure a ValueError is raised for mismatched indices and deltas."""
+
+        self.assertRaises(ValueError, MorphTarget, [0, 1], [[0, 0, 1]])
+
+    def test_bad_indices(self):
+        """Ensure a ValueError is raised for negative or repeated indices,
+        and for indices past the vertex count.
+        """
+
+        deltas = [[0, 0, 1], [0, 1, 0]]
+        self.assertRaises(ValueError, MorphTarget, [-1, 2], deltas)
+        self.assertRaises(ValueError, MorphTarget, [2, 2], deltas)
+
+        target = MorphTarget([1, 3], deltas)
+        self.assertRaises(ValueError, target.to_deltas, 3)
+        self.assertEqual((4, 3), target.to_deltas(4).shape)
+
+
+class MorphBlenderTestCase(unittest.TestCase):
+    """Test MorphBlender.blend()."""
+
+    def setUp(self):
+        self.base = numpy.arange(15, dtype=float).reshape(5, 3)
+        self.blender = MorphBlender(self.base)
+        self.blender.add_target(MorphTarget([0, 3], [[1, 0, 0], [0, 1, 0]]))
+        self.blender.add_target(MorphTarget([3], [[0, 0, 2]]))
+
+    def test_zero_weights(self):
+        """Ensure zero weights give the base positions."""
+
+        numpy.testing.assert_array_equal(self.base,
+                                         self.blender.blend([0.0, 0.0]))
+
+    def test_matches_dense_sum(self):
+        """Ensure the result matches a dense weighted sum of deltas."""
+
+        weights = [0.5, -1.5]
+        expected = self.base.copy()
+        for target, weight in zip(self.blender.targets, weights):
+            expected += weight * target.to_deltas(5)
+
+        numpy.testing.assert_allclose(expected, self.blender.blend(weights))
+
+    def test_buffer_reused(self):
+        """Ensure the same buffer is returned and reset on every call."""
+
+        first = self.blender.blend([1.0, 1.0])
+        second = self.blender.blend([1.0, 0.0])
+
+        self.assertIs(first, second)
+        numpy.testing.assert_array_equal([9, 11, 11], second[3])
+
+    def test_out_arg(self):
+        """Ensure the result is written into out."""
+
+        out = numpy.empty((5, 3))
+        result = self.blender.blend([0.0, 1.0], out=out)
+
+        self.assertIs(out, result)
+        numpy.testing.assert_array_equal([9, 10, 13], out[3])
+
+    def test_wrong_weight_count(self):
+        """Ensure a ValueError is raised for the wrong number of weights."""
+
+        self.assertRaises(ValueError, self.blender.blend, [1.0])
+
+    def test_target_out_of_range(self):
+        """Ensure targets touching missing vertices are rejected."""
+
+        self.assertRaises(ValueError, self.blender.add_target,
+                          MorphTarget([5], [[0, 0, 1]]))
@@ -0,0 +1,175 @@
+
+import unittest
+
+import numpy
+
+from pedemath.obb import OBB
+from pedemath.obb import obb_array_from_point_sets
+from pedemath.obb import obb_array_overlap
+from pedemath.obb import obb_array_to_rect3_array
+from pedemath.quat import Quat
+from pedemath.quat import quat_array_to_mat44_array
+from pedemath.rect3 import Rect3
+from pedemath.vec3 import scale_v3
+from pedemath.vec3 import Vec3
+
+
+def _rod_points(rng, quat, center, count=500):
+    """Return points spread along a rotated, elongated box."""
+
+    local = rng.uniform(-1, 1, size=(count, 3)) * [5.0, 1.0, 0.25]
+    return quat.rotate_vec_array(local) + center
+
+
+def _random_obbs(rng, count):
+    quats = rng.normal(size=(count, 4))
+    quats /= numpy.linalg.norm(quats, axis=1)[:, None]
+    axes = quat_array_to_mat44_array(quats)[:, :3, :3]
+    return (rng.uniform(-4, 4, size=(count, 3)), axes,
+            rng.uniform(0.2, 2.0, size=(count, 3)))
+
+
+class OBBFromPointsTestCase(unittest.TestCase):
+    """Test fitting OBBs to points."""
+
+    def setUp(self):
+        self.rng = numpy.random.RandomState(12)
+        self.quat = Quat.from_axis_angle_deg(Vec3(1, 2, 3), 40)
+        self.center = numpy.array([3.0, -1.0, 2.0])
+        self.points = _rod_points(self.rng, self.quat, self.center)
+
+    def test_fits_rotated_box(self):
+        """Ensure the fitted axes follow the spread of the points."""
+
+        obb = OBB.from_points(self.points)
+
+        long_axis = self.quat.rotate_vec_array(numpy.array([1.0, 0, 0]))
+        self.assertAlmostEqual(1.0, abs(numpy.dot(obb.axes[0], long_axis)),
+                               places=2)
+        self.assertTrue(obb.half_extents.x > 4.5)
+        self.assertTrue(obb.half_extents.z < 0.5)
+        numpy.testing.assert_allclose(numpy.identity(3),
+                                      numpy.dot(obb.axes, obb.axes.T),
+                                      atol=1e-12)
+        self.assertAlmostEqual(1.0, numpy.linalg.det(obb.axes))
+        # Points on the faces may round just outside.
+        padded = OBB(obb.center, obb.axes,
+                     scale_v3(obb.half_extents, 1.000001))
+        self.assertTrue(padded.contains_points(self.points).all())
+
+    def test_tighter_than_rect3(self):
+        """Ensure the OBB is much smaller than its Rect3 bounds."""
+
+        obb = OBB.from_points(self.points)
+        rect = obb.to_rect3()
+
+        self.assertIsInstance(rect, Rect3)
+        obb_volume = 8.0 * (obb.half_extents.x * obb.half_extents.y *
+                            obb.half_extents.z)
+        self.assertTrue(obb_volume * 2 < rect.width * rect.height *
+                        rect.depth)
+        corners = obb.corners()
+        numpy.testing.assert_allclose([rect.x, rect.y, rect.z],
+                                      corners.min(axis=0))
+
+    def test_rotation(self):
+        """Ensure the axes round trip through a Quat and a Matrix44."""
+
+        obb = OBB.from_points(self.points)
+        copy = OBB(obb.center, obb.get_rot(), obb.half_extents)
+
+        numpy.testing.assert_allclose(obb.axes, copy.axes, atol=1e-6)
+        corner = obb.as_matrix44() * Vec3(1, 1, 1)
+        numpy.testing.assert_allclose(obb.corners()[-1], corner.as_tuple(),
+                                      rtol=1e-5)
+
+    def test_batch(self):
+        """Ensure batches of equal and ragged sets match single fits."""
+
+        sets = [self.points, self.points[:100] * 2.0, self.points[::7] - 3]
+        centers, axes, half_extents = obb_array_from_point_sets(sets)
+
+        for i, points in enumerate(sets):
+            obb = OBB.from_points(points)
+            numpy.testing.assert_allclose(obb.center.as_tuple(), centers[i])
+            numpy.testing.assert_allclose(obb.half_extents.as_tuple(),
+                                          half_extents[i])
+
+        stacked = numpy.stack((self.points[:50], self.points[50:100]))
+        numpy.testing.assert_allclose(
+            obb_array_from_point_sets(list(stacked))[2],
+            obb_array_from_point_sets(stacked)[2])
+
+    def test_empty_set(self):
+        """Ensure an empty point set raises ValueError."""
+
+        self.assertRaises(ValueError, obb_array_from_point_sets,
+                          [self.points, []])
+
+
+class OBBOverlapTestCase(unittest.TestCase):
+    """Test the separating axis overlap tests."""
+
+    def test_axis_aligned(self):
+        """Ensure aligned boxes overlap exactly when their extents do."""
+
+        a = OBB(Vec3(0, 0, 0), numpy.identity(3), Vec3(1, 1, 1))
+        touching = OBB(Vec3(2, 0, 0), numpy.identity(3), Vec3(1, 1, 1))
+        apart = OBB(Vec3(2.1, 0, 0), numpy.identity(3), Vec3(1, 1, 1))
+
+        self.assertTrue(a.overlaps(touching))
+        self.assertFalse(a.overlaps(apart))
+
+    def test_rotated_corner_gap(self):
+        """Ensure a box rotated 45 degrees is separated only once its edge
+        clears the other box.
+        """
+
+        a = OBB(Vec3(0, 0, 0), numpy.identity(3), Vec3(1, 1, 1))
+        rot = Quat.from_axis_angle_deg(Vec3(0, 0, 1), 45)
+        # The rotated box reaches sqrt(2) along x.
+        near = OBB(Vec3(2.3, 0, 0), rot, Vec3(1, 1, 1))
+        far = OBB(Vec3(2.5, 0, 0), rot, Vec3(1, 1, 1))
+
+        self.assertTrue(a.overlaps(near))
+        self.assertFalse(a.overlaps(far))
+
+    def test_matches_sampling(self):
+        """Ensure boxes sharing a sampled point overlap, and all pairs
+        broadcast like the paired test.
+        """
+
+        rng = numpy.random.RandomState(13)
+        centers, axes, half_extents = _random_obbs(rng, 40)
+        overlap = obb_array_overlap(
+            centers[:, None], axes[:, None], half_extents[:, None], centers,
+            axes, half_extents)
+
+        self.assertEqual((40, 40), overlap.shape)
+        self.assertTrue(overlap.diagonal().all())
+        numpy.testing.assert_array_equal(overlap, overlap.T)
+        self.assertTrue(overlap.any() and not overlap.all())
+
+        samples = rng.uniform(-1, 1, size=(1000, 3))
+        points = (centers[:, None] + numpy.einsum(
+            "sk,nk,nkj->nsj", samples, half_extents, axes))
+        for i in range(40):
+            local = numpy.einsum("nij,nsj->nsi", axes,
+                                 points[i] - centers[:, None])
+            inside = (numpy.abs(local) <= half_extents[:, None]).all(-1)
+            shares = inside.any(axis=1)
+            # Sampling can only miss overlaps, never invent them.
+            self.assertFalse((shares & ~overlap[i]).any())
+
+    def test_to_rect3_array(self):
+        """Ensure the Rect3 array bounds every corner."""
+
+        rng = numpy.random.RandomState(14)
+        centers, axes, half_extents = _random_obbs(rng, 10)
+        boxes = obb_array_to_rect3_array(centers, axes, half_extents)
+
+        for i in range(10):
+            corners = OBB(centers[i], axes[i], half_extents[i]).corners()
+            numpy.testing.assert_allclose(corners.min(axis=0), boxes[i, :3])
+            numpy.testing.assert_allclose(corners.max(axis=0) -
+                                          corners.min(axis=0), boxes[i, 3:])
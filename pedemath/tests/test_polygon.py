@@ -0,0 +1,168 @@
+import unittest
+
+import numpy
+
+from pedemath.polygon import points_in_polygons
+from pedemath.polygon import Polygon
+from pedemath.rect import Rect
+from pedemath.vec2 import Vec2
+
+# An L shape, counter-clockwise.
+L_SHAPE = [Vec2(0, 0), Vec2(4, 0), Vec2(4, 2), Vec2(2, 2), Vec2(2, 4),
+           Vec2(0, 4)]
+
+
+def _wavy_circle(count, seed=0):
+    angles = numpy.linspace(0, 2 * numpy.pi, count, endpoint=False)
+    radii = 1 + 0.1 * numpy.sin(angles * 40) + 0.01 * (
+        numpy.random.RandomState(seed).rand(count))
+    return numpy.column_stack([radii * numpy.cos(angles),
+                               radii * numpy.sin(angles)])
+
+
+class PolygonTestCase(unittest.TestCase):
+    """Test Polygon's measurements."""
+
+    def test_init(self):
+        """Ensure a repeated closing vertex is dropped and too few vertices
+        raise ValueError.
+        """
+
+        polygon = Polygon(L_SHAPE + [L_SHAPE[0]])
+        self.assertEqual(6, len(polygon))
+        numpy.testing.assert_array_equal([4, 2], polygon.coords[2])
+
+        self.assertRaises(ValueError, Polygon, [Vec2(0, 0), Vec2(1, 1)])
+
+    def test_area_and_winding(self):
+        """Ensure the signed area is positive counter-clockwise and
+        negative clockwise.
+        """
+
+        polygon = Polygon(L_SHAPE)
+        self.assertEqual(12.0, polygon.signed_area())
+        self.assertEqual(1, polygon.winding())
+
+        backwards = Polygon(L_SHAPE[::-1])
+        self.assertEqual(-12.0, backwards.signed_area())
+        self.assertEqual(12.0, backwards.area())
+        self.assertEqual(-1, backwards.winding())
+
+        flat = Polygon([Vec2(0, 0), Vec2(1, 1), Vec2(2, 2)])
+        self.assertEqual(0, flat.winding())
+
+    def test_centroid(self):
+        """Ensure the centroid is the area weighted center, for either
+        winding and far from the origin.
+        """
+
+        # Three 2x2 squares centered at (1, 1), (3, 1) and (1, 3).
+        expected = Vec2(5.0 / 3, 5.0 / 3)
+        for offset in (0, 1e6):
+            shifted = [point + offset for point in L_SHAPE]
+            for points in (shifted, shifted[::-1]):
+                centroid = Polygon(points).centroid()
+                self.assertAlmostEqual(expected.x + offset, centroid.x, 6)
+                self.assertAlmostEqual(expected.y + offset, centroid.y, 6)
+
+        flat = Polygon([Vec2(0, 0), Vec2(1, 1), Vec2(2, 2)])
+        self.assertRaises(ValueError, flat.centroid)
+
+    def test_bounds(self):
+        """Ensure bounds returns the Rect around the vertices."""
+
+        self.assertEqual(Rect(0, 0, 4, 4), Polygon(L_SHAPE).bounds())
+
+
+class PolygonContainsTestCase(unittest.TestCase):
+    """Test Polygon.contains_points() with and without a grid."""
+
+    def test_l_shape(self):
+        """Ensure points in the notch and outside the bounds are
+        outside.
+        """
+
+        points = [Vec2(1, 1), Vec2(3, 1), Vec2(1, 3), Vec2(3, 3),
+                  Vec2(-1, 1), Vec2(1, 5)]
+        expected = [True, True, True, False, False, False]
+
+        polygon = Polygon(L_SHAPE)
+        numpy.testing.assert_array_equal(expected,
+                                         polygon.contains_points(points))
+        self.assertTrue(polygon.contains_point(Vec2(1, 1)))
+        self.assertFalse(polygon.contains_point((3, 3)))
+
+        for cells in (1, 2, 3, 5):
+            polygon.build_grid(cells)
+            numpy.testing.assert_array_equal(
+                expected, polygon.contains_points(points))
+
+    def test_grid_matches(self):
+        """Ensure the grid gives the same answers as testing every edge,
+        including for points on grid lines and vertices.
+        """
+
+        polygon = Polygon(L_SHAPE)
+        points = numpy.mgrid[-1:6, -1:6].reshape(2, -1).T * 0.5
+        expected = polygon.contains_points(points, block_size=10)
+        for cells in (1, 2, 3, 4, 8):
+            numpy.testing.assert_array_equal(
+                expected, Polygon(L_SHAPE).build_grid(cells).contains_points(
+                    points))
+
+        rng = numpy.random.RandomState(1)
+        polygon = Polygon(_wavy_circle(500))
+        points = rng.rand(3000, 2) * 2.4 - 1.2
+        expected = polygon.contains_points(points)
+        self.assertTrue(0 < expected.sum() < len(points))
+        numpy.testing.assert_array_equal(
+            expected, polygon.build_grid().contains_points(points))
+
+    def test_grid_matches_on_lattice(self):
+        """Ensure the grid gives the same answers as testing every edge when
+        edges pass exactly through cell centers and leg corners.
+        """
+
+        points = numpy.mgrid[-20:21, -20:21].reshape(2, -1).T / 8.0
+        polygons = [[[-0.5, 2.25], [-1.0, -1.25], [1.0, -0.25]]]
+        rng = numpy.random.RandomState(3)
+        while len(polygons) < 200:
+            coords = rng.randint(-8, 9, (rng.randint(3, 9), 2)) / 4.0
+            if len(numpy.unique(coords, axis=0)) == len(coords):
+                polygons.append(coords)
+
+        for coords in polygons:
+            expected = Polygon(coords).contains_points(points)
+            for cells in (1, 2, 3, 4, 5, 8):
+                numpy.testing.assert_array_equal(
+                    expected,
+                    Polygon(coords).build_grid(cells).contains_points(points))
+
+    def test_winding_ignored(self):
+        """Ensure clockwise polygons contain the same points."""
+
+        points = numpy.random.RandomState(2).rand(500, 2) * 2.4 - 1.2
+        coords = _wavy_circle(100)
+        numpy.testing.assert_array_equal(
+            Polygon(coords).contains_points(points),
+            Polygon(coords[::-1]).contains_points(points))
+
+
+class PointsInPolygonsTestCase(unittest.TestCase):
+    """Test points_in_polygons()."""
+
+    def test_points_in_polygons(self):
+        """Ensure each polygon reports the points it contains."""
+
+        polygons = [Polygon(L_SHAPE),
+                    Polygon([point + 3 for point in L_SHAPE]).build_grid()]
+        points = [Vec2(1, 1), Vec2(3.5, 3.5), Vec2(10, 10), Vec2(4, 4.5),
+                  Vec2(2.5, 2.5)]
+
+        point_indices, polygon_indices = points_in_polygons(polygons,
+                                                            points)
+        numpy.testing.assert_array_equal([0, 1, 3], point_indices)
+        numpy.testing.assert_array_equal([0, 1, 1], polygon_indices)
+
+        point_indices, polygon_indices = points_in_polygons([], points)
+        self.assertEqual(0, len(point_indices))
@@ -0,0 +1,166 @@
+import unittest
+
+import numpy
+
+from pedemath.polyline import arc_length_array
+from pedemath.polyline import resample_polyline
+from pedemath.polyline import simplify_douglas_peucker
+from pedemath.polyline import simplify_visvalingam
+from pedemath.vec2 import Vec2
+from pedemath.vec3 import Vec3
+
+
+def _douglas_peucker_recursive(points, tolerance, first, last, keep):
+    segment = points[last] - points[first]
+    length_sq = segment.dot(segment)
+    offsets = points[first + 1:last] - points[first]
+    if not len(offsets):
+        return
+    t = numpy.clip(offsets.dot(segment) / (length_sq or 1.0), 0.0, 1.0)
+    dists = numpy.linalg.norm(offsets - segment * t[:, None], axis=1)
+    furthest = first + 1 + dists.argmax()
+    if dists.max() > tolerance:
+        keep.add(furthest)
+        _douglas_peucker_recursive(points, tolerance, first, furthest, keep)
+        _douglas_peucker_recursive(points, tolerance, furthest, last, keep)
+
+
+def _visvalingam_slow(points, min_area):
+    """Remove the smallest effective area point, recomputing everything
+    each time.
+    """
+
+    indices = list(range(len(points)))
+    last_area = 0.0
+    effective = {}
+    while len(indices) > 2:
+        areas = []
+        for k in range(1, len(indices) - 1):
+            a, b, c = points[indices[k - 1:k + 2]]
+            area = abs(numpy.cross(numpy.append(b - a, 0),
+                                   numpy.append(c - a, 0))[2]) * 0.5
+            areas.append(max(area, effective.get(indices[k], 0.0)))
+        smallest = int(numpy.argmin(areas))
+        area = max(areas[smallest], last_area)
+        if area >= min_area:
+            break
+        # The neighbors of the removed point can't go below its area.
+        for neighbor in (indices[smallest], indices[smallest + 2]):
+            effective[neighbor] = area
+        last_area = area
+        del indices[smallest + 1]
+    return indices
+
+
+class ArcLengthTestCase(unittest.TestCase):
+    """Test arc_length_array() and resample_polyline()."""
+
+    def test_arc_length(self):
+        """Ensure lengths accumulate along Vec3 points."""
+
+        points = [Vec3(0, 0, 0), Vec3(3, 4, 0), Vec3(3, 4, 0), Vec3(3, 4, 2)]
+        numpy.testing.assert_array_almost_equal(
+            [0, 5, 5, 7], arc_length_array(points))
+
+        self.assertRaises(ValueError, arc_length_array, [1, 2, 3])
+
+    def test_resample(self):
+        """Ensure points are evenly spaced along the polyline, ending with
+        its last point, across corners and repeated points.
+        """
+
+        points = [Vec2(0, 0), Vec2(2, 0), Vec2(2, 0), Vec2(2, 3)]
+        numpy.testing.assert_array_almost_equal(
+            [[0, 0], [1.5, 0], [2, 1], [2, 2.5], [2, 3]],
+            resample_polyline(points, 1.5))
+
+        numpy.testing.assert_array_almost_equal(
+            [[0, 0], [2, 0], [2, 2]],
+            resample_polyline([[0, 0], [2, 0], [2, 2]], 2.0))
+
+    def test_resample_short(self):
+        """Ensure single points and zero length polylines resample to their
+        first point, and spacing must be positive.
+        """
+
+        numpy.testing.assert_array_equal(
+            [[1, 1]], resample_polyline([[1, 1]], 1.0))
+        numpy.testing.assert_array_equal(
+            [[1, 1]], resample_polyline([[1, 1], [1, 1]], 1.0))
+        self.assertRaises(ValueError, resample_polyline, [[0, 0], [1, 1]],
+                          0.0)
+
+
+class SimplifyTestCase(unittest.TestCase):
+    """Test simplify_douglas_peucker() and simplify_visvalingam()."""
+
+    def test_douglas_peucker(self):
+        """Ensure a zigzag keeps only its corners, and tolerance can't be
+        negative.
+        """
+
+        points = [Vec2(0, 0), Vec2(1, 0.1), Vec2(2, 0), Vec2(3, 3),
+                  Vec2(4, 0), Vec2(5, -0.05), Vec2(6, 0)]
+        numpy.testing.assert_array_equal(
+            [0, 2, 3, 4, 6],
+            simplify_douglas_peucker(points, 0.2, return_indices=True))
+        numpy.testing.assert_array_equal(
+            [[0, 0], [3, 3], [6, 0]], simplify_douglas_peucker(points, 2.0))
+        self.assertRaises(ValueError, simplify_douglas_peucker, points,
+                          -0.1)
+
+    def test_douglas_peucker_matches_recursive(self):
+        """Ensure random 2D and 3D walks match the recursive algorithm."""
+
+        rng = numpy.random.RandomState(5)
+        for dims in (2, 3):
+            for tolerance in (0.5, 2.0):
+                points = numpy.cumsum(rng.randn(300, dims), axis=0)
+                keep = {0, len(points) - 1}
+                _douglas_peucker_recursive(points, tolerance, 0,
+                                           len(points) - 1, keep)
+                numpy.testing.assert_array_equal(
+                    sorted(keep), simplify_douglas_peucker(
+                        points, tolerance, return_indices=True))
+
+    def test_visvalingam(self):
+        """Ensure small triangles are removed first, up to min_area or
+        down to count points.
+        """
+
+        points = [Vec2(0, 0), Vec2(1, 0.1), Vec2(2, 0), Vec2(3, 3),
+                  Vec2(4, 0), Vec2(5, -0.05), Vec2(6, 0)]
+        numpy.testing.assert_array_equal(
+            [0, 2, 3, 4, 6],
+            simplify_visvalingam(points, 0.11, return_indices=True))
+        numpy.testing.assert_array_equal(
+            [[0, 0], [3, 3], [6, 0]],
+            simplify_visvalingam(points, count=3))
+        self.assertEqual(7, len(simplify_visvalingam(points)))
+
+    def test_visvalingam_matches_slow(self):
+        """Ensure a random walk matches removing points one by one."""
+
+        points = numpy.cumsum(numpy.random.RandomState(6).randn(80, 2),
+                              axis=0)
+        numpy.testing.assert_array_equal(
+            _visvalingam_slow(points, 1.0),
+            simplify_visvalingam(points, 1.0, return_indices=True))
+
+    def test_visvalingam_3d(self):
+        """Ensure 3D areas use the full cross product."""
+
+        points = [Vec3(0, 0, 0), Vec3(1, 0, 1), Vec3(2, 0, 0),
+                  Vec3(3, 0, 0.1), Vec3(4, 0, 0)]
+        numpy.testing.assert_array_equal(
+            [0, 1, 2, 4],
+            simplify_visvalingam(points, 0.5, return_indices=True))
+
+    def test_short(self):
+        """Ensure polylines of fewer than three points are unchanged."""
+
+        for simplify in (simplify_douglas_peucker, simplify_visvalingam):
+            numpy.testing.assert_array_equal(
+                [[0, 0], [1, 1]], simplify([[0, 0], [1, 1]], 1.0))
+            numpy.testing.assert_array_equal(
+                [0], simplify([[0, 0]], 1.0, return_indices=True))
@@ -0,0 +1,77 @@
+
+import unittest
+
+import numpy
+
+from pedemath.matrix import Matrix44
+from pedemath.projection import clip_v3_array
+from pedemath.projection import project_v3_array
+from pedemath.rect import Rect
+from pedemath.vec3 import Vec3
+
+
+class ClipV3ArrayTestCase(unittest.TestCase):
+    """Test clip_v3_array()."""
+
+    def test_matches_matrix44_mul(self):
+        """Ensure x, y, z match Matrix44 * Vec3 for an affine matrix."""
+
+        mat = Matrix44.from_trans(Vec3(1, 2, 3)) * Matrix44.from_rot_x(40)
+        clip = clip_v3_array(mat, [(1, 1, 1), (-2, 0, 5)])
+
+        self.assertTrue((mat * Vec3(-2, 0, 5)).almost_equal(
+            Vec3(*clip[1, :3]), places=5))
+        numpy.testing.assert_array_equal([1, 1], clip[:, 3])
+
+
+class ProjectV3ArrayTestCase(unittest.TestCase):
+    """Test project_v3_array()."""
+
+    def setUp(self):
+        proj = Matrix44.from_perspective_deg(90, 2.0, 1.0, 101.0)
+        view = Matrix44.from_look_at(Vec3(0, 0, 10), Vec3(0, 0, 0),
+                                     Vec3(0, 1, 0))
+        self.mvp = proj * view
+        self.viewport = Rect(0, 0, 800, 400)
+
+    def test_center(self):
+        """Ensure the point being looked at is in the viewport center."""
+
+        screen, depth, clipped = project_v3_array(
+            self.mvp, [(0, 0, 0)], self.viewport)
+
+        numpy.testing.assert_allclose([[400, 200]], screen, atol=1e-4)
+        self.assertTrue(0.0 < depth[0] < 1.0)
+        self.assertFalse(clipped[0])
+
+    def test_edges(self):
+        """Ensure points on the fov edges map to the viewport edges."""
+
+        screen, _, _ = project_v3_array(
+            self.mvp, [(20, 10, 0), (-20, -10, 0)], (0, 0, 800, 400))
+        numpy.testing.assert_allclose([[800, 400], [0, 0]], screen,
+                                      atol=1e-3)
+
+    def test_flip_y(self):
+        """Ensure flip_y puts the top of the view at y 0."""
+
+        screen, _, _ = project_v3_array(
+            self.mvp, [(0, 10, 0)], (10, 20, 800, 400), flip_y=True)
+        numpy.testing.assert_allclose([[410, 20]], screen, atol=1e-3)
+
+    def test_depth(self):
+        """Ensure the near and far planes give depths 0 and 1."""
+
+        _, depth, clipped = project_v3_array(
+            self.mvp, [(0, 0, 9), (0, 0, -91)], self.viewport)
+
+        numpy.testing.assert_allclose([0, 1], depth, atol=1e-5)
+
+    def test_clipped(self):
+        """Ensure points outside the clip volume are flagged."""
+
+        points = [(0, 0, 0), (50, 0, 0), (0, 0, 9.5), (0, 0, -200),
+                  (0, 0, 20), (0, 0, 10)]
+        _, _, clipped = project_v3_array(self.mvp, points, self.viewport)
+
+        self.assertEqual([False, True, True, True, True, True], list(clipped))
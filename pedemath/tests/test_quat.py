@@ -2,8 +2,17 @@
 import math
 import unittest
 
+import numpy
+
 from pedemath.matrix import Matrix44
+from pedemath.quat import axis_angle_deg_to_quat_array
+from pedemath.quat import euler_deg_to_quat_array
+from pedemath.quat import euler_rad_to_quat_array
+from pedemath.quat import mat44_array_to_quat_array
 from pedemath.quat import Quat
+from pedemath.quat import quat_array_to_euler_deg
+from pedemath.quat import quat_array_to_mat44_array
+from pedemath.quat import rot_from_vectors_quat_array
 from pedemath.vec3 import Vec3
 
 
@@ -130,6 +139,19 @@ class TestAsMatrix44TestCase(unittest.TestCase):
                 self.assertAlmostEqual(mat.data[j][i],
                                        mat_from_quat.data[j][i])
 
+    def test_as_rot_mat33(self):
+        """Ensure the rows are the rotated axes, as in as_matrix44()."""
+
+        quat = Quat.from_axis_angle_deg(Vec3(1, 2, 3), 70.)
+        mat33 = quat.as_rot_mat33()
+
+        numpy.testing.assert_array_almost_equal(
+            numpy.array(quat.as_matrix44().data)[:3, :3], mat33)
+        for i in range(3):
+            axis = Vec3(*numpy.eye(3)[i])
+            numpy.testing.assert_array_almost_equal(
+                list(quat.rotate_vec(axis)), mat33[i])
+
 
 class RotateVecTestCase(unittest.TestCase):
     """Test Quat.rotate_vec."""
@@ -187,6 +209,42 @@ class RotateVecTestCase(unittest.TestCase):
     # TODO: more rotate_vec angles tested?
 
 
+class RotateVecArrayTestCase(unittest.TestCase):
+    """Test Quat.rotate_vec_array()."""
+
+    def setUp(self):
+        self.quat = Quat.from_axis_angle_deg(Vec3(1, -2, 3), 65)
+        self.vecs = [Vec3(1, 0, 0), Vec3(0, 2, 0), Vec3(3, -4, 5),
+                     Vec3(-0.5, 0.25, 8)]
+
+    def test_matches_rotate_vec(self):
+        """Ensure the results match rotate_vec()."""
+
+        result = self.quat.rotate_vec_array(self.vecs)
+
+        self.assertEqual((4, 3), result.shape)
+        for vec, row in zip(self.vecs, result):
+            self.assertTrue(self.quat.rotate_vec(vec).almost_equal(
+                Vec3(*row)))
+
+    def test_single_vec(self):
+        """Ensure a single vector array works."""
+
+        result = self.quat.rotate_vec_array([self.vecs[2]])
+        self.assertTrue(self.quat.rotate_vec(self.vecs[2]).almost_equal(
+            Vec3(*result[0])))
+
+    def test_out(self):
+        """Ensure the result is stored in out."""
+
+        out = numpy.empty((4, 3))
+        result = self.quat.rotate_vec_array(self.vecs, out=out)
+
+        self.assertIs(out, result)
+        self.assertTrue(self.quat.rotate_vec(self.vecs[3]).almost_equal(
+            Vec3(*out[3])))
+
+
 class FromMatrix44TestCase(unittest.TestCase):
     """Test Quat.from_matrix44()."""
 
@@ -319,3 +377,155 @@ class TestEquality(unittest.TestCase):
         self.assertTrue(test_int != Quat(1, 2, 3, 4))
         self.assertFalse(test_str == Quat(1, 2, 3, 4))
         self.assertTrue(test_str != Quat(1, 2, 3, 4))
+
+
+class FromEulerTestCase(unittest.TestCase):
+    """Test Quat.from_euler_rad() and euler_rad_to_quat_array()."""
+
+    def test_inverse_of_to_euler_rad(self):
+        """Ensure the quat is rebuilt from to_euler_rad() angles."""
+
+        quat = Quat.from_axis_angle_deg(Vec3(1, 2, 3), 50)
+        AssertQuatAlmostEqual(
+            quat, Quat.from_euler_rad(quat.to_euler_rad()), self)
+
+    def test_matches_matrix(self):
+        """Ensure rotating by the quat matches the euler rotation matrix."""
+
+        rot = (20, -70, 135)
+        vec = Vec3(1, 2, 3)
+        for order in ("xyz", "zyx", "yxz"):
+            self.assertTrue(
+                (Matrix44.from_euler_deg(rot, order) * vec).almost_equal(
+                    Quat.from_euler_deg(rot, order).rotate_vec(vec),
+                    places=5))
+
+    def test_array_round_trip(self):
+        """Ensure a batch of to_euler_rad() results converts back."""
+
+        quats = [Quat.from_axis_angle_deg(Vec3(1, 0, 0), 30),
+                 Quat.from_axis_angle_deg(Vec3(0, 1, 1), -60),
+                 Quat.from_axis_angle_deg(Vec3(1, 1, 1), 120)]
+        eulers = [quat.to_euler_rad().as_tuple() for quat in quats]
+
+        result = euler_rad_to_quat_array(eulers)
+        expected = [[q.x, q.y, q.z, q.w] for q in quats]
+        numpy.testing.assert_allclose(expected, result, atol=1e-12)
+
+    def test_deg_array(self):
+        """Ensure degrees are converted."""
+
+        result = euler_deg_to_quat_array([[0, 0, 90]])
+        numpy.testing.assert_allclose(
+            [[0, 0, math.sqrt(0.5), math.sqrt(0.5)]], result, atol=1e-12)
+
+
+def _quat_rows(quats):
+    return numpy.array([[q.x, q.y, q.z, q.w] for q in quats])
+
+
+class QuatArrayConversionTestCase(unittest.TestCase):
+    """Test the batched Quat conversions against the scalar versions."""
+
+    def setUp(self):
+        # Include 180 degree rotations to reach every matrix trace branch.
+        self.quats = [
+            Quat.from_axis_angle_deg(Vec3(1, 2, 3), 40),
+            Quat.from_axis_angle_deg(Vec3(0, 1, 0), -100),
+            Quat.from_axis_angle_deg(Vec3(1, 0.2, 0), 180),
+            Quat.from_axis_angle_deg(Vec3(0.1, 1, 0.2), 180),
+            Quat.from_axis_angle_deg(Vec3(0, 0.3, 1), 180),
+        ]
+        self.quat_array = _quat_rows(self.quats)
+
+    def test_to_mat44_array(self):
+        """Ensure each matrix matches Quat.as_matrix44()."""
+
+        mats = quat_array_to_mat44_array(self.quat_array)
+        for quat, data in zip(self.quats, mats):
+            numpy.testing.assert_allclose(quat.as_matrix44().data, data,
+                                          atol=1e-6)
+
+    def test_from_mat44_array_all_branches(self):
+        """Ensure matrices convert back to the same rotation for each trace
+        branch.
+        """
+
+        mats = quat_array_to_mat44_array(self.quat_array)
+        result = mat44_array_to_quat_array(mats)
+
+        numpy.testing.assert_allclose(
+            mats, quat_array_to_mat44_array(result), atol=1e-12)
+        # q and -q are the same rotation.
+        signs = numpy.sign(numpy.sum(result * self.quat_array, axis=-1))
+        numpy.testing.assert_allclose(self.quat_array, result * signs[:, None],
+                                      atol=1e-12)
+
+    def test_from_mat44_array_matches_scalar(self):
+        """Ensure the result matches Quat.from_matrix44()."""
+
+        mats = [quat.as_matrix44() for quat in self.quats]
+        result = mat44_array_to_quat_array([mat.data for mat in mats])
+
+        numpy.testing.assert_allclose(
+            _quat_rows([Quat.from_matrix44(mat) for mat in mats]), result,
+            atol=1e-6)
+
+    def test_to_euler_deg(self):
+        """Ensure each row matches Quat.to_euler_deg()."""
+
+        result = quat_array_to_euler_deg(self.quat_array[:2])
+        for quat, row in zip(self.quats, result):
+            self.assertTrue(quat.to_euler_deg(Vec3(0, 0, 0)).almost_equal(
+                Vec3(*row)))
+
+    def test_from_axis_angle_deg(self):
+        """Ensure each row matches Quat.from_axis_angle_deg()."""
+
+        axes = [(1, 2, 3), (0, 1, 0), (0, 0, 5)]
+        angles = [40, -100, 180]
+        result = axis_angle_deg_to_quat_array(axes, angles)
+
+        expected = _quat_rows([Quat.from_axis_angle_deg(Vec3(*axis), angle)
+                               for axis, angle in zip(axes, angles)])
+        numpy.testing.assert_allclose(expected, result, atol=1e-12)
+
+
+class RotFromVectorsTestCase(unittest.TestCase):
+    """Test Quat.rot_from_vectors() and rot_from_vectors_quat_array()."""
+
+    def test_rotates_start_to_end(self):
+        """Ensure start_vec is rotated onto the direction of end_vec."""
+
+        quat = Quat.rot_from_vectors(Vec3(1, 2, 3), Vec3(-4, 0, 1))
+        expected = Vec3(-4, 0, 1).normalize().scale(Vec3(1, 2, 3).length())
+
+        self.assertTrue(expected.almost_equal(
+            quat.rotate_vec(Vec3(1, 2, 3))))
+
+    def test_matches_axis_angle(self):
+        """Ensure the rotation is the shortest arc."""
+
+        quat = Quat.rot_from_vectors(Vec3(0, 0, 1), Vec3(0, 1, 0))
+        AssertQuatAlmostEqual(
+            Quat.from_axis_angle_deg(Vec3(-1, 0, 0), 90), quat, self)
+
+    def test_antiparallel(self):
+        """Ensure opposite vectors give a 180 degree rotation."""
+
+        for vec in (Vec3(0, 1, 0), Vec3(1, 1, 0), Vec3(-2, 5, 3)):
+            quat = Quat.rot_from_vectors(vec, -vec)
+            self.assertAlmostEqual(0.0, quat.w)
+            self.assertTrue((-vec).almost_equal(quat.rotate_vec(vec)))
+
+    def test_array(self):
+        """Ensure the array version matches the matrix version."""
+
+        starts = [(1, 0, 0), (0, 1, 0), (1, 1, 1), (0, 0, 2)]
+        ends = [(0, 1, 0), (0, -3, 0), (1, 1, 1), (1, 2, 3)]
+        quats = rot_from_vectors_quat_array(starts, ends)
+
+        numpy.testing.assert_allclose(
+            [Matrix44.rot_from_vectors(Vec3(*start), Vec3(*end)).data
+             for start, end in zip(starts, ends)],
+            quat_array_to_mat44_array(quats), atol=1e-6)
@@ -0,0 +1,131 @@
+
+import unittest
+
+import numpy
+
+from pedemath.bounds import rect3_list_to_array
+from pedemath.ray import RayBatch
+from pedemath.ray import slab_test_min_max
+from pedemath.rect3 import Rect3
+
+
+class RayBatchTestCase(unittest.TestCase):
+    """Test RayBatch construction."""
+
+    def test_from_segments(self):
+        """Ensure segments end at t 1."""
+
+        rays = RayBatch.from_segments([(0, 0, 0), (1, 1, 1)],
+                                      [(2, 0, 0), (1, 1, 5)])
+
+        self.assertEqual(2, len(rays))
+        numpy.testing.assert_array_equal([[2, 0, 0], [1, 1, 5]],
+                                         rays.point_at([1, 1]))
+
+
+class IntersectRect3ArrayTestCase(unittest.TestCase):
+    """Test RayBatch.intersect_rect3_array() with one box per ray."""
+
+    def setUp(self):
+        self.box = Rect3(0, 0, 0, 1, 1, 1)
+        self.boxes = rect3_list_to_array([self.box] * 4)
+
+    def test_entry_distance(self):
+        """Ensure the entry distance is where the ray reaches the box."""
+
+        rays = RayBatch([(-2, 0.5, 0.5), (0.5, 0.5, 5), (0.5, 0.5, 0.5),
+                         (2, 0.5, 0.5)],
+                        [(1, 0, 0), (0, 0, -2), (0, 1, 0), (1, 0, 0)])
+        hit, t_entry = rays.intersect_rect3_array(self.boxes)
+
+        self.assertEqual([True, True, True, False], list(hit))
+        numpy.testing.assert_allclose([2, 2, 0, numpy.inf], t_entry)
+
+    def test_t_max(self):
+        """Ensure boxes beyond t_max are missed."""
+
+        rays = RayBatch.from_segments([(-2, 0.5, 0.5), (-2, 0.5, 0.5)],
+                                      [(-0.5, 0.5, 0.5), (0.5, 0.5, 0.5)])
+        hit, _ = rays.intersect_rect3_array(self.boxes[:2])
+
+        self.assertEqual([False, True], list(hit))
+
+    def test_half_open_faces(self):
+        """Ensure grazing a min face hits and grazing a max face misses, like
+        Rect3.collidepoint().
+        """
+
+        origins = [(-1, 0, 0.5), (-1, 1, 0.5), (0.5, 0.5, 1), (0, 0, -1)]
+        directions = [(1, 0, 0), (1, 0, 0), (1, 0, 0), (0, 0, 1)]
+        rays = RayBatch(origins, directions)
+        hit, _ = rays.intersect_rect3_array(self.boxes)
+
+        self.assertEqual([True, False, False, True], list(hit))
+        self.assertTrue(self.box.collidepoint((0.5, 0, 0.5)))
+        self.assertFalse(self.box.collidepoint((0.5, 1, 0.5)))
+
+    def test_origin_on_max_face(self):
+        """Ensure a ray leaving from a max face misses, and a ray leaving
+        from a min face into the box hits at 0.
+        """
+
+        rays = RayBatch([(1, 0.5, 0.5), (0, 0.5, 0.5)],
+                        [(1, 0, 0), (1, 0, 0)])
+        hit, t_entry = rays.intersect_rect3_array(self.boxes[:2])
+
+        self.assertEqual([False, True], list(hit))
+        self.assertEqual(0, t_entry[1])
+
+    def test_zero_size_box(self):
+        """Ensure boxes with no volume are never hit."""
+
+        rays = RayBatch([(-1, 0.5, 0.5)], [(1, 0, 0)])
+        hit, _ = rays.intersect_rect3_array([(0, 0, 0, 1, 0, 1)])
+
+        self.assertFalse(hit[0])
+
+
+class SlabTestMinMaxTestCase(unittest.TestCase):
+    """Test slab_test_min_max()."""
+
+    def test_closed(self):
+        """Ensure rays along a max face only hit closed boxes."""
+
+        origins = numpy.array([[-1.0, 1.0, 0.5], [-1.0, 0.5, 0.5]])
+        directions = numpy.array([[1.0, 0.0, 0.0], [1.0, 0.0, 0.0]])
+        with numpy.errstate(divide="ignore"):
+            inv_dirs = 1.0 / directions
+        args = (origins, directions, inv_dirs, numpy.array([5.0, 5.0]),
+                numpy.zeros(3), numpy.ones(3))
+
+        hit, t_entry = slab_test_min_max(*args)
+        numpy.testing.assert_array_equal([False, True], hit)
+        numpy.testing.assert_array_equal([numpy.inf, 1.0], t_entry)
+
+        hit, t_entry = slab_test_min_max(*args, closed=True)
+        numpy.testing.assert_array_equal([True, True], hit)
+        numpy.testing.assert_array_equal([1.0, 1.0], t_entry)
+
+
+class IntersectRect3ArrayAllTestCase(unittest.TestCase):
+    """Test RayBatch.intersect_rect3_array_all()."""
+
+    def test_matches_paired(self):
+        """Ensure every pair matches the paired test."""
+
+        rng = numpy.random.RandomState(11)
+        rays = RayBatch(rng.uniform(-5, 5, size=(30, 3)),
+                        rng.normal(size=(30, 3)))
+        boxes = numpy.concatenate((rng.uniform(-5, 5, size=(20, 3)),
+                                   rng.uniform(0.5, 3, size=(20, 3))),
+                                  axis=1)
+
+        hit, t_entry = rays.intersect_rect3_array_all(boxes, block_size=7)
+
+        self.assertEqual((30, 20), hit.shape)
+        self.assertTrue(hit.any())
+        for j in range(20):
+            paired_hit, paired_t = rays.intersect_rect3_array(
+                numpy.repeat(boxes[j:j + 1], 30, axis=0))
+            numpy.testing.assert_array_equal(paired_hit, hit[:, j])
+            numpy.testing.assert_array_equal(paired_t, t_entry[:, j])
@@ -0,0 +1,184 @@
+import unittest
+
+import numpy
+
+from pedemath.segment import intersect_segments_2d_array
+from pedemath.segment import segment_intersections_2d_all
+from pedemath.segment import segment_intersections_2d_sweep
+from pedemath.vec2 import Vec2
+
+
+class IntersectSegments2DArrayTestCase(unittest.TestCase):
+    """Test intersect_segments_2d_array()."""
+
+    def test_crossing_and_missing(self):
+        """Ensure crossing segments hit at their crossing point and others
+        miss with nan points.
+        """
+
+        hit, points = intersect_segments_2d_array(
+            [[0, 0], [0, 0], [0, 0]], [[2, 2], [1, 0], [1, 1]],
+            [[0, 2], [0, 1], [2, 0]], [[2, 0], [1, 1], [0, 2]])
+
+        numpy.testing.assert_array_equal([True, False, True], hit)
+        numpy.testing.assert_array_almost_equal([1, 1], points[0])
+        self.assertTrue(numpy.isnan(points[1]).all())
+        numpy.testing.assert_array_almost_equal([1, 1], points[2])
+
+    def test_touching(self):
+        """Ensure segments touching at an endpoint intersect there."""
+
+        hit, points = intersect_segments_2d_array(
+            [[0, 0], [0, 0]], [[2, 0], [2, 0]], [[1, 0], [2, 0]],
+            [[1, 3], [5, 5]])
+
+        numpy.testing.assert_array_equal([True, True], hit)
+        numpy.testing.assert_array_equal([[1, 0], [2, 0]], points)
+
+    def test_collinear(self):
+        """Ensure collinear segments intersect at the start of their
+        overlap along the first segment, and miss if they don't overlap.
+        """
+
+        hit, points = intersect_segments_2d_array(
+            [[0, 0], [4, 0], [0, 0], [0, 0]],
+            [[4, 0], [0, 0], [1, 1], [1, 0]],
+            [[3, 0], [1, 0], [3, 3], [2, 0]],
+            [[1, 0], [3, 0], [2, 2], [3, 0]])
+
+        numpy.testing.assert_array_equal([True, True, False, False], hit)
+        numpy.testing.assert_array_equal([[1, 0], [3, 0]], points[:2])
+
+    def test_zero_length(self):
+        """Ensure zero length segments intersect only where they lie on the
+        other segment.
+        """
+
+        hit, _ = intersect_segments_2d_array(
+            [[1, 0], [1, 1], [2, 2], [2, 2]], [[1, 0], [1, 1], [2, 2],
+                                               [2, 2]],
+            [[0, 0], [0, 0], [2, 2], [2, 3]], [[2, 0], [2, 0], [2, 2],
+                                               [2, 3]])
+
+        numpy.testing.assert_array_equal([True, False, True, False], hit)
+
+    def test_ignore_shared_endpoints(self):
+        """Ensure polyline neighbors are ignored, but crossings, T junctions
+        and overlaps are not.
+        """
+
+        starts_a = [[0, 0], [0, 0], [0, 0], [0, 0]]
+        ends_a = [[1, 0], [2, 0], [1, 0], [2, 0]]
+        starts_b = [[1, 0], [1, 0], [1, 0], [2, 0]]
+        ends_b = [[1, 1], [1, 1], [3, 0], [1, 0]]
+
+        hit, _ = intersect_segments_2d_array(starts_a, ends_a, starts_b,
+                                             ends_b)
+        numpy.testing.assert_array_equal([True, True, True, True], hit)
+
+        hit, _ = intersect_segments_2d_array(starts_a, ends_a, starts_b,
+                                             ends_b, True)
+        numpy.testing.assert_array_equal([False, True, False, True], hit)
+
+
+class SegmentIntersections2DTestCase(unittest.TestCase):
+    """Test segment_intersections_2d_all() and
+    segment_intersections_2d_sweep().
+    """
+
+    def _brute_force(self, starts, ends, ignore_shared_endpoints=False):
+        pairs = []
+        for i in range(len(starts)):
+            for j in range(i + 1, len(starts)):
+                hit, _ = intersect_segments_2d_array(
+                    starts[i], ends[i], starts[j], ends[j],
+                    ignore_shared_endpoints)
+                if hit:
+                    pairs.append((i, j))
+        return pairs
+
+    def _check(self, starts, ends, ignore_shared_endpoints=False):
+        expected = self._brute_force(starts, ends, ignore_shared_endpoints)
+        for found in (
+                segment_intersections_2d_all(
+                    starts, ends, block_size=7,
+                    ignore_shared_endpoints=ignore_shared_endpoints),
+                segment_intersections_2d_sweep(starts, ends,
+                                               ignore_shared_endpoints)):
+            indices_a, indices_b, points = found
+            self.assertEqual(expected, list(zip(indices_a, indices_b)))
+            _, expected_points = intersect_segments_2d_array(
+                starts[indices_a], ends[indices_a], starts[indices_b],
+                ends[indices_b])
+            numpy.testing.assert_array_equal(expected_points, points)
+
+    def test_vec2(self):
+        """Ensure lists of Vec2 work and pairs come back sorted."""
+
+        starts = [Vec2(0, 0), Vec2(0, 2), Vec2(3, 0), Vec2(0, 1)]
+        ends = [Vec2(2, 2), Vec2(2, 0), Vec2(3, 3), Vec2(5, 1)]
+
+        for find in (segment_intersections_2d_all,
+                     segment_intersections_2d_sweep):
+            indices_a, indices_b, points = find(starts, ends)
+            numpy.testing.assert_array_equal([0, 0, 1, 2], indices_a)
+            numpy.testing.assert_array_equal([1, 3, 3, 3], indices_b)
+            numpy.testing.assert_array_almost_equal(
+                [[1, 1], [1, 1], [1, 1], [3, 1]], points)
+
+    def test_random(self):
+        """Ensure both match a brute force test on random segments."""
+
+        rng = numpy.random.RandomState(3)
+        starts = rng.rand(80, 2)
+        ends = starts + rng.randn(80, 2) * 0.3
+        self._check(starts, ends)
+
+    def test_degenerate(self):
+        """Ensure both match a brute force test on grid segments, which
+        share endpoints, overlap, cross at shared points, and include
+        vertical and zero length segments.
+        """
+
+        rng = numpy.random.RandomState(4)
+        for _ in range(20):
+            starts = rng.randint(0, 5, (30, 2)).astype(float)
+            ends = rng.randint(0, 5, (30, 2)).astype(float)
+            self._check(starts, ends)
+            self._check(starts, ends, True)
+
+    def test_polyline(self):
+        """Ensure a self crossing polyline only reports its crossing when
+        shared endpoints are ignored.
+        """
+
+        points = numpy.array([[0, 0], [2, 0], [2, 2], [1, 2], [1, -1]],
+                             dtype=float)
+        indices_a, indices_b, points = segment_intersections_2d_sweep(
+            points[:-1], points[1:], ignore_shared_endpoints=True)
+
+        numpy.testing.assert_array_equal([0], indices_a)
+        numpy.testing.assert_array_equal([3], indices_b)
+        numpy.testing.assert_array_almost_equal([[1, 0]], points)
+
+    def test_other(self):
+        """Ensure segments can be tested against a second set."""
+
+        indices_a, indices_b, points = segment_intersections_2d_all(
+            [[0, 0], [5, 5]], [[2, 2], [6, 6]], [[9, 9], [0, 2]],
+            [[9, 8], [2, 0]])
+
+        numpy.testing.assert_array_equal([0], indices_a)
+        numpy.testing.assert_array_equal([1], indices_b)
+        numpy.testing.assert_array_almost_equal([[1, 1]], points)
+
+    def test_empty(self):
+        """Ensure no segments give no pairs."""
+
+        for find in (segment_intersections_2d_all,
+                     segment_intersections_2d_sweep):
+            indices_a, indices_b, points = find(numpy.empty((0, 2)),
+                                                numpy.empty((0, 2)))
+            self.assertEqual(0, len(indices_a))
+            self.assertEqual(0, len(indices_b))
+            self.assertEqual((0, 2), points.shape)
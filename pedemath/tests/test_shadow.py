@@ -0,0 +1,101 @@
+
+import unittest
+
+import numpy
+
+from pedemath.matrix import Matrix44
+from pedemath.projection import clip_v3_array
+from pedemath.shadow import cascade_shadow_mat44_array
+from pedemath.shadow import cascade_split_distances
+from pedemath.shadow import fit_ortho_to_corners_array
+from pedemath.shadow import frustum_slice_corners_array
+from pedemath.vec3 import Vec3
+
+
+class CascadeSplitDistancesTestCase(unittest.TestCase):
+    """Test cascade_split_distances()."""
+
+    def test_uniform(self):
+        """Ensure a blend of 0 gives evenly spaced splits."""
+
+        numpy.testing.assert_allclose(
+            [1, 25.75, 50.5, 75.25, 100],
+            cascade_split_distances(1.0, 100.0, 4, blend=0.0))
+
+    def test_logarithmic(self):
+        """Ensure a blend of 1 gives a constant ratio between splits."""
+
+        numpy.testing.assert_allclose(
+            [1, 10, 100], cascade_split_distances(1.0, 100.0, 2, blend=1.0))
+
+    def test_increasing(self):
+        """Ensure splits increase from near to far."""
+
+        splits = cascade_split_distances(0.5, 500.0, 5)
+        self.assertEqual(0.5, splits[0])
+        self.assertEqual(500.0, splits[-1])
+        self.assertTrue((numpy.diff(splits) > 0).all())
+
+
+class FrustumSliceCornersTestCase(unittest.TestCase):
+    """Test frustum_slice_corners_array()."""
+
+    def test_identity_view(self):
+        """Ensure corners are placed down -z at the split distances."""
+
+        corners = frustum_slice_corners_array(Matrix44(), 90, 2.0, [1, 3])
+
+        self.assertEqual((1, 8, 3), corners.shape)
+        numpy.testing.assert_allclose([-2, -1, -1], corners[0, 0])
+        numpy.testing.assert_allclose([6, 3, -3], corners[0, 6])
+
+    def test_view_is_inverted(self):
+        """Ensure corners are in world space for a moved camera."""
+
+        view = Matrix44.from_look_at(Vec3(10, 0, 0), Vec3(10, 0, -1),
+                                     Vec3(0, 1, 0))
+        corners = frustum_slice_corners_array(view, 90, 1.0, [1, 2, 4])
+
+        self.assertEqual((2, 8, 3), corners.shape)
+        numpy.testing.assert_allclose([9, -1, -1], corners[0, 0], atol=1e-6)
+        numpy.testing.assert_allclose([14, 4, -4], corners[1, 6], atol=1e-6)
+
+
+class FitOrthoToCornersTestCase(unittest.TestCase):
+    """Test fit_ortho_to_corners_array() and cascade_shadow_mat44_array()."""
+
+    def test_corners_fill_clip_volume(self):
+        """Ensure every corner is inside its cascade's clip volume and the
+        bounds are tight.
+        """
+
+        view = Matrix44.from_look_at(Vec3(0, 5, 10), Vec3(0, 0, 0),
+                                     Vec3(0, 1, 0))
+        light = Matrix44.from_look_at(Vec3(20, 40, 0), Vec3(0, 0, 0),
+                                      Vec3(0, 1, 0))
+        splits = [1.0, 5.0, 20.0, 60.0]
+        corners = frustum_slice_corners_array(view, 60, 1.5, splits)
+
+        projections, bounds = fit_ortho_to_corners_array(light.data, corners)
+
+        self.assertEqual((3, 4, 4), projections.shape)
+        self.assertEqual((3, 6), bounds.shape)
+        for proj, slice_corners in zip(projections, corners):
+            # Column-major, so proj * light is light.data . proj
+            clip = clip_v3_array(light.data.dot(proj), slice_corners)
+            self.assertTrue((numpy.abs(clip[:, :3]) <= 1.0 + 1e-9).all())
+            numpy.testing.assert_allclose([1, 1, 1],
+                                          numpy.abs(clip[:, :3]).max(axis=0))
+
+    def test_cascade_shadow(self):
+        """Ensure the convenience function returns one matrix per cascade.
+        """
+
+        light = Matrix44.from_look_at(Vec3(0, 10, 0), Vec3(0, 0, 0),
+                                      Vec3(0, 0, -1))
+        projections, splits, bounds = cascade_shadow_mat44_array(
+            Matrix44(), 60, 1.0, 0.1, 100.0, light, 4, z_padding=5.0)
+
+        self.assertEqual((4, 4, 4), projections.shape)
+        self.assertEqual(5, len(splits))
+        self.assertEqual((4, 6), bounds.shape)
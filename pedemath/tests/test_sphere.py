@@ -0,0 +1,155 @@
+
+import itertools
+import unittest
+
+import numpy
+
+from pedemath.sphere import merge_spheres_array
+from pedemath.sphere import ritter_sphere
+from pedemath.sphere import ritter_sphere_array_from_point_sets
+from pedemath.sphere import sphere_around_spheres
+from pedemath.sphere import welzl_sphere
+from pedemath.sphere import _sphere_from_support
+from pedemath.vec3 import Vec3
+
+
+def _holds(points, center, radius):
+    points = numpy.asarray(points, dtype=float)
+    return (numpy.linalg.norm(points - numpy.asarray(center), axis=-1) <=
+            radius * (1 + 1e-7) + 1e-12).all()
+
+
+def _brute_force_radius(points):
+    """Return the radius of the smallest sphere through 1 to 4 of the
+    points that holds all of them.
+    """
+
+    best = numpy.inf
+    for size in range(1, 5):
+        for support in itertools.combinations(points, size):
+            center, radius = _sphere_from_support(list(support))
+            if radius < best and _holds(points, center, radius):
+                best = radius
+    return best
+
+
+class RitterSphereTestCase(unittest.TestCase):
+    """Test ritter_sphere() and its batched version."""
+
+    def test_holds_points(self):
+        """Ensure every point is inside and the sphere is reasonably tight.
+        """
+
+        rng = numpy.random.RandomState(15)
+        points = rng.uniform(-1, 1, size=(2000, 3)) * [4, 1, 2]
+        center, radius = ritter_sphere(points)
+
+        self.assertIsInstance(center, Vec3)
+        self.assertTrue(_holds(points, center.as_tuple(), radius))
+        _, exact = welzl_sphere(points, seed=0)
+        self.assertTrue(exact <= radius < exact * 1.05)
+
+    def test_vec3_list(self):
+        """Ensure a list of Vec3 is accepted."""
+
+        center, radius = ritter_sphere([Vec3(-1, 0, 0), Vec3(1, 0, 0)])
+
+        self.assertEqual(Vec3(0, 0, 0), center)
+        self.assertEqual(1.0, radius)
+
+    def test_batch_matches_single(self):
+        """Ensure ragged and stacked batches match single sets."""
+
+        rng = numpy.random.RandomState(16)
+        sets = [rng.normal(size=(count, 3)) for count in (1, 2, 7, 30)]
+        centers, radii = ritter_sphere_array_from_point_sets(sets)
+
+        for points, center, radius in zip(sets, centers, radii):
+            single_center, single_radius = ritter_sphere(points)
+            numpy.testing.assert_allclose(single_center.as_tuple(), center)
+            self.assertAlmostEqual(single_radius, radius)
+
+        stacked = rng.normal(size=(50, 8, 3))
+        centers, radii = ritter_sphere_array_from_point_sets(stacked)
+        for points, center, radius in zip(stacked, centers, radii):
+            self.assertTrue(_holds(points, center, radius))
+
+    def test_empty(self):
+        """Ensure an empty set raises ValueError."""
+
+        self.assertRaises(ValueError, ritter_sphere, [])
+        self.assertRaises(ValueError, ritter_sphere_array_from_point_sets,
+                          [[(0, 0, 0)], []])
+
+
+class WelzlSphereTestCase(unittest.TestCase):
+    """Test welzl_sphere()."""
+
+    def test_matches_brute_force(self):
+        """Ensure small sets give the smallest enclosing sphere."""
+
+        rng = numpy.random.RandomState(17)
+        for _ in range(20):
+            points = rng.normal(size=(8, 3))
+            center, radius = welzl_sphere(points, seed=3)
+
+            self.assertTrue(_holds(points, center.as_tuple(), radius))
+            self.assertAlmostEqual(_brute_force_radius(points), radius)
+
+    def test_points_on_sphere(self):
+        """Ensure points spread over a sphere give back that sphere."""
+
+        rng = numpy.random.RandomState(18)
+        directions = rng.normal(size=(5000, 3))
+        directions /= numpy.linalg.norm(directions, axis=1)[:, None]
+        center, radius = welzl_sphere(directions * 2.0 + [1, -1, 4])
+
+        numpy.testing.assert_allclose([1, -1, 4], center.as_tuple(),
+                                      atol=1e-3)
+        self.assertAlmostEqual(2.0, radius, places=3)
+
+    def test_degenerate(self):
+        """Ensure duplicate, collinear and coplanar points are handled."""
+
+        self.assertEqual((Vec3(1, 2, 3), 0.0),
+                         welzl_sphere([(1, 2, 3)] * 5, seed=0))
+
+        center, radius = welzl_sphere([(0, 0, 0), (1, 0, 0), (4, 0, 0),
+                                       (2, 0, 0)], seed=0)
+        self.assertEqual(Vec3(2, 0, 0), center)
+        self.assertEqual(2.0, radius)
+
+        square = [(x, y, 0) for x in (0, 1, 2) for y in (0, 1, 2)]
+        center, radius = welzl_sphere(square, seed=0)
+        numpy.testing.assert_allclose([1, 1, 0], center.as_tuple())
+        self.assertAlmostEqual(numpy.sqrt(2), radius)
+
+
+class MergeSpheresTestCase(unittest.TestCase):
+    """Test merge_spheres_array() and sphere_around_spheres()."""
+
+    def test_merge(self):
+        """Ensure separate, nested and identical spheres merge."""
+
+        centers, radii = merge_spheres_array(
+            [[0, 0, 0], [0, 0, 0], [0, 0, 0]], [1, 5, 1],
+            [[4, 0, 0], [1, 0, 0], [0, 0, 0]], [1, 1, 3])
+
+        numpy.testing.assert_allclose([[2, 0, 0], [0, 0, 0], [0, 0, 0]],
+                                      centers)
+        numpy.testing.assert_allclose([3, 5, 3], radii)
+
+    def test_sphere_around_spheres(self):
+        """Ensure every sphere is held by the result."""
+
+        rng = numpy.random.RandomState(19)
+        centers = rng.normal(size=(40, 3)) * 5
+        radii = rng.uniform(0.1, 2, size=40)
+
+        center, radius = sphere_around_spheres(centers, radii)
+
+        reach = (numpy.linalg.norm(centers - center.as_tuple(), axis=1) +
+                 radii)
+        self.assertTrue((reach <= radius * (1 + 1e-7)).all())
+        _, points_radius = welzl_sphere(centers, seed=0)
+        self.assertTrue(radius < points_radius + radii.max() * 1.1)
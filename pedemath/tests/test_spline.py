@@ -0,0 +1,213 @@
+import pickle
+import unittest
+
+import numpy
+
+from pedemath.closest import nearest_segment_array
+from pedemath.spline import ArcLengthTable
+from pedemath.spline import BezierSpline
+from pedemath.spline import CatmullRomSpline
+from pedemath.vec2 import Vec2
+from pedemath.vec3 import Vec3
+
+POINTS = [Vec3(0, 0, 0), Vec3(1, 2, 0), Vec3(3, 3, 1), Vec3(4, 0, 2),
+          Vec3(6, 1, 2)]
+
+
+def _unit(vecs):
+    return vecs / numpy.linalg.norm(vecs, axis=-1)[..., None]
+
+
+class BezierSplineTestCase(unittest.TestCase):
+    """Test BezierSpline."""
+
+    def test_positions(self):
+        """Ensure positions match the Bernstein form on each segment."""
+
+        chain = numpy.array([[0, 0], [1, 2], [3, 2], [4, 0], [5, -2],
+                             [7, -1], [8, 1]], dtype=float)
+        spline = BezierSpline(chain)
+        self.assertEqual(2, len(spline))
+
+        t = numpy.linspace(0, 1, 7)
+        weights = numpy.column_stack([(1 - t) ** 3, 3 * t * (1 - t) ** 2,
+                                      3 * t ** 2 * (1 - t), t ** 3])
+        numpy.testing.assert_array_almost_equal(
+            weights.dot(chain[:4]), spline.positions(t))
+        numpy.testing.assert_array_almost_equal(
+            weights.dot(chain[3:]), spline.positions(t + 1))
+
+        self.assertEqual(Vec2(8, 1), spline.position(2))
+
+    def test_tangents(self):
+        """Ensure tangents are 3 times the first and last control
+        edges.
+        """
+
+        chain = [Vec3(0, 0, 0), Vec3(1, 0, 0), Vec3(2, 1, 0), Vec3(2, 2, 1)]
+        spline = BezierSpline(chain)
+        numpy.testing.assert_array_almost_equal(
+            [[3, 0, 0], [0, 3, 3]], spline.tangents([0, 1]))
+
+        # Central differences.
+        params = numpy.array([[0.2, 0.5], [0.7, 0.9]])
+        step = 1e-6
+        numpy.testing.assert_array_almost_equal(
+            (spline.positions(params + step) -
+             spline.positions(params - step)) / (2 * step),
+            spline.tangents(params), 5)
+
+    def test_bad_chain(self):
+        """Ensure chains that aren't 3 S + 1 points raise ValueError."""
+
+        self.assertRaises(ValueError, BezierSpline, POINTS)
+        self.assertRaises(ValueError, BezierSpline, POINTS[:3])
+
+
+class CatmullRomSplineTestCase(unittest.TestCase):
+    """Test CatmullRomSpline."""
+
+    def test_passes_through_points(self):
+        """Ensure every alpha passes through the points."""
+
+        for alpha in (0.0, 0.5, 1.0):
+            spline = CatmullRomSpline(POINTS, alpha)
+            self.assertEqual(4, len(spline))
+            numpy.testing.assert_array_almost_equal(
+                numpy.array(POINTS), spline.positions(numpy.arange(5)))
+
+    def test_uniform_tangents(self):
+        """Ensure uniform tangents are half the difference of the
+        neighbors.
+        """
+
+        spline = CatmullRomSpline(POINTS, alpha=0.0)
+        points = numpy.array(POINTS)
+        numpy.testing.assert_array_almost_equal(
+            (points[2:] - points[:-2]) * 0.5,
+            spline.tangents(numpy.arange(1, 4)))
+
+    def test_tangent_direction_continuous(self):
+        """Ensure tangents keep their direction across points."""
+
+        for alpha in (0.0, 0.5, 1.0):
+            spline = CatmullRomSpline(POINTS, alpha)
+            joins = numpy.arange(1, 4, dtype=float)
+            numpy.testing.assert_array_almost_equal(
+                _unit(spline.tangents(joins - 1e-9)),
+                _unit(spline.tangents(joins)))
+
+    def test_closed(self):
+        """Ensure a closed spline has a segment back to the start and is
+        smooth there.
+        """
+
+        spline = CatmullRomSpline(POINTS[:4], closed=True)
+        self.assertEqual(4, len(spline))
+        numpy.testing.assert_array_almost_equal(
+            spline.positions(0), spline.positions(4))
+        numpy.testing.assert_array_almost_equal(
+            _unit(spline.tangents(0)), _unit(spline.tangents(4)))
+
+    def test_repeated_points(self):
+        """Ensure repeated points don't give nan."""
+
+        spline = CatmullRomSpline([Vec2(0, 0), Vec2(1, 0), Vec2(1, 0),
+                                   Vec2(2, 1)])
+        self.assertFalse(numpy.isnan(
+            spline.positions(numpy.linspace(0, 3, 13))).any())
+
+    def test_too_few_points(self):
+        self.assertRaises(ValueError, CatmullRomSpline, POINTS[:1])
+
+
+class FlattenTestCase(unittest.TestCase):
+    """Test BezierSpline.flatten()."""
+
+    def test_within_tolerance(self):
+        """Ensure the polyline stays within tolerance of the spline and its
+        points are on the spline.
+        """
+
+        spline = CatmullRomSpline(POINTS)
+        for tolerance in (0.1, 0.001):
+            points, params = spline.flatten(tolerance)
+            numpy.testing.assert_array_almost_equal(
+                spline.positions(params), points)
+            self.assertTrue((numpy.diff(params) > 0).all())
+
+            samples = spline.positions(numpy.linspace(0, 4, 2001))
+            _, _, dists = nearest_segment_array(samples, points[:-1],
+                                                points[1:])
+            self.assertLessEqual(dists.max(), tolerance)
+
+        self.assertGreater(len(spline.flatten(0.001)[0]),
+                           len(spline.flatten(0.1)[0]))
+
+    def test_straight(self):
+        """Ensure straight segments aren't split."""
+
+        spline = BezierSpline([[0, 0], [1, 0], [2, 0], [3, 0], [3, 1],
+                               [3, 2], [3, 3]])
+        points, params = spline.flatten(0.01)
+        numpy.testing.assert_array_equal([[0, 0], [3, 0], [3, 3]], points)
+        numpy.testing.assert_array_equal([0, 1, 2], params)
+
+
+class ArcLengthTableTestCase(unittest.TestCase):
+    """Test ArcLengthTable and the spline methods using it."""
+
+    def test_straight_length(self):
+        """Ensure a line with uneven control points has the right length
+        and is sampled evenly.
+        """
+
+        spline = BezierSpline([[0, 0], [0.1, 0], [0.2, 0], [3, 0]])
+        self.assertAlmostEqual(3.0, spline.length())
+        numpy.testing.assert_array_almost_equal(
+            [[0, 0], [1, 0], [2, 0], [3, 0]],
+            spline.positions_at_distances([0, 1, 2, 3]))
+
+    def test_even_spacing(self):
+        """Ensure even parameters give evenly spaced points along a spline
+        with joins where its speed changes.
+        """
+
+        spline = CatmullRomSpline(POINTS)
+        table = spline.arc_length_table()
+        params = table.even_params_for(201)
+        self.assertEqual(0.0, params[0])
+        self.assertAlmostEqual(4.0, params[-1])
+
+        fine_params = numpy.linspace(0, 4, 200001)
+        fine = spline.positions(fine_params)
+        distances = numpy.concatenate([[0], numpy.cumsum(numpy.linalg.norm(
+            numpy.diff(fine, axis=0), axis=1))])
+        self.assertAlmostEqual(distances[-1], table.total_length, 5)
+
+        found = numpy.interp(params, fine_params, distances)
+        numpy.testing.assert_allclose(
+            numpy.linspace(0, table.total_length, 201), found, atol=1e-3)
+
+    def test_clamped(self):
+        """Ensure distances past the ends give the ends."""
+
+        table = CatmullRomSpline(POINTS).arc_length_table()
+        numpy.testing.assert_array_almost_equal(
+            [0, 4], table.params_at([-1, table.total_length + 1]))
+
+    def test_cached(self):
+        """Ensure tables are built once per sample count and survive
+        pickling.
+        """
+
+        spline = CatmullRomSpline(POINTS)
+        table = spline.arc_length_table()
+        self.assertIs(table, spline.arc_length_table())
+        self.assertIsNot(table, spline.arc_length_table(8))
+
+        loaded = pickle.loads(pickle.dumps(table))
+        self.assertIsInstance(loaded, ArcLengthTable)
+        distances = numpy.linspace(0, table.total_length, 17)
+        numpy.testing.assert_array_equal(table.params_at(distances),
+                                         loaded.params_at(distances))
@@ -0,0 +1,104 @@
+
+import unittest
+
+import numpy
+
+from pedemath.rect import Rect
+from pedemath.rect3 import Rect3
+from pedemath.stats import PointStats
+from pedemath.vec2 import Vec2
+from pedemath.vec3 import Vec3
+
+
+class PointStatsTestCase(unittest.TestCase):
+    """Test accumulating points with PointStats."""
+
+    def setUp(self):
+        rng = numpy.random.RandomState(10)
+        self.points = rng.normal(size=(1000, 3)) * [1, 2, 3] + [5, -2, 1]
+
+    def test_array(self):
+        """Ensure mean, covariance and bounds match numpy."""
+
+        stats = PointStats.from_array(self.points)
+
+        self.assertEqual(1000, len(stats))
+        numpy.testing.assert_allclose(self.points.mean(axis=0), stats.mean)
+        numpy.testing.assert_allclose(
+            numpy.cov(self.points.T, bias=True), stats.covariance())
+        numpy.testing.assert_allclose(numpy.cov(self.points.T),
+                                      stats.covariance(ddof=1))
+        numpy.testing.assert_allclose(self.points.min(axis=0), stats.mins)
+        numpy.testing.assert_allclose(self.points.max(axis=0), stats.maxs)
+
+    def test_chunks_and_merge(self):
+        """Ensure chunks and merged accumulators give the same result as
+        one array.
+        """
+
+        expected = PointStats.from_array(self.points)
+        first = PointStats()
+        for start in range(0, 600, 77):
+            first.add_array(self.points[start:min(start + 77, 600)])
+        second = PointStats.from_array(self.points[600:])
+
+        merged = first.merge(second)
+
+        self.assertEqual(1000, merged.count)
+        numpy.testing.assert_allclose(expected.mean, merged.mean)
+        numpy.testing.assert_allclose(expected.m2, merged.m2)
+        numpy.testing.assert_array_equal(expected.mins, merged.mins)
+
+    def test_iter_vec3(self):
+        """Ensure a generator of Vec3 is consumed in chunks."""
+
+        stats = PointStats.from_iter(
+            (Vec3(*point) for point in self.points), chunk_size=64)
+
+        numpy.testing.assert_allclose(self.points.mean(axis=0), stats.mean)
+        self.assertEqual(Vec3(*stats.mean), stats.mean_vec())
+
+        bounds = stats.bounds()
+        self.assertIsInstance(bounds, Rect3)
+        self.assertAlmostEqual(self.points[:, 2].min(), bounds.z)
+        self.assertAlmostEqual(numpy.ptp(self.points[:, 1]), bounds.height)
+
+    def test_vec2(self):
+        """Ensure 2D points give a Vec2 mean and Rect bounds."""
+
+        stats = PointStats(dims=2)
+        for point in [Vec2(0, 0), Vec2(2, 0), Vec2(2, 4), (0, 4)]:
+            stats.add(point)
+
+        mean = stats.mean_vec()
+        self.assertIsInstance(mean, Vec2)
+        self.assertAlmostEqual(1.0, mean.x)
+        self.assertAlmostEqual(2.0, mean.y)
+        self.assertEqual(Rect(0.0, 0.0, 2.0, 4.0), stats.bounds())
+        numpy.testing.assert_allclose([[1, 0], [0, 4]], stats.covariance(),
+                                      atol=1e-12)
+
+    def test_stable_far_from_origin(self):
+        """Ensure a small spread far from the origin keeps its variance."""
+
+        stats = PointStats()
+        offset = 1e9
+        for start in range(0, 1000, 100):
+            stats.add_array(self.points[start:start + 100] + offset)
+
+        numpy.testing.assert_allclose(
+            numpy.cov(self.points.T, bias=True), stats.covariance(),
+            rtol=1e-5)
+
+    def test_empty(self):
+        """Ensure empty accumulators merge and raise on queries."""
+
+        stats = PointStats()
+        stats.add_iter([])
+        stats.merge(PointStats())
+
+        self.assertEqual(0, len(stats))
+        self.assertRaises(ValueError, stats.mean_vec)
+        self.assertRaises(ValueError, stats.bounds)
+        self.assertRaises(ValueError, stats.covariance)
+        self.assertRaises(ValueError, stats.merge, PointStats(dims=2))
@@ -0,0 +1,104 @@
+
+import unittest
+
+import numpy
+
+from pedemath.matrix import Matrix44
+from pedemath.quat import Quat
+from pedemath.transform import compose_mat44
+from pedemath.transform import compose_mat44_array
+from pedemath.transform import decompose_mat44
+from pedemath.transform import decompose_mat44_array
+from pedemath.vec3 import Vec3
+
+
+def _scale_matrix(scale):
+    mat = Matrix44()
+    for i in range(3):
+        mat.data[i][i] = scale[i]
+    return mat
+
+
+def _trs_matrix(trans, quat, scale):
+    return (Matrix44.from_trans(trans) * quat.as_matrix44() *
+            _scale_matrix(scale))
+
+
+class DecomposeMat44TestCase(unittest.TestCase):
+    """Test decompose_mat44()."""
+
+    def test_identity(self):
+        """Ensure the identity has no translation, rotation or scale."""
+
+        trans, rot, scale = decompose_mat44(Matrix44())
+
+        self.assertEqual(Vec3(0, 0, 0), trans)
+        self.assertEqual(Quat(), rot)
+        self.assertEqual(Vec3(1, 1, 1), scale)
+
+    def test_components(self):
+        """Ensure each component is extracted."""
+
+        quat = Quat.from_axis_angle_deg(Vec3(1, 2, 3), 70)
+        mat = _trs_matrix(Vec3(4, -5, 6), quat, Vec3(2, 3, 0.5))
+
+        trans, rot, scale = decompose_mat44(mat)
+        self.assertTrue(Vec3(4, -5, 6).almost_equal(trans, places=5))
+        self.assertTrue(Vec3(2, 3, 0.5).almost_equal(scale, places=5))
+        for i in range(4):
+            self.assertAlmostEqual(quat[i], rot[i], places=5)
+
+    def test_negative_determinant(self):
+        """Ensure a mirroring matrix gives a negative x scale and a proper
+        rotation.
+        """
+
+        quat = Quat.from_axis_angle_deg(Vec3(0, 1, 0), 30)
+        mat = _trs_matrix(Vec3(1, 1, 1), quat, Vec3(1, 1, -2))
+
+        trans, rot, scale = decompose_mat44(mat)
+        self.assertTrue(scale.x < 0)
+        self.assertTrue(mat.almost_equal(compose_mat44(trans, rot, scale)))
+
+    def test_round_trip(self):
+        """Ensure recomposing gives the original matrix."""
+
+        quat = Quat.from_axis_angle_deg(Vec3(-1, 0, 2), 200)
+        mat = _trs_matrix(Vec3(0, 7, -1), quat, Vec3(0.25, 4, 1))
+
+        self.assertTrue(mat.almost_equal(compose_mat44(*decompose_mat44(mat))))
+
+
+class DecomposeMat44ArrayTestCase(unittest.TestCase):
+    """Test decompose_mat44_array() and compose_mat44_array()."""
+
+    def test_round_trip(self):
+        """Ensure recomposing a batch gives the original matrices."""
+
+        rng = numpy.random.RandomState(5)
+        quats = rng.normal(size=(50, 4))
+        quats /= numpy.linalg.norm(quats, axis=1)[:, None]
+        scales = rng.uniform(0.1, 5.0, size=(50, 3))
+        scales *= numpy.where(rng.uniform(size=(50, 3)) < 0.2, -1.0, 1.0)
+        translations = rng.normal(size=(50, 3))
+
+        mats = compose_mat44_array(translations, quats, scales)
+        result = compose_mat44_array(*decompose_mat44_array(mats))
+
+        numpy.testing.assert_allclose(mats, result, atol=1e-10)
+
+    def test_matches_single(self):
+        """Ensure each row matches decompose_mat44()."""
+
+        mats = [_trs_matrix(Vec3(1, 2, 3), Quat.from_axis_angle_deg(
+                    Vec3(0, 0, 1), 45), Vec3(1, 2, 3)),
+                _trs_matrix(Vec3(-1, 0, 0), Quat(), Vec3(-1, 1, 1))]
+        translations, quats, scales = decompose_mat44_array(
+            [mat.data for mat in mats])
+
+        for i, mat in enumerate(mats):
+            trans, rot, scale = decompose_mat44(mat)
+            numpy.testing.assert_allclose(trans.as_tuple(), translations[i])
+            numpy.testing.assert_allclose([rot.x, rot.y, rot.z, rot.w],
+                                          quats[i])
+            numpy.testing.assert_allclose(scale.as_tuple(), scales[i])
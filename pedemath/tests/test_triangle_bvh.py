@@ -0,0 +1,118 @@
+
+import unittest
+
+import numpy
+
+from pedemath.ray import RayBatch
+from pedemath.triangle_bvh import intersect_ray_triangle_array
+from pedemath.triangle_bvh import TriangleBVH
+from pedemath.vec3 import Vec3
+
+
+class IntersectRayTriangleArrayTestCase(unittest.TestCase):
+    """Test intersect_ray_triangle_array()."""
+
+    def setUp(self):
+        self.v0 = numpy.array([0.0, 0.0, 0.0])
+        self.edge1 = numpy.array([1.0, 0.0, 0.0])
+        self.edge2 = numpy.array([0.0, 1.0, 0.0])
+
+    def test_hit(self):
+        """Ensure the distance and barycentric coordinates are returned."""
+
+        hit, t, u, v = intersect_ray_triangle_array(
+            [0.25, 0.5, 2.0], [0.0, 0.0, -1.0], self.v0, self.edge1,
+            self.edge2)
+
+        self.assertTrue(hit)
+        self.assertAlmostEqual(2.0, t)
+        self.assertAlmostEqual(0.25, u)
+        self.assertAlmostEqual(0.5, v)
+
+    def test_misses(self):
+        """Ensure rays outside, behind, parallel or too short miss."""
+
+        origins = [(0.8, 0.8, 1), (0.2, 0.2, 1), (0.2, 0.2, 1), (-1, 0.2, 0),
+                   (0.2, 0.2, 1)]
+        directions = [(0, 0, -1), (0, 0, 1), (0, 0, -1), (1, 0, 0),
+                      (0, 0, -1)]
+        t_max = [10, 10, 0.5, 10, 10]
+        hit, _, _, _ = intersect_ray_triangle_array(
+            numpy.array(origins, dtype=float),
+            numpy.array(directions, dtype=float), self.v0, self.edge1,
+            self.edge2, numpy.array(t_max, dtype=float))
+
+        self.assertEqual([False, False, False, False, True], list(hit))
+
+
+class TriangleBVHTestCase(unittest.TestCase):
+    """Test TriangleBVH ray casts."""
+
+    def setUp(self):
+        # Two unit squares facing +z, at z = 0 and z = -2.
+        vertices = [Vec3(0, 0, 0), Vec3(1, 0, 0), Vec3(1, 1, 0),
+                    Vec3(0, 1, 0), Vec3(0, 0, -2), Vec3(1, 0, -2),
+                    Vec3(1, 1, -2), Vec3(0, 1, -2)]
+        faces = [(0, 1, 2), (0, 2, 3), (4, 5, 6), (4, 6, 7)]
+        self.bvh = TriangleBVH(vertices, faces, leaf_size=1)
+
+    def test_closest_hit(self):
+        """Ensure the nearest triangle is returned."""
+
+        rays = RayBatch([(0.7, 0.2, 5), (0.2, 0.7, -1), (2, 2, 5)],
+                        [(0, 0, -1), (0, 0, -1), (0, 0, -1)])
+        triangles, t, uv = self.bvh.closest_hit(rays)
+
+        self.assertEqual([0, 3, -1], list(triangles))
+        numpy.testing.assert_allclose([5, 1, numpy.inf], t)
+        self.assertEqual((3, 2), uv.shape)
+
+    def test_any_hit(self):
+        """Ensure any_hit agrees with closest_hit on hits and misses."""
+
+        rays = RayBatch([(0.5, 0.5, 5), (0.5, 0.5, -3), (5, 0.5, -1)],
+                        [(0, 0, -1), (0, 0, -1), (0, 0, -1)])
+
+        self.assertEqual([True, False, False], list(self.bvh.any_hit(rays)))
+
+    def test_t_max(self):
+        """Ensure triangles beyond a segment's end are not hit."""
+
+        rays = RayBatch.from_segments([(0.5, 0.2, 1), (0.5, 0.2, 1)],
+                                      [(0.5, 0.2, 0.5), (0.5, 0.2, -5)])
+        triangles, _, _ = self.bvh.closest_hit(rays)
+
+        self.assertEqual([-1, 0], list(triangles))
+
+    def test_raycast(self):
+        """Ensure a single ray returns the triangle and distance."""
+
+        self.assertEqual((0, 1.0),
+                         self.bvh.raycast(Vec3(0.9, 0.1, 1), Vec3(0, 0, -1),
+                                          t_max=10))
+        self.assertEqual((2, 1.0),
+                         self.bvh.raycast(Vec3(0.9, 0.1, -1), Vec3(0, 0, -1)))
+        self.assertEqual((-1, numpy.inf),
+                         self.bvh.raycast(Vec3(0.9, 0.1, 1), Vec3(0, 0, 1)))
+
+    def test_matches_brute_force(self):
+        """Ensure closest hits match testing every triangle."""
+
+        rng = numpy.random.RandomState(2)
+        vertices = rng.uniform(-5, 5, size=(300, 3))
+        faces = rng.randint(0, 300, size=(200, 3))
+        bvh = TriangleBVH(vertices, faces)
+
+        rays = RayBatch(rng.uniform(-6, 6, size=(100, 3)),
+                        rng.normal(size=(100, 3)))
+        triangles, t, _ = bvh.closest_hit(rays)
+
+        hit, all_t, _, _ = intersect_ray_triangle_array(
+            rays.origins[:, None], rays.directions[:, None], bvh.v0,
+            bvh.edge1, bvh.edge2)
+        expected_t = numpy.where(hit, all_t, numpy.inf).min(axis=1)
+
+        self.assertTrue((triangles >= 0).any())
+        numpy.testing.assert_allclose(expected_t, t)
+        numpy.testing.assert_array_equal(numpy.isfinite(expected_t),
+                                         bvh.any_hit(rays))
@@ -0,0 +1,143 @@
+import unittest
+
+import numpy
+
+from pedemath.polygon import Polygon
+from pedemath.triangulate import triangulate_polygon
+from pedemath.vec2 import Vec2
+
+SQUARE = [[0, 0], [10, 0], [10, 10], [0, 10]]
+
+
+def _coastline(count, radius=1.0, center=(0.0, 0.0), seed=0):
+    """Return a star shaped ring with bays and jitter at every scale."""
+
+    rng = numpy.random.RandomState(seed)
+    angles = numpy.linspace(0, 2 * numpy.pi, count, endpoint=False)
+    radii = numpy.ones(count)
+    for k in range(1, 100):
+        radii += 0.15 / k * rng.randn() * numpy.cos(
+            k * angles + rng.rand() * 2 * numpy.pi)
+    radii = numpy.maximum(radii, 0.2) * radius * (
+        1 + 0.5 / count * rng.randn(count))
+    return numpy.column_stack([center[0] + radii * numpy.cos(angles),
+                               center[1] + radii * numpy.sin(angles)])
+
+
+def _spiral(count, turns):
+    """Return a ring around a spiral strip of count points a side."""
+
+    angles = numpy.linspace(0.3, turns * 2 * numpy.pi, count)
+    outside = (angles + 2.5)[:, None] * numpy.column_stack(
+        [numpy.cos(angles), numpy.sin(angles)])
+    inside = angles[:, None] * numpy.column_stack(
+        [numpy.cos(angles), numpy.sin(angles)])
+    return numpy.concatenate([outside, inside[::-1]])
+
+
+class TriangulatePolygonTestCase(unittest.TestCase):
+    """Test triangulate_polygon() and Polygon.triangulate()."""
+
+    def assertTriangulates(self, coords, holes=(), triangles=None):
+        """Assert the triangles are counter-clockwise, inside the polygon
+        and between them cover its area less its holes.
+        """
+
+        if triangles is None:
+            triangles = triangulate_polygon(coords, holes)
+        points = numpy.concatenate([numpy.asarray(ring, dtype=float)
+                                    for ring in [coords] + list(holes)])
+        a, b, c = (points[triangles[:, i]] for i in range(3))
+        areas = ((b - a)[:, 0] * (c - a)[:, 1] -
+                 (b - a)[:, 1] * (c - a)[:, 0]) * 0.5
+        self.assertTrue((areas > 0).all())
+
+        polygon = Polygon(coords).build_grid()
+        expected = polygon.area() - sum(Polygon(hole).area()
+                                        for hole in holes)
+        self.assertAlmostEqual(1.0, areas.sum() / expected)
+
+        centers = (a + b + c) / 3.0
+        inside = polygon.contains_points(centers)
+        for hole in holes:
+            inside &= ~Polygon(hole).contains_points(centers)
+        self.assertTrue(inside.all())
+        return triangles
+
+    def test_concave(self):
+        """Ensure a concave polygon of Vec2 in either winding gives
+        counter-clockwise triangles of its vertices.
+        """
+
+        arrow = [Vec2(0, 0), Vec2(4, 0), Vec2(4, 4), Vec2(2, 1), Vec2(0, 4)]
+        for coords in (arrow, arrow[::-1]):
+            triangles = self.assertTriangulates(coords)
+            self.assertEqual((3, 3), triangles.shape)
+            numpy.testing.assert_array_equal(range(5),
+                                             numpy.unique(triangles))
+
+    def test_holes(self):
+        """Ensure holes in either winding are left out, with two more
+        triangles for each.
+        """
+
+        holes = [[[2, 2.5], [4, 2], [4, 4], [2, 4]],
+                 [[6, 6.5], [6, 8], [8, 8.5]],
+                 [[7, 2], [8, 1.5], [8.5, 3]]]
+        triangles = self.assertTriangulates(SQUARE, holes)
+        self.assertEqual(4 + 10 + 2 * 3 - 2, len(triangles))
+
+        polygon = Polygon(SQUARE)
+        numpy.testing.assert_array_equal(
+            triangles, polygon.triangulate([Polygon(hole) for hole in holes]))
+
+    def test_holes_in_line(self):
+        """Ensure holes in line with each other and the outer vertices
+        bridge without crossing.
+        """
+
+        coords = [[0, 0], [10, 0], [10, 2], [10, 5], [10, 10], [0, 10]]
+        holes = [[[x, y], [x + 1, y], [x + 1, y + 1], [x, y + 1]]
+                 for x in (2, 5, 8) for y in (2, 5)]
+        self.assertTriangulates(coords, holes)
+
+    def test_collinear_and_repeated(self):
+        """Ensure collinear and repeated vertices don't leave gaps or
+        zero area triangles.
+        """
+
+        comb = [[x, 10 if x % 2 == 0 else 5] for x in range(40, -1, -1)]
+        comb += [[x, 0] for x in range(0, 41)]
+        comb.insert(50, comb[50])
+        self.assertTriangulates(comb)
+
+        self.assertTriangulates([[0, 0], [1, 0], [2, 0], [2, 2], [2, 2],
+                                 [0, 2]])
+
+    def test_coastline(self):
+        """Ensure a coastline with islands cut out of it gives a triangle
+        for each vertex, less two, plus two for each hole.
+        """
+
+        coords = _coastline(20000, radius=10.0)
+        holes = [_coastline(200, 0.5, center, seed)
+                 for seed, center in enumerate([(0, 0), (2, 2), (-2, 2),
+                                                (2, -2), (-2, -2)], 1)]
+        triangles = self.assertTriangulates(coords, holes)
+        self.assertEqual(20000 + 5 * 200 + 2 * 5 - 2, len(triangles))
+
+    def test_spiral(self):
+        """Ensure a strip clipped from its ends is fully triangulated."""
+
+        coords = _spiral(1000, 3)
+        triangles = self.assertTriangulates(coords)
+        self.assertEqual(2000 - 2, len(triangles))
+
+    def test_degenerate(self):
+        """Ensure too few points give no triangles, and holes outside the
+        polygon raise ValueError.
+        """
+
+        self.assertEqual((0, 3), triangulate_polygon([[0, 0], [1, 1]]).shape)
+        self.assertRaises(ValueError, triangulate_polygon, SQUARE,
+                          [[[12, 1], [13, 1], [13, 2]]])
@@ -804,6 +804,24 @@ class TestAveListV3TestCase(unittest.TestCase):
 
         self.assertEqual(result, Vec3(1, 2, 3))
 
+    def test_ave_list_v3_iterator(self):
+        """Ensure any iterable of vectors can be averaged."""
+
+        from pedemath.vec3 import ave_list_v3
+
+        result = ave_list_v3(Vec3(i, 2 * i, 0) for i in range(5))
+
+        self.assertEqual(result, Vec3(2, 4, 0))
+
+    def test_ave_list_v3_tuples(self):
+        """Ensure tuples, lists and Vec3 can be averaged together."""
+
+        from pedemath.vec3 import ave_list_v3
+
+        result = ave_list_v3([(3, 6, 9), [-4, -5, -6], Vec3(4, 5, 6)])
+
+        self.assertEqual(result, Vec3(1, 2, 3))
+
 
 class TestV3Set(unittest.TestCase):
     """Test Vec3().set(x, y, z)."""
@@ -815,3 +833,32 @@ class TestV3Set(unittest.TestCase):
         test_vec.set(2, 4, 6)
 
         self.assertEqual(test_vec, Vec3(2, 4, 6))
+
+
+class PointToLineTestCase(unittest.TestCase):
+    """Test point_to_line() and point_to_segment()."""
+
+    def test_point_to_line(self):
+        """Ensure the vector is perpendicular to the infinite line."""
+
+        from pedemath.vec3 import point_to_line
+
+        self.assertEqual(Vec3(0, 1, 0), point_to_line(
+            Vec3(5, 1, 0), Vec3(0, 0, 0), Vec3(2, 0, 0)))
+
+    def test_point_to_segment(self):
+        """Ensure the closest point is clamped to the segment ends."""
+
+        from pedemath.vec3 import point_to_segment
+
+        start = Vec3(0, 0, 0)
+        end = Vec3(2, 0, 0)
+
+        self.assertEqual(Vec3(0, 1, 0),
+                         point_to_segment(Vec3(1, 1, 0), start, end))
+        self.assertEqual(Vec3(3, 1, 0),
+                         point_to_segment(Vec3(5, 1, 0), start, end))
+        self.assertEqual(Vec3(-1, 0, 2),
+                         point_to_segment(Vec3(-1, 0, 2), start, end))
+        self.assertEqual(Vec3(1, 1, 1),
+                         point_to_segment(Vec3(1, 1, 1), start, start))
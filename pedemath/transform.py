@@ -0,0 +1,77 @@
+"""
+Translate, rotate, scale (TRS) composition and decomposition of Matrix44.
+
+A TRS matrix scales first, then rotates, then translates:
+M = T * R * S.  The batched functions work on (N, 4, 4) stacks of matrices
+laid out like Matrix44.data, (N, 3) translation and scale arrays and (N, 4)
+quaternion arrays.
+"""
+
+import numpy
+
+from pedemath.matrix import Matrix44
+from pedemath.matrix import quat_array_to_mat44_array
+from pedemath.quat import mat44_array_to_quat_array
+from pedemath.quat import Quat
+from pedemath.vec3 import Vec3
+
+
+def decompose_mat44_array(mats):
+    """Return (translations, quats, scales) for an (N, 4, 4) stack of TRS
+    matrices.
+
+    The scale of each axis is the length of the matching matrix column.  If
+    a matrix has a negative determinant (it mirrors), the x scale is made
+    negative so the remaining rotation is proper.  Shear is not supported.
+    """
+
+    mats = numpy.asarray(mats, dtype=float)
+    # Column-major, so mats[..., i, :3] is the i-th basis axis.
+    axes = mats[..., :3, :3]
+
+    scales = numpy.sqrt(numpy.einsum("...ij,...ij->...i", axes, axes))
+    mirrored = numpy.linalg.det(axes) < 0.0
+    scales[..., 0] = numpy.where(mirrored, -scales[..., 0], scales[..., 0])
+
+    rots = numpy.zeros(mats.shape)
+    # Avoid dividing by zero for degenerate axes.
+    rots[..., :3, :3] = axes / numpy.where(
+        scales == 0.0, 1.0, scales)[..., :, None]
+    rots[..., 3, 3] = 1.0
+
+    return (mats[..., 3, :3].copy(), mat44_array_to_quat_array(rots),
+            scales)
+
+
+def compose_mat44_array(translations, quats, scales):
+    """Return an (N, 4, 4) stack of TRS matrices.  The inverse of
+    decompose_mat44_array().
+    """
+
+    mats = quat_array_to_mat44_array(quats)
+    mats[..., :3, :3] *= numpy.asarray(scales, dtype=float)[..., :, None]
+    mats[..., 3, :3] = translations
+    return mats
+
+
+def decompose_mat44(mat):
+    """Return (trans Vec3, rot Quat, scale Vec3) for a TRS Matrix44.
+
+    See decompose_mat44_array().
+    """
+
+    trans, quat, scale = decompose_mat44_array(mat.data)
+    return Vec3(*trans), Quat(*quat), Vec3(*scale)
+
+
+def compose_mat44(trans_vec, rot_quat, scale_vec):
+    """Return a new TRS Matrix44 from a translation Vec3, rotation Quat and
+    scale Vec3.
+    """
+
+    mat = Matrix44()
+    mat.data[:] = compose_mat44_array(
+        [trans_vec[0], trans_vec[1], trans_vec[2]],
+        [rot_quat.x, rot_quat.y, rot_quat.z, rot_quat.w],
+        [scale_vec[0], scale_vec[1], scale_vec[2]])
+    return mat
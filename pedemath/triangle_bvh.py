@@ -0,0 +1,160 @@
+"""
+TriangleBVH
+A BoxBVH over the triangles of a mesh for closest hit and any hit ray casts.
+
+Leaves are ranges of triangles and nodes are bounded by axis aligned boxes.
+Ray batches are traversed one level at a time over all (ray, node) pairs, and
+the triangles of every leaf reached are tested together with a vectorized
+Moller-Trumbore test.
+"""
+
+import numpy
+
+from pedemath.bvh import BoxBVH
+from pedemath.bvh import ranges_to_indices
+from pedemath.ray import RayBatch
+from pedemath.ray import slab_test_min_max
+
+# Rays closer than this to parallel with a triangle's plane miss it.
+TRIANGLE_DET_EPSILON = 1e-12
+
+
+def intersect_ray_triangle_array(origins, directions, v0, edge1, edge2,
+                                 t_max=numpy.inf):
+    """Moller-Trumbore ray / triangle test over broadcastable arrays.
+
+    origins, directions: (..., 3) rays.
+    v0, edge1, edge2: (..., 3) first vertex and the edges v1 - v0 and
+        v2 - v0 of each triangle.
+
+    Return (hit, t, u, v) where t is the distance along each ray and u, v
+    are the barycentric coordinates of the hit point, so the hit point is
+    v0 + u * edge1 + v * edge2.  Hits must have 0 <= t <= t_max.
+    Both sides of a triangle are hit.
+    """
+
+    pvec = numpy.cross(directions, edge2)
+    det = numpy.einsum("...i,...i->...", edge1, pvec)
+    valid = numpy.abs(det) > TRIANGLE_DET_EPSILON
+    inv_det = 1.0 / numpy.where(valid, det, 1.0)
+
+    tvec = origins - v0
+    u = numpy.einsum("...i,...i->...", tvec, pvec) * inv_det
+    qvec = numpy.cross(tvec, edge1)
+    v = numpy.einsum("...i,...i->...", directions, qvec) * inv_det
+    t = numpy.einsum("...i,...i->...", edge2, qvec) * inv_det
+
+    hit = (valid & (u >= 0.0) & (v >= 0.0) & (u + v <= 1.0) &
+           (t >= 0.0) & (t <= t_max))
+    return hit, t, u, v
+
+
+def _first_per_ray(rays, t, *others):
+    """Return rays, t and others for the smallest t of each ray."""
+
+    order = numpy.lexsort((t, rays))
+    rays = rays[order]
+    first = numpy.ones(len(rays), dtype=bool)
+    first[1:] = rays[1:] != rays[:-1]
+    return (rays[first], t[order][first]) + tuple(
+        other[order][first] for other in others)
+
+
+class TriangleBVH(BoxBVH):
+
+    def __init__(self, vertices, faces, leaf_size=4):
+        """Build from (V, 3) vertices (or a list of Vec3) and (F, 3) vertex
+        indices of each triangle.
+        """
+
+        self.vertices = numpy.asarray(vertices, dtype=float).reshape(-1, 3)
+        self.faces = numpy.asarray(faces, dtype=numpy.intp).reshape(-1, 3)
+
+        corners = self.vertices[self.faces]
+        self.v0 = corners[:, 0]
+        self.edge1 = corners[:, 1] - corners[:, 0]
+        self.edge2 = corners[:, 2] - corners[:, 0]
+
+        BoxBVH.__init__(self, corners.min(axis=1), corners.max(axis=1),
+                        leaf_size)
+
+    def _leaf_pairs(self, rays, leaves):
+        """Expand (ray, leaf) pairs into (ray, triangle) pairs."""
+
+        counts = self.count[leaves]
+        tris = self.order[ranges_to_indices(self.start[leaves], counts)]
+        return numpy.repeat(rays, counts), tris
+
+    def _traverse_rays(self, ray_batch, any_hit):
+        num_rays = len(ray_batch)
+        best_t = numpy.array(ray_batch.t_max, dtype=float)
+        best_tri = numpy.full(num_rays, -1, dtype=numpy.intp)
+        best_uv = numpy.zeros((num_rays, 2))
+        if self.root < 0:
+            return best_tri, numpy.full(num_rays, numpy.inf), best_uv
+
+        rays = numpy.arange(num_rays)
+        nodes = numpy.full(num_rays, self.root, dtype=numpy.intp)
+        while len(rays):
+            if any_hit:
+                keep = best_tri[rays] < 0
+                rays, nodes = rays[keep], nodes[keep]
+
+            hit, _ = slab_test_min_max(
+                ray_batch.origins[rays], ray_batch.directions[rays],
+                ray_batch.inv_directions[rays], best_t[rays],
+                self.node_min[nodes], self.node_max[nodes], closed=True)
+            rays, nodes = rays[hit], nodes[hit]
+
+            leaf = self.is_leaf(nodes)
+            if leaf.any():
+                pair_rays, tris = self._leaf_pairs(rays[leaf], nodes[leaf])
+                tri_hit, t, u, v = intersect_ray_triangle_array(
+                    ray_batch.origins[pair_rays],
+                    ray_batch.directions[pair_rays], self.v0[tris],
+                    self.edge1[tris], self.edge2[tris], best_t[pair_rays])
+
+                if tri_hit.any():
+                    hit_rays, t, tris, u, v = _first_per_ray(
+                        pair_rays[tri_hit], t[tri_hit], tris[tri_hit],
+                        u[tri_hit], v[tri_hit])
+                    best_t[hit_rays] = t
+                    best_tri[hit_rays] = tris
+                    best_uv[hit_rays, 0] = u
+                    best_uv[hit_rays, 1] = v
+
+            rays, nodes = rays[~leaf], nodes[~leaf]
+            rays = numpy.concatenate((rays, rays))
+            nodes = numpy.concatenate((self.left[nodes], self.right[nodes]))
+
+        best_t[best_tri < 0] = numpy.inf
+        return best_tri, best_t, best_uv
+
+    def closest_hit(self, ray_batch):
+        """Return (triangles, t, uv) for the closest hit of each ray in a
+        RayBatch.
+
+        triangles is the (N,) index of the hit triangle or -1 for a miss, t
+        the (N,) distance along the ray (inf for a miss) and uv the (N, 2)
+        barycentric coordinates of the hit in its triangle.
+        """
+
+        return self._traverse_rays(ray_batch, any_hit=False)
+
+    def any_hit(self, ray_batch):
+        """Return an (N,) bool array, True for each ray in a RayBatch that
+        hits any triangle.  Faster than closest_hit() for occlusion tests.
+        """
+
+        triangles, _, _ = self._traverse_rays(ray_batch, any_hit=True)
+        return triangles >= 0
+
+    def raycast(self, origin, direction, t_max=None):
+        """Return (triangle, t) for the closest hit of a single ray, with
+        triangle -1 and t inf for a miss.
+        """
+
+        triangles, t, _ = self.closest_hit(
+            RayBatch([origin[0], origin[1], origin[2]],
+                     [direction[0], direction[1], direction[2]], t_max))
+        return int(triangles[0]), float(t[0])
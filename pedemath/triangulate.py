@@ -0,0 +1,433 @@
+"""
+Triangulation
+Ear clipping triangulation of simple 2D polygons with holes.
+
+Holes are joined to the outer ring with bridges, as in Eberly's
+"Triangulation by Ear Clipping", giving one ring that visits some
+vertices twice.  Ears are then clipped in rounds: each round finds every
+ear of the ring at once, testing ear triangles against the ring's reflex
+vertices through a spatial hash of grid cells keyed by their z-order
+(Morton) codes, and clips as many as it can with no two neighbors.  Ears
+that aren't neighbors stay ears when the others are clipped, so each
+round is a handful of array operations, and coastlines need a few dozen
+rounds.  Once rounds find few ears, as along a long strip that can only
+be clipped from its ends, the rest are clipped one at a time.
+"""
+
+import numpy
+
+
+def _as_ring(points):
+    return numpy.asarray(points, dtype=float).reshape(-1, 2)
+
+
+def _signed_area(ring):
+    offsets = ring - ring[0]
+    following = numpy.roll(offsets, -1, axis=0)
+    return (offsets[:, 0] * following[:, 1] -
+            offsets[:, 1] * following[:, 0]).sum() * 0.5
+
+
+def _cross(origins, a, b):
+    """Return the z of (a - origins) x (b - origins) for (N, 2) arrays."""
+
+    return ((a[:, 0] - origins[:, 0]) * (b[:, 1] - origins[:, 1]) -
+            (a[:, 1] - origins[:, 1]) * (b[:, 0] - origins[:, 0]))
+
+
+def _spread_bits(values):
+    """Return 16 bit integers with a zero bit after each of their bits."""
+
+    values = values & 0xFFFF
+    values = (values | (values << 8)) & 0x00FF00FF
+    values = (values | (values << 4)) & 0x0F0F0F0F
+    values = (values | (values << 2)) & 0x33333333
+    return (values | (values << 1)) & 0x55555555
+
+
+def _morton_keys(cell_x, cell_y):
+    return _spread_bits(cell_x) | (_spread_bits(cell_y) << 1)
+
+
+def _expand(counts):
+    """Return (owners, offsets), an entry for each of counts[i] items of
+    each owner i with its offset from 0 to counts[i] - 1.
+    """
+
+    owners = numpy.repeat(numpy.arange(len(counts)), counts)
+    offsets = numpy.arange(len(owners)) - numpy.repeat(
+        numpy.cumsum(counts) - counts, counts)
+    return owners, offsets
+
+
+def _locally_inside(prev_points, points, next_points, point):
+    """Return a bool array, True where point is inside the corner of a
+    counter-clockwise ring at points.
+    """
+
+    point = numpy.broadcast_to(point, points.shape)
+    left_of_prev = _cross(prev_points, points, point) > 0.0
+    left_of_next = _cross(points, next_points, point) > 0.0
+    return numpy.where(_cross(prev_points, points, next_points) >= 0.0,
+                       left_of_prev & left_of_next,
+                       left_of_prev | left_of_next)
+
+
+def _bridge_hole(ring, coords, hole):
+    """Return ring, an array of vertex indices, with a hole's vertex
+    indices joined in by a bridge from the hole's rightmost vertex to a
+    vertex of the ring it can see.
+    """
+
+    start = hole[coords[hole, 0].argmax()]
+    origin = coords[start]
+    mx, my = origin
+
+    # The closest edge hit by a ray from the hole towards +x.
+    points = coords[ring]
+    prev_points = coords[numpy.roll(ring, 1)]
+    next_points = coords[numpy.roll(ring, -1)]
+    a, b = points, next_points
+    spans = ((a[:, 1] <= my) & (b[:, 1] >= my)) | (
+        (a[:, 1] >= my) & (b[:, 1] <= my))
+    dy = numpy.where(b[:, 1] != a[:, 1], b[:, 1] - a[:, 1], 1.0)
+    hit_x = numpy.where(b[:, 1] != a[:, 1],
+                        a[:, 0] + (my - a[:, 1]) * (b[:, 0] - a[:, 0]) / dy,
+                        numpy.minimum(a[:, 0], b[:, 0]))
+    hit_x = numpy.where(spans & (hit_x >= mx), hit_x, numpy.inf)
+    edge = hit_x.argmin()
+    if not numpy.isfinite(hit_x[edge]):
+        raise ValueError("Hole is outside the polygon")
+
+    # The edge's end furthest along the ray can see the hole unless other
+    # vertices are in the triangle of the hole vertex, the hit and that
+    # end, in which case the one nearest in angle to the ray can.  Only
+    # vertices with the hole inside their corner count, which also picks
+    # the right visit to a vertex already visited twice by a bridge.
+    end = edge if a[edge, 0] > b[edge, 0] else (edge + 1) % len(ring)
+    tri = numpy.array([origin, [hit_x[edge], my], points[end]])
+    if _signed_area(tri) < 0.0:
+        tri = tri[::-1]
+    inside = ((points >= tri.min(axis=0)) &
+              (points <= tri.max(axis=0))).all(axis=1)
+    for i in range(3):
+        inside &= _cross(numpy.broadcast_to(tri[i], points.shape),
+                         numpy.broadcast_to(tri[(i + 1) % 3], points.shape),
+                         points) >= 0.0
+    inside &= (points != origin).any(axis=1)
+    inside &= _locally_inside(prev_points, points, next_points, origin)
+    candidates = numpy.flatnonzero(inside)
+    target = end
+    if len(candidates):
+        offsets = points[candidates] - origin
+        slopes = numpy.abs(offsets[:, 1]) / numpy.maximum(offsets[:, 0],
+                                                          1e-300)
+        target = candidates[numpy.lexsort((numpy.hypot(*offsets.T),
+                                           slopes))[0]]
+
+    hole_start = int(numpy.flatnonzero(hole == start)[0])
+    hole_loop = numpy.concatenate([hole[hole_start:], hole[:hole_start + 1]])
+    return numpy.concatenate([ring[:target + 1], hole_loop,
+                              ring[target:]])
+
+
+def _ear_blocked(tri_a, tri_b, tri_c, blockers):
+    """Return a bool array, True for each counter-clockwise triangle with a
+    blocker point inside or on it, other than at its corners.
+    """
+
+    blocked = numpy.zeros(len(tri_a), dtype=bool)
+    if not len(blockers) or not len(tri_a):
+        return blocked
+
+    # A spatial hash of blockers in cells about the size of a typical
+    # triangle, which for rings along a coastline is far smaller than
+    # spreading the blockers evenly over their bounds.
+    tri_mins = numpy.minimum(numpy.minimum(tri_a, tri_b), tri_c)
+    tri_maxs = numpy.maximum(numpy.maximum(tri_a, tri_b), tri_c)
+    mins = blockers.min(axis=0)
+    extent = (blockers.max(axis=0) - mins).max()
+    cell_size = max(numpy.median((tri_maxs - tri_mins).max(axis=1)),
+                    extent / 0xFFFF, 1e-300)
+
+    def cells(points):
+        return numpy.clip((points - mins) / cell_size, 0,
+                          0xFFFF).astype(numpy.int64)
+
+    blocker_cells = cells(blockers)
+    keys = _morton_keys(blocker_cells[:, 0], blocker_cells[:, 1])
+    order = numpy.argsort(keys, kind="stable")
+    keys = keys[order]
+    blockers = blockers[order]
+
+    # Triangles look in each cell of their bounds, unless there are more
+    # cells than blockers, when they scan the range of keys from their
+    # lowest to highest cell, which has every cell of the bounds.
+    low = cells(tri_mins)
+    high = cells(tri_maxs)
+    spans = high - low + 1
+    cell_counts = spans[:, 0] * spans[:, 1]
+    small = numpy.flatnonzero(cell_counts <= len(blockers))
+    large = numpy.flatnonzero(cell_counts > len(blockers))
+    owners, offsets = _expand(cell_counts[small])
+    owners = small[owners]
+    cell_keys = _morton_keys(low[owners, 0] + offsets % spans[owners, 0],
+                             low[owners, 1] + offsets // spans[owners, 0])
+    firsts = numpy.concatenate([
+        numpy.searchsorted(keys, cell_keys, side="left"),
+        numpy.searchsorted(keys, _morton_keys(low[large, 0], low[large, 1]),
+                           side="left")])
+    lasts = numpy.concatenate([
+        numpy.searchsorted(keys, cell_keys, side="right"),
+        numpy.searchsorted(keys, _morton_keys(high[large, 0],
+                                              high[large, 1]),
+                           side="right")])
+    owners = numpy.concatenate([owners, large])
+    pairs, within = _expand(lasts - firsts)
+    triangles = owners[pairs]
+    points = blockers[firsts[pairs] + within]
+
+    near = ((points >= tri_mins[triangles]) &
+            (points <= tri_maxs[triangles])).all(axis=1)
+    triangles = triangles[near]
+    points = points[near]
+
+    a, b, c = tri_a[triangles], tri_b[triangles], tri_c[triangles]
+    inside = ((_cross(a, b, points) >= 0.0) & (_cross(b, c, points) >= 0.0) &
+              (_cross(c, a, points) >= 0.0))
+    for corner in (a, b, c):
+        inside &= (points != corner).any(axis=1)
+    blocked[triangles[inside]] = True
+    return blocked
+
+
+class _EarClipper(object):
+    """Clips the ears of a ring of nodes one at a time, walking forwards
+    from each ear.
+    """
+
+    def __init__(self, node_coords, nodes, prev_nodes, next_nodes, ring):
+        # Plain lists are much faster than numpy for one node at a time.
+        self.xs = node_coords[:, 0].tolist()
+        self.ys = node_coords[:, 1].tolist()
+        self.prevs = prev_nodes.tolist()
+        self.nexts = next_nodes.tolist()
+        self.removed = [False] * len(self.xs)
+        self.vertices = ring.tolist()
+        self.node_list = nodes.tolist()
+        self.triangles = []
+
+        # A grid of reflex nodes, with cells about the size of a triangle
+        # but no fewer nodes per cell than spreading them evenly over their
+        # bounds, as triangles grow while they're clipped.  Nodes are
+        # checked when found, as clipping makes them convex, and nodes made
+        # reflex by dropping spikes are added.
+        corners = numpy.stack([node_coords[prev_nodes[nodes]],
+                               node_coords[nodes],
+                               node_coords[next_nodes[nodes]]])
+        bounds = numpy.ptp(node_coords[nodes], axis=0)
+        self.cell_size = max(
+            float(numpy.median(numpy.ptp(corners, axis=0).max(axis=1))),
+            float(numpy.sqrt(bounds.prod() / len(nodes))), 1e-300)
+        self.grid = {}
+        self.indexed = [False] * len(self.xs)
+        self.reflex_count = 0
+        for node in self.node_list:
+            self.index(node)
+
+    def turn(self, node):
+        xs, ys = self.xs, self.ys
+        p, n = self.prevs[node], self.nexts[node]
+        return ((xs[node] - xs[p]) * (ys[n] - ys[node]) -
+                (ys[node] - ys[p]) * (xs[n] - xs[node]))
+
+    def index(self, node):
+        """Add node to the grid if it is reflex and not there yet."""
+
+        if not self.indexed[node] and self.turn(node) <= 0.0:
+            self.indexed[node] = True
+            self.reflex_count += 1
+            key = (int(self.xs[node] // self.cell_size),
+                   int(self.ys[node] // self.cell_size))
+            self.grid.setdefault(key, []).append(node)
+
+    def groups_near(self, low_x, low_y, high_x, high_y):
+        """Return the lists of reflex nodes in grid cells over a box."""
+
+        cell_size = self.cell_size
+        x0, x1 = int(low_x // cell_size), int(high_x // cell_size)
+        y0, y1 = int(low_y // cell_size), int(high_y // cell_size)
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > self.reflex_count:
+            return self.grid.values()
+        get = self.grid.get
+        return [get((i, j), ()) for i in range(x0, x1 + 1)
+                for j in range(y0, y1 + 1)]
+
+    def is_ear(self, node):
+        """Return whether no reflex node is inside the triangle of a convex
+        node and its neighbors.
+        """
+
+        xs, ys, removed, turn = self.xs, self.ys, self.removed, self.turn
+        p, n = self.prevs[node], self.nexts[node]
+        ax, ay, bx, by, cx, cy = xs[p], ys[p], xs[node], ys[node], xs[n], \
+            ys[n]
+        low_x, high_x = min(ax, bx, cx), max(ax, bx, cx)
+        low_y, high_y = min(ay, by, cy), max(ay, by, cy)
+        for group in self.groups_near(low_x, low_y, high_x, high_y):
+            for q in group:
+                if removed[q]:
+                    continue
+                qx, qy = xs[q], ys[q]
+                if (qx < low_x or qx > high_x or qy < low_y or
+                        qy > high_y or (qx == ax and qy == ay) or
+                        (qx == bx and qy == by) or
+                        (qx == cx and qy == cy)):
+                    continue
+                if ((bx - ax) * (qy - ay) - (by - ay) * (qx - ax) >= 0.0 and
+                        (cx - bx) * (qy - by) - (cy - by) * (qx - bx) >=
+                        0.0 and
+                        (ax - cx) * (qy - cy) - (ay - cy) * (qx - cx) >=
+                        0.0 and turn(q) <= 0.0):
+                    return False
+        return True
+
+    def add_triangle(self, node):
+        """Keep the triangle of node and its neighbors unless it is flat or
+        clockwise.
+        """
+
+        if self.turn(node) > 0.0:
+            self.triangles.append((self.vertices[self.prevs[node]],
+                                   self.vertices[node],
+                                   self.vertices[self.nexts[node]]))
+
+    def clip(self, node):
+        """Add the triangle at node, drop node from the ring and return the
+        node after it.
+        """
+
+        self.add_triangle(node)
+        p, n = self.prevs[node], self.nexts[node]
+        self.removed[node] = True
+        self.nexts[p] = n
+        self.prevs[n] = p
+        self.index(p)
+        self.index(n)
+        return n
+
+    def run(self):
+        """Return a (T, 3) array of vertex indices of the clipped ears."""
+
+        turn, is_ear, nexts = self.turn, self.is_ear, self.nexts
+        remaining = len(self.node_list)
+        node = stop = self.node_list[0]
+        while remaining > 3:
+            node_turn = turn(node)
+            if node_turn == 0.0 or (node_turn > 0.0 and is_ear(node)):
+                node = stop = self.clip(node)
+            else:
+                node = nexts[node]
+                if node == stop:
+                    # Only reached for self-intersecting rings: clip anyway
+                    # so the loop ends.
+                    node = stop = self.clip(self.prevs[node])
+                else:
+                    continue
+            remaining -= 1
+
+        self.add_triangle(node)
+        return numpy.array(self.triangles, dtype=numpy.intp).reshape(-1, 3)
+
+
+def _clip_ears(node_coords, nodes, prev_nodes, next_nodes, ring):
+    """Return a (T, 3) array of vertex indices from clipping the ears of
+    the ring of nodes one at a time, walking forwards from each ear.
+    """
+
+    if len(nodes) < 3:
+        return numpy.empty((0, 3), dtype=numpy.intp)
+    return _EarClipper(node_coords, nodes, prev_nodes, next_nodes,
+                       ring).run()
+
+
+def triangulate_polygon(coords, holes=(), seed=0):
+    """Return a (T, 3) array of vertex indices triangulating a simple
+    polygon with holes.
+
+    coords is the outer ring as an (N, 2) array or a list of Vec2, and
+    holes a list of rings inside it, in either winding.  Indices count
+    through coords and then each hole in turn, as if they were
+    concatenated.  Triangles are counter-clockwise.  Collinear and
+    repeated vertices may be left out of the triangles.  seed picks which
+    neighboring ears are clipped first, for repeatable results.
+    """
+
+    rings = [_as_ring(coords)] + [_as_ring(hole) for hole in holes]
+    all_coords = numpy.concatenate(rings)
+    sizes = [len(ring) for ring in rings]
+    starts = numpy.cumsum(sizes) - sizes
+
+    ring = numpy.arange(sizes[0])
+    if _signed_area(rings[0]) < 0.0:
+        ring = ring[::-1]
+
+    hole_rings = []
+    for size, start, hole in zip(sizes[1:], starts[1:], rings[1:]):
+        if size < 3:
+            continue
+        indices = numpy.arange(start, start + size)
+        hole_rings.append(indices if _signed_area(hole) < 0.0
+                          else indices[::-1])
+    # Rightmost holes first, so each bridge only crosses the outer ring.
+    hole_rings.sort(key=lambda hole: -all_coords[hole, 0].max())
+    for hole in hole_rings:
+        ring = _bridge_hole(ring, all_coords, hole)
+
+    count = len(ring)
+    if count < 3:
+        return numpy.empty((0, 3), dtype=numpy.intp)
+
+    node_coords = all_coords[ring]
+    next_nodes = numpy.roll(numpy.arange(count), -1)
+    prev_nodes = numpy.roll(numpy.arange(count), 1)
+    priorities = numpy.random.RandomState(seed).permutation(count)
+    nodes = numpy.arange(count)
+    triangles = []
+
+    # Rounds stop paying for themselves once few ears are left, as along a
+    # strip that can only be clipped from its ends, so the last nodes are
+    # clipped one at a time.
+    while len(nodes) > 64:
+        prevs, nexts = prev_nodes[nodes], next_nodes[nodes]
+        a, b, c = node_coords[prevs], node_coords[nodes], node_coords[nexts]
+        turns = _cross(a, b, c)
+
+        # Collinear and repeated vertices are dropped without a triangle.
+        convex = turns > 0.0
+        candidates = numpy.flatnonzero(convex)
+        removable = turns == 0.0
+        removable[candidates] = ~_ear_blocked(
+            a[candidates], b[candidates], c[candidates],
+            b[turns <= 0.0])
+
+        # Clip ears with a higher priority than any neighboring ear.
+        removable_nodes = numpy.zeros(count, dtype=bool)
+        removable_nodes[nodes] = removable
+        priority = priorities[nodes]
+        clip = removable & (
+            ~removable_nodes[prevs] | (priority > priorities[prevs])) & (
+            ~removable_nodes[nexts] | (priority > priorities[nexts]))
+
+        emit = clip & convex
+        triangles.append(numpy.column_stack(
+            [ring[prevs[emit]], ring[nodes[emit]], ring[nexts[emit]]]))
+        next_nodes[prevs[clip]] = nexts[clip]
+        prev_nodes[nexts[clip]] = prevs[clip]
+        nodes = nodes[~clip]
+        if clip.sum() * 32 < len(nodes):
+            break
+
+    triangles.append(_clip_ears(node_coords, nodes, prev_nodes, next_nodes,
+                                ring))
+    return numpy.concatenate(triangles).astype(numpy.intp)
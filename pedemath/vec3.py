@@ -16,6 +16,7 @@
 
 import math
 
+
 NUMERIC_TYPES = set([float, int])
 
 
@@ -103,10 +104,11 @@ def projection_as_vec_v3(v, w):
 
 
 def point_to_line(point, segment_start, segment_end):
-    """Given a point and a line segment, return the vector from the point to
-    the closest point on the segment.
+    """Given a point and a line segment, return the vector from the closest
+    point on the segment's infinite line to the point.
+
+    The closest point is not clamped to the segment, see point_to_segment().
     """
-    # TODO: Needs unittests.
 
     segment_vec = segment_end - segment_start
     # t is distance along line
@@ -117,6 +119,24 @@ def point_to_line(point, segment_start, segment_end):
     return point - closest_point
 
 
+def point_to_segment(point, segment_start, segment_end):
+    """Given a point and a line segment, return the vector from the closest
+    point on the segment to the point.
+
+    For arrays of points and segments, see pedemath.closest.
+    """
+
+    segment_vec = segment_end - segment_start
+    length_sq = segment_vec.length_squared()
+    t = 0.0
+    if length_sq > 0.0:
+        t = (point - segment_start).dot(segment_vec) / length_sq
+        t = min(max(t, 0.0), 1.0)
+
+    closest_point = segment_start + scale_v3(segment_vec, t)
+    return point - closest_point
+
+
 def cross_v3(vec_a, vec_b):
     """Return the crossproduct between vec_a and vec_b."""
 
@@ -154,14 +174,27 @@ def rotate_around_vector_v3(v, angle_rad, norm_vec):
 
 
 def ave_list_v3(vec_list):
-    """Return the average vector of a list of vectors."""
+    """Return the average vector of a list, or any iterable, of vectors.
 
-    vec = Vec3(0, 0, 0)
+    For covariance and bounds too, or to merge partial results, see
+    pedemath.stats.PointStats.
+    """
+
+    x = y = z = 0.0
+    num_vecs = 0
     for v in vec_list:
-        vec += v
-    num_vecs = float(len(vec_list))
-    vec = Vec3(vec.x / num_vecs, vec.y / num_vecs, vec.z / num_vecs)
-    return vec
+        # Attributes are faster than indexing, but tuples and lists work too.
+        if isinstance(v, Vec3):
+            x += v.x
+            y += v.y
+            z += v.z
+        else:
+            x += v[0]
+            y += v[1]
+            z += v[2]
+        num_vecs += 1
+    num_vecs = float(num_vecs)
+    return Vec3(x / num_vecs, y / num_vecs, z / num_vecs)
 
 
 def angle_between_two_vectors(vec_a, vec_b):
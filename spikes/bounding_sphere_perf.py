@@ -0,0 +1,71 @@
+"""
+Throughput of the bounding sphere functions in pedemath.sphere.
+
+Times ritter_sphere() and welzl_sphere() on 1M point meshes, and
+ritter_sphere_array_from_point_sets() on many small point sets.  Points are
+either spread through an elongated box or on the surface of a sphere,
+where every point is a candidate support point for Welzl's algorithm.
+"""
+
+from __future__ import print_function
+
+import time
+
+import numpy
+
+from pedemath.sphere import ritter_sphere
+from pedemath.sphere import ritter_sphere_array_from_point_sets
+from pedemath.sphere import welzl_sphere
+
+# Results
+# Python 3.11.7, numpy 2, one core.  Radii are relative to Welzl's exact
+# sphere.
+#
+# 1000000 points in a box:
+#   ritter 0.18 s (5.7M points/s) radius 1.0001
+#   welzl  1.28 s (0.8M points/s) radius 1.0000
+# 1000000 points on a sphere:
+#   ritter 0.22 s (4.5M points/s) radius 1.0003
+#   welzl  0.22 s (4.6M points/s) radius 1.0000
+# 100000 sets of 16 points, batched ritter:
+#   0.90 s (1.8M points/s, 111k spheres/s)
+
+
+def _time(func, *args):
+    start = time.time()
+    result = func(*args)
+    return time.time() - start, result
+
+
+def _compare(name, points):
+    print("%d points %s:" % (len(points), name))
+    welzl_time, (_, exact) = _time(welzl_sphere, points, 1)
+    ritter_time, (_, radius) = _time(ritter_sphere, points)
+    for method, seconds, method_radius in (("ritter", ritter_time, radius),
+                                           ("welzl ", welzl_time, exact)):
+        print("  %s %.2f s (%.1fM points/s) radius %.4f" % (
+            method, seconds, len(points) / seconds / 1e6,
+            method_radius / exact))
+
+
+def main():
+    rng = numpy.random.RandomState(0)
+    count = 1000000
+
+    _compare("in a box",
+             rng.uniform(-1, 1, size=(count, 3)) * [5.0, 1.0, 0.3])
+
+    directions = rng.normal(size=(count, 3))
+    directions /= numpy.linalg.norm(directions, axis=1)[:, None]
+    _compare("on a sphere", directions * 3.0 + [1, 2, 3])
+
+    sets = rng.normal(size=(100000, 16, 3))
+    seconds, _ = _time(ritter_sphere_array_from_point_sets, sets)
+    print("%d sets of %d points, batched ritter:" % sets.shape[:2])
+    print("  %.2f s (%.1fM points/s, %dk spheres/s)" % (
+        seconds, sets.shape[0] * sets.shape[1] / seconds / 1e6,
+        sets.shape[0] / seconds / 1000))
+
+
+if __name__ == "__main__":
+    main()
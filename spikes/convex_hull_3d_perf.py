@@ -0,0 +1,61 @@
+"""
+Scaling of convex_hull_3d() from 1k to 1M points.
+
+Points from a normal distribution or a cube have few hull vertices, so
+most points are discarded by the first vectorized passes and time grows
+about linearly.  Points on a sphere are the worst case: every point is a
+hull vertex and quickhull takes one Python level step per point.
+"""
+
+from __future__ import print_function
+
+import time
+
+import numpy
+
+from pedemath.hull import convex_hull_3d
+
+# Results
+# Python 3.11.7, numpy 2, one core.
+#
+#   points  distribution  hull vertices  seconds
+#     1000  normal                   45     0.03
+#    10000  normal                   60     0.02
+#   100000  normal                   76     0.06
+#  1000000  normal                   93     0.53
+#     1000  cube                     69     0.01
+#    10000  cube                    122     0.04
+#   100000  cube                    184     0.13
+#  1000000  cube                    301     1.05
+#     1000  sphere                 1000     0.22
+#    10000  sphere                10000     1.96
+#   100000  sphere               100000    20.16
+
+
+def _sphere(rng, count):
+    points = rng.normal(size=(count, 3))
+    return points / numpy.linalg.norm(points, axis=1)[:, None]
+
+
+def main():
+    rng = numpy.random.RandomState(0)
+    distributions = [
+        ("normal", lambda count: rng.normal(size=(count, 3)),
+         (1000, 10000, 100000, 1000000)),
+        ("cube", lambda count: rng.uniform(-1, 1, size=(count, 3)),
+         (1000, 10000, 100000, 1000000)),
+        ("sphere", lambda count: _sphere(rng, count), (1000, 10000, 100000)),
+    ]
+
+    print("  points  distribution  hull vertices  seconds")
+    for name, make_points, counts in distributions:
+        for count in counts:
+            points = make_points(count)
+            start = time.time()
+            vertices, _, _ = convex_hull_3d(points)
+            print("%8d  %-12s  %13d  %7.2f" % (
+                count, name, len(vertices), time.time() - start))
+
+
+if __name__ == "__main__":
+    main()